@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+import tempfile
 from corsheaders.defaults import default_headers
 
 load_dotenv()
@@ -22,6 +23,37 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 DATA_DIR = BASE_DIR / 'fsae_backend_app' / 'ld_parser' / 'data'
 
+# Number of threads used to decode the channels of a single LD file during ingest
+LD_DECODE_WORKERS = int(os.getenv("LD_DECODE_WORKERS", os.cpu_count() or 1))
+
+# Content-addressed Parquet cache of parsed LD files, so re-ingesting the same file skips parsing;
+# off by default, as it writes every ingested run to disk. Evicted least-recently-used past the size limit
+LD_CACHE_ENABLED = os.getenv("LD_CACHE_ENABLED", "False") == "True"
+LD_CACHE_DIR = os.getenv("LD_CACHE_DIR") or os.path.join(tempfile.gettempdir(), 'fsae-ld-cache')
+LD_CACHE_MAX_BYTES = int(os.getenv("LD_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+
+# Length in seconds of the buckets each channel is reduced to (mean/min/max/last) before upload
+LD_BUCKET_SECONDS = float(os.getenv("LD_BUCKET_SECONDS", 1))
+
+# Read-through cache of run telemetry pulled from Firestore, in memory and optionally on disk
+RUN_DATA_CACHE_MAX_BYTES = int(os.getenv("RUN_DATA_CACHE_MAX_BYTES", 256 * 1024 ** 2))
+RUN_DATA_CACHE_DIR = os.getenv("RUN_DATA_CACHE_DIR") or None
+RUN_DATA_CACHE_DISK_MAX_BYTES = int(os.getenv("RUN_DATA_CACHE_DISK_MAX_BYTES", 2 * 1024 ** 3))
+
+# Seconds the run list and driver directory are served from memory before Firestore is queried again
+LIST_CACHE_TTL_SECONDS = float(os.getenv("LIST_CACHE_TTL_SECONDS", 60))
+# Most reads (e.g. filter combinations) kept in that cache, evicted least-recently-used first
+LIST_CACHE_MAX_ENTRIES = int(os.getenv("LIST_CACHE_MAX_ENTRIES", 256))
+
+# Seconds before the in-process issue index is reloaded, to pick up issues written by other processes
+ISSUE_INDEX_TTL_SECONDS = float(os.getenv("ISSUE_INDEX_TTL_SECONDS", 60))
+
+# Mirror the driver-profiles and issues collections in memory with snapshot listeners
+FIRESTORE_MIRRORS_ENABLED = os.getenv("FIRESTORE_MIRRORS_ENABLED", "True") == "True"
+# Seconds a mirror is served without a snapshot before its listener is restarted (and the
+# collection re-read); a listener that fails is restarted on the next read regardless
+FIRESTORE_MIRROR_MAX_AGE_SECONDS = float(os.getenv("FIRESTORE_MIRROR_MAX_AGE_SECONDS", 600))
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
@@ -0,0 +1,139 @@
+"""
+columnar.py
+
+Encodes run data as compact binary columnar responses, for clients that ask for them
+with the HTTP `Accept` header instead of the default JSON list of per-second dicts. The
+columns are read as such (see `firestore_async.get_specific_run_data`'s `as_columns`), so
+chunked runs go from their float32 blocks to the response without per-row dicts.
+
+Two formats are supported:
+
+- `application/vnd.fsae.columnar`: a little-endian uint32 header length, a UTF-8 JSON
+  header, zero padding to a multiple of 4 bytes, then one float32 array per column. The
+  header holds `rows`, `ids` (the per-second document IDs, for paging), `columns` (one
+  `{"name", "offset", "length"}` entry per column, with the byte offset from the start
+  of the body) and any extra response fields (e.g. `keyPoints`). Missing values are NaN,
+  so every column can be read with `new Float32Array(body, offset, length)`.
+- `application/vnd.apache.arrow.stream`: an Arrow IPC stream with an `id` column and
+  one float32 column per channel; the extra response fields are stored as JSON under
+  the schema metadata key `fsae`.
+"""
+import json
+import struct
+import numpy as np
+from django.http import HttpResponse
+
+COLUMNAR_CONTENT_TYPE = 'application/vnd.fsae.columnar'
+ARROW_CONTENT_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+def negotiate(request):
+    """
+    Picks the response format of a run data request from its `Accept` header.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        str: `COLUMNAR_CONTENT_TYPE` or `ARROW_CONTENT_TYPE` if the client accepts one of
+            them, otherwise None (JSON).
+    """
+    accept = request.headers.get('Accept', '')
+    for media_range in accept.split(','):
+        media_type = media_range.split(';')[0].strip()
+        if media_type in (COLUMNAR_CONTENT_TYPE, ARROW_CONTENT_TYPE):
+            return media_type
+    return None
+
+
+def encode_columnar(ids, columns, **fields):
+    """
+    Encodes run data in the `COLUMNAR_CONTENT_TYPE` format.
+
+    Args:
+        ids (list): The per-second document IDs of the rows.
+        columns (dict): Maps each field to a float32 array over the rows.
+        **fields: Extra JSON-serialisable response fields added to the header.
+
+    Returns:
+        bytes: The encoded body.
+    """
+    def build_header(base):
+        entries, offset = [], base
+        for name, values in columns.items():
+            entries.append({"name": name, "offset": offset, "length": len(values)})
+            offset += values.nbytes
+        return json.dumps({"rows": len(ids), "ids": ids, "columns": entries, **fields}).encode('utf-8')
+
+    # Column offsets depend on the header's length, so settle it before laying out the body
+    base = 0
+    while True:
+        header = build_header(base)
+        data_start = -(-(4 + len(header)) // 4) * 4
+        if data_start == base:
+            break
+        base = data_start
+
+    padding = data_start - 4 - len(header)
+    return b''.join([struct.pack('<I', len(header)), header, b'\0' * padding] +
+                    [values.astype('<f4', copy=False).tobytes() for values in columns.values()])
+
+
+def decode_columnar(body):
+    """
+    Decodes a `COLUMNAR_CONTENT_TYPE` body, e.g. for tests and scripts.
+
+    Args:
+        body (bytes): The encoded body.
+
+    Returns:
+        tuple: (header, columns), the header dict and a dict of float32 arrays by name.
+    """
+    (header_len,) = struct.unpack_from('<I', body, 0)
+    header = json.loads(body[4:4 + header_len].decode('utf-8'))
+    columns = {entry['name']: np.frombuffer(body, dtype='<f4', count=entry['length'], offset=entry['offset'])
+               for entry in header['columns']}
+    return header, columns
+
+
+def encode_arrow(ids, columns, **fields):
+    """
+    Encodes run data as an Arrow IPC stream.
+
+    Args:
+        ids (list): The per-second document IDs of the rows.
+        columns (dict): Maps each field to a float32 array over the rows.
+        **fields: Extra JSON-serialisable response fields, stored in the schema metadata.
+
+    Returns:
+        bytes: The encoded body.
+    """
+    import pyarrow as pa
+
+    batch = pa.RecordBatch.from_pydict({'id': pa.array(ids, type=pa.string()), **columns})
+    schema = batch.schema.with_metadata({'fsae': json.dumps(fields)})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+    return sink.getvalue().to_pybytes()
+
+
+def columnar_response(content_type, data, **fields):
+    """
+    Builds the binary response for a negotiated content type.
+
+    Args:
+        content_type (str): As returned by `negotiate`.
+        data (tuple): (ids, columns), as read with `as_columns` (see `chunks.to_columns`);
+            None for an empty response.
+        **fields: Extra JSON-serialisable response fields (e.g. `keyPoints`).
+
+    Returns:
+        HttpResponse: The encoded response.
+    """
+    encode = encode_arrow if content_type == ARROW_CONTENT_TYPE else encode_columnar
+    ids, columns = data or ([], {})
+    response = HttpResponse(encode(ids, columns, **fields), content_type=content_type)
+    response['Vary'] = 'Accept'
+    return response
@@ -0,0 +1,132 @@
+"""
+comparison.py
+
+Aligns several runs on one shared axis (time, or distance travelled) for driver-comparison
+overlays, so the frontend gets one grid and one array per run and channel instead of aligning
+separately fetched runs itself.
+"""
+import numpy as np
+from .firebase.chunks import row_of
+
+AXES = ('time', 'distance')
+# Grid spacing along distance, in meters, when none is given
+DEFAULT_DISTANCE_STEP = 10.0
+# Upper bound on grid points, so a tiny step cannot blow up the payload; longer grids are coarsened
+MAX_GRID_POINTS = 100000
+# Distance travelled over the whole run, and since the start of the current lap
+RUN_DISTANCE_CHANNEL = 'Distance'
+LAP_DISTANCE_CHANNEL = 'Lap Distance'
+
+
+def distance_channel(stats, lap=None):
+    """
+    Picks the channel a run is aligned on along distance. Lap distance resets at the line, so
+    it is only used when one lap is selected; the whole run needs the cumulative distance, or
+    every lap would land on the same stretch of the axis.
+
+    Args:
+        stats (dict): The run's channel statistics (see `ld_parser.stats`), keyed by channel.
+        lap (int, optional): The selected lap, if any.
+
+    Returns:
+        str: The channel name, or None if the run has no distance channel usable for `lap`.
+    """
+    candidates = (LAP_DISTANCE_CHANNEL, RUN_DISTANCE_CHANNEL) if lap is not None else (RUN_DISTANCE_CHANNEL,)
+    return next((name for name in candidates if name in (stats or {})), None)
+
+
+def run_series(data, bucket_seconds=1, start_second=0.0):
+    """
+    Turns a run's columns into arrays on a time axis.
+
+    Args:
+        data (tuple): (ids, columns), as returned by `get_specific_run_data` with `as_columns`;
+            None for a run without data.
+        bucket_seconds (float): Seconds covered by each row.
+        start_second (float): Time subtracted from every row, e.g. the start of a lap.
+
+    Returns:
+        dict: `time` (seconds) and one float64 array per stored field.
+    """
+    ids, columns = data or ([], {})
+    series = {name: values.astype(np.float64) for name, values in columns.items()}
+    series['time'] = np.array([row_of(doc_id) for doc_id in ids], dtype=np.float64) * bucket_seconds - start_second
+    return series
+
+
+def _interp(x, values, grid):
+    """Linearly resamples `values` sampled at `x` onto `grid`, NaN outside the samples."""
+    valid = np.isfinite(x) & np.isfinite(values)
+    if not valid.any():
+        return np.full(len(grid), np.nan)
+    return np.interp(grid, x[valid], values[valid], left=np.nan, right=np.nan)
+
+
+def align_runs(series_by_run, channels, axis='time', step=None, distance_channels=None):
+    """
+    Resamples every run's channels onto one grid along `axis`.
+
+    Along distance, each run's distance channel is made non-decreasing first (so a lap distance
+    reset or GPS jitter cannot fold the axis back); comparing one lap of each run gives the
+    cleanest overlay.
+
+    Args:
+        series_by_run (dict): Maps each run title to its arrays, as returned by `run_series`.
+        channels (list): The channels to align.
+        axis (str): 'time' or 'distance'.
+        step (float, optional): The grid spacing, in seconds or meters. Defaults to the longest
+            row spacing of the runs along time, and DEFAULT_DISTANCE_STEP along distance. A step
+            that would need more than MAX_GRID_POINTS points to cover the longest run is widened
+            until it does not, so runs are never cut short.
+        distance_channels (dict, optional): Maps each run title to its distance channel;
+            required along distance.
+
+    Raises:
+        ValueError: If `axis` is unknown, `step` is not positive, or a run has no distance
+            channel, or no values in it, along distance.
+
+    Returns:
+        dict: `axis`, `step` (the grid spacing used), `grid` (list) and `runs`, mapping each run title to a dict of channel ->
+            list of values on the grid (None where the run has no value).
+    """
+    if axis not in AXES:
+        raise ValueError(f"Unknown axis {axis}, expected one of {AXES}.")
+    if step is not None and not step > 0:
+        raise ValueError("step must be positive.")
+
+    positions = {}
+    for title, series in series_by_run.items():
+        if axis == 'time':
+            positions[title] = series['time']
+        else:
+            name = (distance_channels or {}).get(title)
+            if name is None or name not in series:
+                raise ValueError(f"Run {title} has no distance channel.")
+            if not np.isfinite(series[name]).any():
+                raise ValueError(f"Run {title} has no {name} values.")
+            distance = series[name] - np.nanmin(series[name])
+            positions[title] = np.fmax.accumulate(np.nan_to_num(distance, nan=0.0))
+
+    if step is None:
+        if axis == 'time':
+            spacings = [np.median(np.diff(x)) for x in positions.values() if len(x) > 1]
+            step = max(spacings) if spacings else 1.0
+        else:
+            step = DEFAULT_DISTANCE_STEP
+
+    end = max((np.nanmax(x) for x in positions.values() if len(x)), default=0.0)
+    if end // step + 1 > MAX_GRID_POINTS:
+        step = end / (MAX_GRID_POINTS - 1)
+    n_points = int(end // step) + 1
+    grid = np.arange(n_points) * step
+
+    runs = {}
+    for title, series in series_by_run.items():
+        x = positions[title]
+        runs[title] = {}
+        for channel in channels:
+            values = series.get(channel)
+            aligned = _interp(x, values, grid) if values is not None else np.full(n_points, np.nan)
+            runs[title][channel] = np.where(np.isnan(aligned), None, np.round(aligned, 4)).tolist()
+
+    return {"axis": axis, "step": float(step), "grid": np.round(grid, 4).tolist(), "runs": runs}
@@ -0,0 +1,218 @@
+"""
+chunks.py
+
+Chunked columnar layout of run telemetry in Firestore. Rather than one document per second,
+the channels of a run are split into small groups, each channel with all of its aggregate
+columns (see `ld_parser.decimation`), and every group is stored over fixed spans of rows as
+one document holding a float32 block:
+
+    ecu-data/<run>/chunks/g000_c00000 -> {"group": 0, "start-row": 0, "rows": 600, "values": <bytes>}
+
+`values` holds the group's columns one after another (column-major, little-endian float32,
+NaN where a channel has no value). The run document carries a `manifest` listing the column
+groups and the chunks, so a reader fetches just the chunks covering the columns and rows it
+needs with one batched read, and a channel's chunks hold only a few other channels.
+
+This module only builds and decodes the layout; the Firestore reads live in
+`firestore_async.py` and the writes in `uploads.py`.
+"""
+import math
+import numpy as np
+from ..ld_parser.decimation import aggregate_channel
+
+LAYOUT = 'chunked-v1'
+# Rows (buckets) per chunk; 10 minutes of a run decimated to 1 second buckets
+CHUNK_ROWS = 600
+# Channels per column group; a chunk of 4 channels x 4 aggregates x 600 rows is about 38 KiB,
+# well under Firestore's 1 MiB document limit
+CHANNELS_PER_GROUP = 4
+
+
+def chunk_id(group, chunk):
+    """Names the document of one chunk of one column group."""
+    return f'g{group:03}_c{chunk:05}'
+
+
+def build_chunks(df, chunk_rows=CHUNK_ROWS, channels_per_group=CHANNELS_PER_GROUP):
+    """
+    Splits a frame into the chunks of the layout.
+
+    Args:
+        df (DataFrame): One row per bucket, one column per channel and aggregate.
+        chunk_rows (int): Rows per chunk.
+        channels_per_group (int): Channels per column group; a channel's aggregate columns
+            always share its group.
+
+    Returns:
+        tuple: (manifest, chunks), the manifest dict stored on the run document and a dict
+            mapping each chunk ID to its document.
+    """
+    values = df.to_numpy(dtype='<f4')
+    n_rows = len(values)
+
+    # Column positions of every channel, in order of first appearance
+    channels = {}
+    for idx, name in enumerate(df.columns):
+        channels.setdefault(aggregate_channel(str(name)), []).append(idx)
+    positions = list(channels.values())
+
+    groups, chunks = [], {}
+    for group, first in enumerate(range(0, len(positions), channels_per_group)):
+        idxs = [idx for channel in positions[first:first + channels_per_group] for idx in channel]
+        groups.append({"columns": [str(df.columns[idx]) for idx in idxs]})
+        group_values = values[:, idxs]
+        for chunk, start in enumerate(range(0, n_rows, chunk_rows)):
+            block = group_values[start:start + chunk_rows]
+            chunks[chunk_id(group, chunk)] = {
+                "group": group,
+                "start-row": start,
+                "rows": len(block),
+                "values": np.ascontiguousarray(block.T).tobytes(),
+            }
+
+    manifest = {
+        "layout": LAYOUT,
+        "rows": n_rows,
+        "chunk-rows": chunk_rows,
+        "groups": groups,
+        "chunks": list(chunks),
+    }
+    return manifest, chunks
+
+
+def plan_reads(manifest, fields=None, start_row=0, stop_row=None):
+    """
+    Lists the chunks holding some of `fields` over rows [start_row, stop_row).
+
+    Args:
+        manifest (dict): The run's manifest, as built by `build_chunks`.
+        fields (list, optional): The columns to read. Defaults to every column.
+        start_row (int): The first row to read.
+        stop_row (int, optional): The row to stop before. Defaults to the end of the run.
+
+    Returns:
+        list: The chunk IDs to fetch.
+    """
+    stop_row = manifest["rows"] if stop_row is None else min(stop_row, manifest["rows"])
+    if stop_row <= start_row:
+        return []
+
+    wanted = None if fields is None else set(fields)
+    chunk_rows = manifest["chunk-rows"]
+    first_chunk, last_chunk = start_row // chunk_rows, math.ceil(stop_row / chunk_rows)
+
+    return [chunk_id(group, chunk)
+            for group, entry in enumerate(manifest["groups"])
+            if wanted is None or wanted.intersection(entry["columns"])
+            for chunk in range(first_chunk, last_chunk)]
+
+
+def assemble(manifest, chunk_docs, fields=None, start_row=0, stop_row=None):
+    """
+    Decodes fetched chunks into columns over rows [start_row, stop_row).
+
+    Args:
+        manifest (dict): The run's manifest, as built by `build_chunks`.
+        chunk_docs (dict): Maps chunk IDs (at least those of `plan_reads`) to their documents.
+        fields (list, optional): The columns to return. Defaults to every column.
+        start_row (int): The first row to return.
+        stop_row (int, optional): The row to stop before. Defaults to the end of the run.
+
+    Returns:
+        dict: Maps each requested column present in the run, in stored order, to a float32
+            array over the rows.
+    """
+    stop_row = manifest["rows"] if stop_row is None else min(stop_row, manifest["rows"])
+    n_rows = max(stop_row - start_row, 0)
+    wanted = None if fields is None else set(fields)
+
+    columns = {}
+    for group, entry in enumerate(manifest["groups"]):
+        names = [name for name in entry["columns"] if wanted is None or name in wanted]
+        if not names or n_rows == 0:
+            continue
+
+        block = np.full((len(entry["columns"]), n_rows), np.nan, dtype=np.float32)
+        for chunk in range(start_row // manifest["chunk-rows"], math.ceil(stop_row / manifest["chunk-rows"])):
+            doc = chunk_docs.get(chunk_id(group, chunk))
+            if doc is None:
+                continue
+            values = np.frombuffer(doc["values"], dtype='<f4').reshape(len(entry["columns"]), doc["rows"])
+            lo, hi = max(start_row, doc["start-row"]), min(stop_row, doc["start-row"] + doc["rows"])
+            block[:, lo - start_row:hi - start_row] = values[:, lo - doc["start-row"]:hi - doc["start-row"]]
+
+        for idx, name in enumerate(entry["columns"]):
+            if name in names:
+                columns[name] = block[idx]
+    return columns
+
+
+def row_id(row):
+    """Names the per-second document of a row, as the API has always returned it."""
+    return f'data_{row:06}'
+
+
+def row_of(doc_id):
+    """The row of a per-second document ID, e.g. 123 for `data_000123`."""
+    return int(doc_id.rsplit('_', 1)[-1])
+
+
+def row_ids(columns, start_row=0):
+    """The `data_XXXXXX` IDs of the rows of `columns` (as from `assemble`), starting at `start_row`."""
+    n_rows = len(next(iter(columns.values()))) if columns else 0
+    return [row_id(start_row + idx) for idx in range(n_rows)]
+
+
+def to_rows(columns, start_row=0):
+    """
+    Turns columns back into the per-second documents the API has always returned, with
+    their `data_XXXXXX` IDs and without the channels that have no value at that row.
+
+    Args:
+        columns (dict): Maps column names to arrays over the same rows, as from `assemble`.
+        start_row (int): The row index of the arrays' first element.
+
+    Returns:
+        list: One dict per row.
+    """
+    n_rows = len(next(iter(columns.values()))) if columns else 0
+    lists = {name: values.tolist() for name, values in columns.items()}
+
+    rows = []
+    for idx in range(n_rows):
+        row = {name: values[idx] for name, values in lists.items() if values[idx] == values[idx]}  # NaN != NaN
+        row['id'] = row_id(start_row + idx)
+        rows.append(row)
+    return rows
+
+
+def _to_float(value):
+    """A stored value as a float; None, '' and other non-numeric values (e.g. from CSV uploads) are NaN."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def to_columns(rows):
+    """
+    Turns per-second documents into columns, the inverse of `to_rows`. Only needed for runs
+    stored before the chunked layout, whose documents are read one per second.
+
+    Args:
+        rows (list): Document dicts, each with its document ID under `id`.
+
+    Returns:
+        tuple: (ids, columns), the list of document IDs and a dict mapping each field, in
+            order of first appearance, to a float32 array with NaN where a row lacks it.
+    """
+    names = {}
+    for row in rows:
+        names.update(dict.fromkeys(row))
+    names.pop('id', None)
+
+    ids = [row.get('id') for row in rows]
+    columns = {}
+    for name in names:
+        columns[name] = np.fromiter((_to_float(row.get(name)) for row in rows), dtype=np.float32, count=len(rows))
+    return ids, columns
@@ -0,0 +1,74 @@
+"""
+cursors.py
+
+Opaque, signed page cursors. A cursor carries the ordering key values of the row a page
+starts after or ends before (e.g. the row index of a run, or an issue's number and ID), so the next
+query can resume from those values directly instead of first fetching the cursor's document.
+The HMAC over the payload (keyed with the Django SECRET_KEY) and the scope it was issued for
+(e.g. the run) keep clients from forging cursors or replaying them against another query.
+"""
+import base64
+import hashlib
+import hmac
+import json
+from django.conf import settings
+
+# Bytes of the HMAC-SHA256 kept in a cursor
+SIGNATURE_BYTES = 12
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def _sign(payload):
+    key = (settings.SECRET_KEY or '').encode('utf-8')
+    return hmac.new(key, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+def encode_cursor(scope, keys):
+    """
+    Builds a cursor token.
+
+    Args:
+        scope (str): What the cursor pages through, e.g. `run:<run title>` or `issues`.
+        keys (list): The JSON-serialisable ordering key values of the boundary row.
+
+    Returns:
+        str: The URL-safe token.
+    """
+    payload = json.dumps({"s": scope, "k": keys}, separators=(',', ':')).encode('utf-8')
+    return f'{_b64encode(payload)}.{_b64encode(_sign(payload))}'
+
+
+def decode_cursor(scope, token):
+    """
+    Verifies a cursor token and reads its ordering key values.
+
+    Args:
+        scope (str): The scope the cursor must have been issued for.
+        token (str): The token, as built by `encode_cursor`.
+
+    Raises:
+        ValueError: If the token is malformed, forged, or issued for another scope.
+
+    Returns:
+        list: The ordering key values.
+    """
+    try:
+        payload_text, signature_text = token.split('.')
+        payload, signature = _b64decode(payload_text), _b64decode(signature_text)
+    except Exception:
+        raise ValueError("Malformed cursor.")
+
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise ValueError("Invalid cursor signature.")
+
+    data = json.loads(payload.decode('utf-8'))
+    if data.get("s") != scope:
+        raise ValueError("Cursor was issued for another query.")
+    return data["k"]
@@ -0,0 +1,765 @@
+"""
+firestore_async.py
+
+Every Firestore read and write behind the views (drivers, runs and issues), built on the
+Firestore `AsyncClient`: every function is a coroutine, queries are streamed with `async for`,
+and concurrent requests overlap their Firestore round trips on the event loop instead of
+queueing for `sync_to_async`'s thread.
+
+The client's gRPC channel is bound to the event loop it is opened on, while under WSGI every
+async view runs on a loop of its own (`async_to_sync`). So one client lives on one long-lived
+loop in a daemon thread, and every public coroutine here runs there (see `_on_client_loop`),
+whichever loop awaits it; under ASGI that is one hop between two long-lived loops.
+
+Ingest, which is CPU-bound and runs in a worker thread anyway, writes with the sync client
+(see `uploads.py`).
+
+Drivers and issues are read from in-memory mirrors of their collections (see `mirror.py`)
+once those are warm, and from Firestore until then.
+"""
+import asyncio
+import bisect
+import functools
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from django.conf import settings
+from .firebase import firebase_app
+from .chunks import LAYOUT, assemble, plan_reads, row_id, row_ids, to_columns, to_rows
+from .firestore import _issue_document, _selected_fields
+from .firestore import db as sync_db
+from .issue_counter import ISSUE_COUNTER_SHARDS, ISSUE_TRANSACTION_SIZE, allocate_issues, issue_counter_ref
+from .issue_index import IssueIndex
+from .mirror import CollectionMirror
+from .telemetry_cache import TelemetryCache, run_data_cache
+from .ttl_cache import list_cache
+from firebase_admin import firestore, firestore_async
+
+issue_index = IssueIndex()
+# Fields of a run document listed on the runs page; the stats, segments and chunk manifest stay behind
+RUN_SUMMARY_FIELDS = ('run-date', 'driver-id')
+# The loop the AsyncClient lives on, and the client; both created on first use
+_client_loop = None
+_client = None
+_client_loop_lock = threading.Lock()
+
+# Snapshot listeners need the sync client; the issues mirror keeps the issue index current
+drivers_mirror = CollectionMirror(sync_db.collection('driver-profiles'), id_field='driverId',
+                                  max_age=settings.FIRESTORE_MIRROR_MAX_AGE_SECONDS)
+issues_mirror = CollectionMirror(sync_db.collection('issues'), on_change=issue_index.rebuild,
+                                 max_age=settings.FIRESTORE_MIRROR_MAX_AGE_SECONDS)
+
+
+def _get_client_loop():
+    """The event loop the AsyncClient lives on, running in a daemon thread started on first use."""
+    global _client_loop
+    with _client_loop_lock:
+        if _client_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='firestore-async', daemon=True).start()
+            _client_loop = loop
+    return _client_loop
+
+
+def _db():
+    """The AsyncClient, created on the first call. Only called on the client loop, so never raced."""
+    global _client
+    if _client is None:
+        _client = firestore_async.AsyncClient(credentials=firebase_app.credential.get_credential(),
+                                              project=firebase_app.project_id)
+    return _client
+
+
+def _on_client_loop(func):
+    """Runs a coroutine function on the client loop, whichever event loop awaits it."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = _get_client_loop()
+        if asyncio.get_running_loop() is loop:
+            return await func(*args, **kwargs)
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(func(*args, **kwargs), loop))
+    return wrapper
+
+
+def _start_mirrors():
+    """
+    Subscribes the collection mirrors on first use, so management commands open no listeners, and
+    replaces a listener that has failed or gone quiet (see `CollectionMirror.start`).
+    """
+    if settings.FIRESTORE_MIRRORS_ENABLED:
+        drivers_mirror.start()
+        issues_mirror.start()
+
+
+@_on_client_loop
+async def add_driver(data):
+    """
+    Adds a driver document to the 'driver-profiles' collection in Firestore.
+
+    Args:
+        data (dict): A dictionary containing user information to be stored.
+                     Example: {"name": "John Doe", "email": "john@example.com"}
+
+    Returns:
+        None
+    """
+    try:
+        if not isinstance(data, dict):
+            raise ValueError("Input must be a dictionary.")
+
+        if not data:
+            raise ValueError("Input dictionary cannot be empty.")
+
+        main_db = _db().collection('driver-profiles')
+        existing_driver_query = main_db.where('firstName', '==', data['firstName'])\
+            .where('lastName', '==', data['lastName'])\
+            .limit(1)
+        driver_exists = [doc async for doc in existing_driver_query.stream()]
+        if not driver_exists:
+            await main_db.add(data)
+            list_cache.invalidate('all-drivers')
+            print(f"Driver profile for {data['firstName']} {data['lastName']} added.")
+        else:
+            print(f"Driver profile for {data['firstName']} {data['lastName']} already exists.")
+
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+        return None
+
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return None
+
+
+@_on_client_loop
+async def get_all_drivers(filters=None):
+    """
+    Retrieves all users from the 'driver-profiles' collection with optional filtering, served
+    from the drivers mirror, or while it is cold from the list cache until `add_driver` writes
+    or the entry expires.
+
+    Args:
+        filters (dict, optional): Dictionary of filter conditions.
+
+    Returns:
+        list: List of dictionaries containing user data
+    """
+    try:
+        _start_mirrors()
+        drivers = drivers_mirror.documents()
+        if drivers is not None:
+            return [driver for driver in drivers
+                    if all(driver.get(key) == value for key, value in (filters or {}).items() if value is not None)]
+
+        cache_key = ('all-drivers', tuple(sorted((filters or {}).items())))
+        drivers = list_cache.get(cache_key)
+        if drivers is not None:
+            return drivers
+
+        query = _db().collection('driver-profiles')
+
+        if filters:
+            for key, value in filters.items():
+                if value is not None:
+                    query = query.where(key, '==', value)
+
+        drivers = []
+        async for doc in query.stream():
+            driver_data = doc.to_dict()
+            driver_data['driverId'] = doc.id
+            drivers.append(driver_data)
+
+        list_cache.put(cache_key, drivers)
+        return drivers
+
+    except Exception as e:
+        print(f"An error occurred while retrieving users: {e}")
+        return []
+
+
+@_on_client_loop
+async def get_specific_driver(driverId):
+    """
+    Retrieves a specific driver from the 'driver-profiles' collection, based on the inputted driver ID.
+
+    Args:
+        driverId (string): String of driver ID.
+
+    Returns:
+        dict: JSON of the driver data (as a dictionary)
+    """
+    try:
+        _start_mirrors()
+        driver = drivers_mirror.get(driverId)
+        if driver is not None:
+            return driver
+
+        doc = await _db().collection('driver-profiles').document(driverId).get()
+
+        if doc.exists:
+            updated_dict = doc.to_dict()
+            updated_dict["driverId"] = doc.id
+            return updated_dict
+        else:
+            return dict()
+
+    except Exception as e:
+        print(f"An error occurred while retrieving users: {e}")
+        return dict()
+
+
+@_on_client_loop
+async def get_run_metadata(run_title):
+    """
+    Retrieves the run document computed at ingest, holding e.g. the per-channel statistics
+    (`stats`, see `ld_parser.stats`) and the lap/segment index (`segments`, see `ld_parser.laps`).
+
+    Args:
+        run_title (str): The run's document ID in 'ecu-data'.
+
+    Returns:
+        dict: The run document. Empty if the run does not exist.
+    """
+    try:
+        doc = await _db().collection('ecu-data').document(run_title).get()
+        if doc.exists:
+            return doc.to_dict()
+        return dict()
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling run metadata: {e}")
+        return dict()
+
+
+async def _read_chunked_run(run_title, manifest, fields=None, start_row=0, stop_row=None, as_columns=False):
+    """
+    Reads rows [start_row, stop_row) of a run stored in the chunked layout, fetching only the
+    chunks that hold the requested fields with one batched read.
+
+    Returns:
+        list: The per-second documents, as `to_rows` builds them.
+        tuple: With `as_columns`, the (ids, columns) of the rows, with the assembled float32
+            arrays as they are.
+    """
+    db = _db()
+    chunks_ref = db.collection('ecu-data').document(run_title).collection('chunks')
+    refs = [chunks_ref.document(doc_id) for doc_id in plan_reads(manifest, fields, start_row, stop_row)]
+    chunk_docs = {doc.id: doc.to_dict() async for doc in db.get_all(refs) if doc.exists}
+    columns = assemble(manifest, chunk_docs, fields, start_row, stop_row)
+    if as_columns:
+        return row_ids(columns, start_row), columns
+    return to_rows(columns, start_row)
+
+
+async def _stream_rows(query):
+    """Streams a query of per-second documents into dicts with their document ID under 'id'."""
+    data_list = []
+    async for doc in query.stream():
+        doc_data = doc.to_dict()
+        doc_data['id'] = doc.id
+        data_list.append(doc_data)
+    return data_list
+
+
+@_on_client_loop
+async def get_specific_run_data(run_title, categories_list=[], start_second=None, end_second=None, metadata=None,
+                                as_columns=False):
+    """
+    Retrieves the per-second data of a run, optionally limited to a time range
+    (e.g. one lap of the run's segment index), through the telemetry cache.
+
+    Args:
+        run_title (str): The run's document ID in 'ecu-data'.
+        categories_list (list): Channels to select. Defaults to every channel.
+        start_second (float, optional): Start of the time range in seconds.
+        end_second (float, optional): End of the time range in seconds (exclusive).
+        metadata (dict, optional): The run document, if the caller already has it.
+        as_columns (bool): Whether to return columns (for the binary responses of `columnar.py`)
+            rather than per-second dicts.
+
+    Returns:
+        list: One dict per second, with its `data_XXXXXX` ID under 'id'. Shared with the cache,
+            so it must not be modified.
+        tuple: With `as_columns`, (ids, columns), the per-second document IDs and a dict of
+            float32 arrays by field (see `chunks.to_columns`). Also shared with the cache.
+        None: If an error occurs.
+    """
+    try:
+        if metadata is None:
+            metadata = await get_run_metadata(run_title)
+
+        cache_key = TelemetryCache.key(run_title, TelemetryCache.version(metadata), categories_list,
+                                       ('range', start_second, end_second, as_columns))
+        data_list = run_data_cache.get(cache_key)
+        if data_list is None:
+            data_list = await _get_specific_run_data(run_title, categories_list, start_second, end_second, metadata,
+                                                     as_columns)
+            if data_list is not None:
+                run_data_cache.put(cache_key, data_list)
+        return data_list
+
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling specific document data: {e}")
+        return None
+
+
+async def _get_specific_run_data(run_title, categories_list, start_second, end_second, metadata, as_columns=False):
+    """Reads the per-second data of a run from Firestore (see `get_specific_run_data`)."""
+    bucket_seconds = metadata.get('bucket-seconds', 1)
+    start_row = int(start_second // bucket_seconds) if start_second is not None else None
+    stop_row = int(math.ceil(end_second / bucket_seconds)) if end_second is not None else None
+
+    manifest = metadata.get('manifest')
+    if manifest and manifest.get('layout') == LAYOUT:
+        return await _read_chunked_run(run_title, manifest, _selected_fields(categories_list), start_row or 0, stop_row,
+                                       as_columns)
+
+    # Runs uploaded before the chunked layout keep one document per second
+    document_query = _db().collection('ecu-data').document(run_title).collection('data')
+
+    if len(categories_list) > 0:
+        document_query = document_query.select([f'`{field}`' for field in _selected_fields(categories_list)])
+
+    if start_row is not None or stop_row is not None:
+        document_query = document_query.order_by('__name__')
+        if start_row is not None:
+            document_query = document_query.start_at({'__name__': row_id(start_row)})
+        if stop_row is not None:
+            document_query = document_query.end_before({'__name__': row_id(stop_row)})
+
+    data_list = await _stream_rows(document_query)
+    return to_columns(data_list) if as_columns else data_list
+
+
+
+@_on_client_loop
+async def get_specific_run_data_paginated(run_title, page_size, start_after_row=None, end_before_row=None, categories_list=[], metadata=None,
+                                          as_columns=False):
+    """
+    Retrieves one page of the per-second data of a run, through the telemetry cache. Pages
+    are addressed by row index, so no cursor document has to be fetched first.
+
+    Args:
+        run_title (str): The run's document ID in 'ecu-data'.
+        page_size (int): The number of rows per page.
+        start_after_row (int, optional): The page holds the rows after this one.
+        end_before_row (int, optional): The page holds the rows before this one (the previous page).
+        categories_list (list): Channels to select. Defaults to every channel.
+        metadata (dict, optional): The run document, if the caller already has it.
+        as_columns (bool): Whether to return columns rather than per-second dicts (see
+            `get_specific_run_data`).
+
+    Returns:
+        list: One dict per second, with its `data_XXXXXX` ID under 'id'. Shared with the cache,
+            so it must not be modified.
+        tuple: With `as_columns`, (ids, columns), see `get_specific_run_data`.
+        None: If an error occurs.
+    """
+    try:
+        if metadata is None:
+            metadata = await get_run_metadata(run_title)
+
+        cache_key = TelemetryCache.key(run_title, TelemetryCache.version(metadata), categories_list,
+                                       ('page', int(page_size), start_after_row, end_before_row, as_columns))
+        data_list = run_data_cache.get(cache_key)
+        if data_list is None:
+            data_list = await _get_specific_run_data_paginated(run_title, int(page_size), start_after_row, end_before_row,
+                                                              categories_list, metadata, as_columns)
+            if data_list is not None:
+                run_data_cache.put(cache_key, data_list)
+        return data_list
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling specific document data (paginated): {e}")
+        return None
+
+
+async def _get_specific_run_data_paginated(run_title, page_size, start_after_row, end_before_row, categories_list, metadata,
+                                           as_columns=False):
+    """Reads one page of the per-second data of a run from Firestore (see `get_specific_run_data_paginated`)."""
+    manifest = metadata.get('manifest')
+    if manifest and manifest.get('layout') == LAYOUT:
+        if start_after_row is not None:
+            start_row = start_after_row + 1
+        elif end_before_row is not None:
+            start_row = max(end_before_row - page_size, 0)
+        else:
+            start_row = 0
+        stop_row = start_row + page_size
+        if start_after_row is None and end_before_row is not None:
+            stop_row = min(stop_row, end_before_row)
+        return await _read_chunked_run(run_title, manifest, _selected_fields(categories_list), start_row, stop_row,
+                                       as_columns)
+
+    # Runs uploaded before the chunked layout keep one document per second; the cursor row maps
+    # straight onto a document ID, so queries resume from the ID value rather than a fetched snapshot
+    document_query = _db().collection('ecu-data').document(run_title).collection('data')
+
+    if len(categories_list) > 0:
+        document_query = document_query.select([f'`{field}`' for field in _selected_fields(categories_list)])
+
+    if start_after_row is None and end_before_row is not None:
+        # The previous page is the first page of the reversed order, flipped back
+        document_query = document_query.order_by('__name__', direction=firestore.Query.DESCENDING)\
+            .start_after({'__name__': row_id(end_before_row)})
+        data_list = (await _stream_rows(document_query.limit(page_size)))[::-1]
+    else:
+        document_query = document_query.order_by('__name__')
+        if start_after_row is not None:
+            document_query = document_query.start_after({'__name__': row_id(start_after_row)})
+        data_list = await _stream_rows(document_query.limit(page_size))
+
+    return to_columns(data_list) if as_columns else data_list
+
+
+@_on_client_loop
+async def get_run_row_count(run_title, metadata=None):
+    """
+    Counts the stored rows (seconds) of a run, from its manifest, or with an aggregation query
+    for runs uploaded before the chunked layout.
+
+    Args:
+        run_title (str): The run's document ID in 'ecu-data'.
+        metadata (dict, optional): The run document, if the caller already has it.
+
+    Returns:
+        int: The number of rows.
+        None: If an error occurs.
+    """
+    try:
+        if metadata is None:
+            metadata = await get_run_metadata(run_title)
+
+        manifest = metadata.get('manifest')
+        if manifest and manifest.get('layout') == LAYOUT:
+            return manifest['rows']
+
+        results = await _db().collection('ecu-data').document(run_title).collection('data').count().get()
+        return int(results[0][0].value)
+    except Exception as e:
+        print(f"An unexpected error occurred when counting run rows: {e}")
+        return None
+
+
+@_on_client_loop
+async def get_general_run_data(filter_limit=10, filtered_date=None, filtered_driver=None):
+    """
+    Retrieves run-relevant data in a simplified format, as demonstrated in the /run-data path,
+    served from the list cache until a run is ingested or the entry expires. To support
+    pagination, the `filter_limit` most recent entries are taken, and only their
+    RUN_SUMMARY_FIELDS are read, so the list does not grow with the runs' channel count.
+
+    Args:
+        filtered_date (datetime): Corresponds to the datetime to filter the run data by
+        filtered_driver (str): Corresponds the str to filter the run data by
+
+    Returns:
+        List of all simplified results
+    """
+    try:
+        cache_key = ('general-run-data', filter_limit, filtered_date, filtered_driver)
+        data_list = list_cache.get(cache_key)
+        if data_list is not None:
+            return data_list
+
+        filtered_docs_query = _db().collection('ecu-data')\
+            .select([f'`{field}`' for field in RUN_SUMMARY_FIELDS])\
+            .order_by('`run-date`', direction=firestore.Query.DESCENDING)\
+            .limit(filter_limit)
+
+        data_list = await _stream_rows(filtered_docs_query)
+        list_cache.put(cache_key, data_list)
+        return data_list
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return None
+
+
+@_on_client_loop
+async def get_latest_issue_number():
+    try:
+        query = _db().collection('issues')\
+            .order_by('issue_number', direction=firestore.Query.DESCENDING)\
+            .limit(1)
+
+        # Pulls the first entry
+        async for doc in query.stream():
+            return doc.to_dict()['issue_number']
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling specific document data (latest issue number): {e}")
+        return None
+
+
+# The counter transaction (see `issue_counter.allocate_issues`), retried by the client on contention
+_allocate_issues_in_transaction = firestore_async.async_transactional(allocate_issues)
+
+
+async def _create_issues(issue_docs):
+    """
+    Numbers and creates issue documents. All the numbers are taken in one transaction on a random
+    counter shard; issues that fit in that transaction are created in it, larger batches are
+    written after it, ISSUE_TRANSACTION_SIZE at a time, stopping at the first write that fails.
+
+    Returns:
+        tuple: The {"issue_id", "issue_number"} dicts of the issues created, in order, and the
+        exception that stopped the writes (None once every issue is created).
+    """
+    db = _db()
+    shard = random.randrange(ISSUE_COUNTER_SHARDS)
+    issues = [(db.collection('issues').document(), issue_data) for issue_data in issue_docs]
+    inline = issues if len(issues) <= ISSUE_TRANSACTION_SIZE else ()
+    numbers = await _allocate_issues_in_transaction(
+        db.transaction(), issue_counter_ref(db, shard), shard, len(issues), inline,
+        latest_issue_number=get_latest_issue_number)
+
+    written, error = len(inline), None
+    while written < len(issues):
+        batch = db.batch()
+        for (doc_ref, issue_data), number in zip(issues[written:written + ISSUE_TRANSACTION_SIZE], numbers[written:]):
+            batch.create(doc_ref, {**issue_data, 'issue_number': number})
+        try:
+            await batch.commit()
+        except Exception as e:
+            # The remaining numbers stay taken, leaving a gap in the numbering
+            error = e
+            break
+        written = min(written + ISSUE_TRANSACTION_SIZE, len(issues))
+
+    created = list(zip(issues[:written], numbers))
+    if issue_index.loaded_at is not None:
+        # The server timestamp is only known after a read; the local time orders the issue closely enough
+        now = datetime.now(timezone.utc)
+        for (doc_ref, issue_data), number in created:
+            issue_index.upsert({**issue_data, 'created_at': now, 'issue_number': number, 'id': doc_ref.id})
+
+    return [{"issue_id": doc_ref.id, "issue_number": number} for (doc_ref, _), number in created], error
+
+
+@_on_client_loop
+async def add_issue(data):
+    try:
+        # Number the issue off a counter shard, atomically with creating it
+        created, _ = await _create_issues([_issue_document(data)])
+        data['issue_number'] = created[0]['issue_number']
+
+        print(f"Issue '{data['synopsis']}' added with ID: {created[0]['issue_id']}")
+        return created[0]
+
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+        return None
+
+    except Exception as e:
+        print(f"An unexpected error occurred while adding issue: {e}")
+        return None
+
+
+@_on_client_loop
+async def add_issues(data_list):
+    """
+    Adds many issues at once, e.g. when entering a test day's notes. The issues are numbered in
+    submission order by one counter transaction; up to ISSUE_TRANSACTION_SIZE issues are created
+    in that transaction, larger batches in sequential writes of that size after it.
+
+    Args:
+        data_list (list): The issues, each as accepted by `add_issue`.
+
+    Returns:
+        list: One {"issue_id", "issue_number"} dict per issue created, in submission order. If a
+            write fails part way, the list is shorter than `data_list`: it holds the issues that
+            were created before the failure, and the rest are not added.
+        None: If an issue is invalid or numbering fails (nothing is added).
+    """
+    try:
+        issue_docs = [_issue_document(data) for data in data_list]
+        created, error = await _create_issues(issue_docs)
+
+        if error is not None:
+            print(f"Added {len(created)} of {len(issue_docs)} issues before an error: {error}")
+        else:
+            print(f"Added {len(issue_docs)} issues.")
+        return created
+
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+        return None
+
+    except Exception as e:
+        print(f"An unexpected error occurred while adding issues: {e}")
+        return None
+
+
+async def _issue_index():
+    """
+    Returns the issue index. The issues mirror keeps it current once warm; until then it is
+    (re)loaded from the 'issues' collection when it has not been loaded yet or is older than
+    ISSUE_INDEX_TTL_SECONDS (writes from other processes).
+    """
+    _start_mirrors()
+    if issues_mirror.ready:
+        return issue_index
+
+    loaded_at = issue_index.loaded_at
+    if loaded_at is None or time.monotonic() - loaded_at > settings.ISSUE_INDEX_TTL_SECONDS:
+        issue_index.rebuild(await _stream_rows(_db().collection('issues')))
+    return issue_index
+
+
+@_on_client_loop
+async def get_all_issues(filters=None):
+    """
+    Retrieves all issues with optional filtering, newest first, from the issue index.
+
+    Args:
+        filters (dict, optional): Maps `driver`, `subsystem`, `priority` and `status` to a value
+            or a list of values (see `IssueIndex.query`).
+
+    Returns:
+        list: List of dictionaries containing issue data, including priority and status.
+        None: If an error occurs.
+    """
+    try:
+        index = await _issue_index()
+        return index.query(filters, order_by='created_at')
+
+    except Exception as e:
+        print(f"An error occurred while retrieving issues: {e}")
+        return None
+
+
+def _issue_page_key(issue_number, issue_id):
+    """
+    The position of an issue in `get_issues_paginated`'s order: highest number first, then by ID,
+    with unnumbered (legacy) issues last, so every issue has a distinct key a cursor can hold.
+    """
+    if issue_number is None:
+        return (1, 0, issue_id)
+    return (0, -issue_number, issue_id)
+
+
+@_on_client_loop
+async def get_issues_paginated(page_size, start_at_doc="", start_after_doc="", filters=None,
+                               after_key=None, before_key=None):
+    """
+    Retrieves one page of issues, highest issue number first, from the issue index.
+
+    Args:
+        page_size (int): The number of issues per page.
+        start_at_doc (str): The ID of the issue the page starts at.
+        start_after_doc (str): The ID of the issue the page starts after.
+        filters (dict, optional): See `get_all_issues`; several subsystems may be given.
+        after_key (tuple, optional): The (issue number, ID) of the issue the page starts after.
+        before_key (tuple, optional): The (issue number, ID) of the issue the page ends before
+            (the previous page).
+
+    Returns:
+        list: The page's issue dicts.
+        None: If an error occurs.
+    """
+    try:
+        index = await _issue_index()
+        issues = index.query(filters, order_by='issue_number')
+        page_size = int(page_size)
+
+        keys = [_issue_page_key(issue.get('issue_number'), issue['id']) for issue in issues]
+        if after_key is not None:
+            start = bisect.bisect_right(keys, _issue_page_key(*after_key))
+        elif before_key is not None:
+            end = bisect.bisect_left(keys, _issue_page_key(*before_key))
+            return issues[max(end - page_size, 0):end]
+        else:
+            start = 0
+            cursor = start_at_doc or start_after_doc
+            if cursor:
+                position = next((i for i, issue in enumerate(issues) if issue['id'] == cursor), None)
+                if position is not None:
+                    start = position if start_at_doc else position + 1
+
+        return issues[start:start + page_size]
+    except Exception as e:
+        print(f"An unexpected error occurred when pulling issues (paginated): {e}")
+        return None
+
+
+@_on_client_loop
+async def get_issue_facets(filters=None):
+    """
+    Counts the issues matching `filters`, along with the count of every filter value.
+
+    Args:
+        filters (dict, optional): See `get_all_issues`.
+
+    Returns:
+        dict: `count`, the number of matching issues, and `facets`, see `IssueIndex.facets`.
+        None: If an error occurs.
+    """
+    try:
+        index = await _issue_index()
+        return {"count": index.count(filters), "facets": index.facets(filters)}
+    except Exception as e:
+        print(f"An unexpected error occurred when counting issues: {e}")
+        return None
+
+
+@_on_client_loop
+async def update_issue(issue_id: str, data: dict):
+    try:
+        if not isinstance(data, dict):
+            raise ValueError("Input must be a dictionary.")
+        if not issue_id:
+            raise ValueError("Issue ID must be provided.")
+
+        issue_data = {
+            'driver': data.get('driver'),
+            'date': data.get('date'),
+            'synopsis': data.get('synopsis'),
+            'subsystems': data.get('subsystems'),
+            'description': data.get('description'),
+            'priority': data.get('priority'),
+            'status': data.get('status'),
+            'updated_at': firestore.SERVER_TIMESTAMP
+        }
+        issue_data = {k: v for k, v in issue_data.items() if v is not None}
+
+        doc_ref = _db().collection('issues').document(issue_id)
+
+        # Check if document exists
+        if not (await doc_ref.get()).exists:
+            raise ValueError(f"Issue with ID {issue_id} not found.")
+
+        await doc_ref.update(issue_data)
+        issue_index.update(issue_id, {**issue_data, 'updated_at': datetime.now(timezone.utc)})
+        print(f"Issue {issue_id} updated successfully")
+        return {"issue_id": issue_id}
+
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred while updating issue: {e}")
+        return None
+
+
+@_on_client_loop
+async def delete_issue(issue_id: str):
+    try:
+        if not issue_id:
+            raise ValueError("Issue ID must be provided.")
+
+        doc_ref = _db().collection('issues').document(issue_id)
+
+        if not (await doc_ref.get()).exists:
+            print(f"Issue with ID {issue_id} not found.")
+            return None
+
+        await doc_ref.delete()
+        issue_index.remove(issue_id)
+        print(f"Issue {issue_id} deleted successfully")
+        return {"issue_id": issue_id}
+
+    except ValueError as ve:
+        print(f"ValueError: {ve}")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred while deleting issue: {e}")
+        return None
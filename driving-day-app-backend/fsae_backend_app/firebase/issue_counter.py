@@ -0,0 +1,64 @@
+"""
+issue_counter.py
+
+Numbering of issues off sharded counter documents, `counters/issues-<shard>`. Shard k of S
+hands out k+1, k+1+S, k+1+2S, ..., so concurrent submissions number issues without
+contending on one document and without colliding across shards.
+
+Nothing here touches Firebase: `allocate_issues` is the body of the counter transaction, and
+`firestore_async` runs it with `firestore_async.async_transactional` on the project's client.
+"""
+
+ISSUE_COUNTER_COLLECTION = 'counters'
+# More shards let concurrent submissions number issues without contending on one document
+ISSUE_COUNTER_SHARDS = 1
+# Issues created per transaction when adding in bulk (Firestore allows 500 writes, one is the counter)
+ISSUE_TRANSACTION_SIZE = 499
+
+
+def issue_numbers(count, n, shards, shard):
+    """The `n` issue numbers a counter shard hands out after having handed out `count`."""
+    return [shards * (count + i) + shard + 1 for i in range(n)]
+
+
+def seed_count(latest_issue_number, shards):
+    """Starting count of a new counter shard, so that it only hands out numbers above the latest issue."""
+    latest_issue_number = int(latest_issue_number or 0)
+    return latest_issue_number if shards == 1 else latest_issue_number // shards + 1
+
+
+def issue_counter_ref(client, shard):
+    return client.collection(ISSUE_COUNTER_COLLECTION).document(f'issues-{shard}')
+
+
+async def allocate_issues(transaction, counter_ref, shard, count, issues=(), latest_issue_number=None,
+                          shards=ISSUE_COUNTER_SHARDS):
+    """
+    Within `transaction`, takes the next `count` numbers from a counter shard. The issue documents
+    in `issues` (at most ISSUE_TRANSACTION_SIZE) are created with the first of those numbers in
+    the same transaction, so the numbers and the issues are committed in the same write.
+
+    Args:
+        transaction: The Firestore transaction.
+        counter_ref: The counter shard's document (see `issue_counter_ref`).
+        shard (int): The shard's index.
+        count (int): The number of issue numbers to take.
+        issues (list): (document reference, issue document) pairs to create in the transaction.
+        latest_issue_number (callable): Coroutine function returning the highest issue number
+            stored, to seed a shard that does not exist yet.
+        shards (int): The number of counter shards.
+
+    Returns:
+        list: The `count` issue numbers, in order.
+    """
+    snapshot = await counter_ref.get(transaction=transaction)
+    if snapshot.exists:
+        current = snapshot.get('count')
+    else:
+        current = seed_count(await latest_issue_number() if latest_issue_number else None, shards)
+
+    numbers = issue_numbers(current, count, shards, shard)
+    transaction.set(counter_ref, {'count': current + count})
+    for (doc_ref, issue_data), number in zip(issues, numbers):
+        transaction.create(doc_ref, {**issue_data, 'issue_number': number})
+    return numbers
@@ -0,0 +1,201 @@
+"""
+issue_index.py
+
+In-process bitmap index of the 'issues' collection. Every issue gets a slot, and every value
+of every indexed field (subsystem, priority, status, driver) gets a bitmap (a Python int)
+with the slots of the issues that have it. Filters become a handful of bitwise ANDs and ORs
+over these bitmaps, and facet counts are popcounts, so the issues page never has to stream
+the whole collection to filter or count it.
+"""
+import threading
+import time
+
+# Indexed issue field -> the filter name it is queried by. `subsystems` holds a list.
+FIELDS = {
+    'subsystems': 'subsystem',
+    'priority': 'priority',
+    'status': 'status',
+    'driver': 'driver',
+}
+
+
+def _popcount(bitmap):
+    return bin(bitmap).count('1')
+
+
+def _slots(bitmap):
+    """Yields the slots set in a bitmap, lowest first."""
+    while bitmap:
+        lowest = bitmap & -bitmap
+        yield lowest.bit_length() - 1
+        bitmap ^= lowest
+
+
+def _values(issue, field):
+    value = issue.get(field)
+    if isinstance(value, (list, tuple)):
+        return set(value)
+    return set() if value is None else {value}
+
+
+class IssueIndex(object):
+    """Bitmap index over a set of issue documents, kept current by the issue write paths."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._issues = []   # slot -> issue dict, None once deleted
+        self._slot = {}     # issue ID -> slot
+        self._live = 0      # bitmap of the slots holding an issue
+        self._bitmaps = {field: {} for field in FIELDS}
+        self.loaded_at = None
+
+    def rebuild(self, issues):
+        """
+        Replace the indexed issues.
+
+        Args:
+            issues (list): Issue dicts, each with its document ID under `id`.
+        """
+        with self._lock:
+            self._issues, self._slot, self._live = [], {}, 0
+            self._bitmaps = {field: {} for field in FIELDS}
+            for issue in issues:
+                self._insert(issue)
+            self.loaded_at = time.monotonic()
+
+    def _insert(self, issue):
+        slot = len(self._issues)
+        self._issues.append(issue)
+        self._slot[issue['id']] = slot
+        self._live |= 1 << slot
+        for field in FIELDS:
+            for value in _values(issue, field):
+                self._bitmaps[field][value] = self._bitmaps[field].get(value, 0) | 1 << slot
+
+    def _clear(self, issue_id):
+        slot = self._slot.pop(issue_id, None)
+        if slot is None:
+            return
+        mask = ~(1 << slot)
+        self._live &= mask
+        for field in FIELDS:
+            for value in _values(self._issues[slot], field):
+                self._bitmaps[field][value] &= mask
+                if not self._bitmaps[field][value]:
+                    del self._bitmaps[field][value]
+        self._issues[slot] = None
+
+    def upsert(self, issue):
+        """
+        Add an issue, or replace the indexed copy of it.
+
+        Args:
+            issue (dict): The issue, with its document ID under `id`.
+        """
+        with self._lock:
+            self._clear(issue['id'])
+            self._insert(issue)
+
+    def update(self, issue_id, data):
+        """
+        Apply a partial update to an indexed issue; ignored if the issue is not indexed.
+
+        Args:
+            issue_id (str): The issue's document ID.
+            data (dict): The updated fields.
+        """
+        with self._lock:
+            slot = self._slot.get(issue_id)
+            if slot is None:
+                return
+            issue = {**self._issues[slot], **data}
+            self._clear(issue_id)
+            self._insert(issue)
+
+    def remove(self, issue_id):
+        """
+        Drop an issue from the index.
+
+        Args:
+            issue_id (str): The issue's document ID.
+        """
+        with self._lock:
+            self._clear(issue_id)
+
+    def _match(self, filters, skip=None):
+        """
+        Bitmap of the issues matching `filters`, ignoring the filter named `skip`. Values of
+        one filter are ORed (any of the subsystems), or ANDed for `subsystem` when
+        `filters['subsystem_mode'] == 'and'` (all of the subsystems); filters are ANDed.
+        """
+        bitmap = self._live
+        for field, name in FIELDS.items():
+            wanted = (filters or {}).get(name)
+            if name == skip or not wanted:
+                continue
+            if not isinstance(wanted, (list, tuple, set)):
+                wanted = [wanted]
+
+            bitmaps = [self._bitmaps[field].get(value, 0) for value in wanted]
+            if name == 'subsystem' and filters.get('subsystem_mode') == 'and':
+                for value_bitmap in bitmaps:
+                    bitmap &= value_bitmap
+            else:
+                any_bitmap = 0
+                for value_bitmap in bitmaps:
+                    any_bitmap |= value_bitmap
+                bitmap &= any_bitmap
+        return bitmap
+
+    def query(self, filters=None, order_by='issue_number', descending=True):
+        """
+        List the issues matching `filters`.
+
+        Args:
+            filters (dict, optional): Maps filter names (`subsystem`, `priority`, `status`,
+                `driver`) to a value or a list of values; see `_match`.
+            order_by (str): The field to sort by.
+            descending (bool): Whether to sort from the highest value.
+
+        Returns:
+            list: The matching issue dicts (shared with the index, so not to be modified), those
+                without `order_by` last; issues with the same value are ordered by ID.
+        """
+        with self._lock:
+            issues = [self._issues[slot] for slot in _slots(self._match(filters))]
+
+        issues.sort(key=lambda issue: issue['id'])
+        present = [issue for issue in issues if issue.get(order_by) is not None]
+        missing = [issue for issue in issues if issue.get(order_by) is None]
+        # A stable sort, so equal values stay in ID order
+        present.sort(key=lambda issue: issue[order_by], reverse=descending)
+        return present + missing
+
+    def count(self, filters=None):
+        """
+        Count the issues matching `filters`.
+
+        Returns:
+            int: The number of matching issues.
+        """
+        with self._lock:
+            return _popcount(self._match(filters))
+
+    def facets(self, filters=None):
+        """
+        Count, for every value of every filter, the issues that would match if that value
+        were selected, given the other filters.
+
+        Args:
+            filters (dict, optional): The current filters; see `query`.
+
+        Returns:
+            dict: Maps each filter name to a dict of value -> count.
+        """
+        with self._lock:
+            counts = {}
+            for field, name in FIELDS.items():
+                others = self._match(filters, skip=name)
+                counts[name] = {value: _popcount(bitmap & others)
+                                for value, bitmap in self._bitmaps[field].items()}
+            return counts
@@ -0,0 +1,140 @@
+"""
+mirror.py
+
+In-memory mirrors of small, read-heavy Firestore collections (`driver-profiles`, `issues`),
+kept current by `on_snapshot` listeners. Every snapshot carries the whole collection as of
+one read time, so the mirrored copy is always a consistent view of the collection rather
+than a mix of old and new documents.
+
+Listeners run on the Firestore client's background threads; readers get copies of the
+mirrored documents under a lock. A mirror is cold until its first snapshot arrives, and
+callers fall back to reading Firestore directly until then.
+
+A listener whose stream fails closes without telling its callback, so a mirror also goes
+cold when its listener is no longer active or has delivered nothing for `max_age` seconds,
+and the next `start` replaces the listener. Listeners only deliver snapshots when the
+collection changes, so a quiet collection is re-read once every `max_age`.
+"""
+import threading
+import time
+
+
+class CollectionMirror(object):
+    """Mirror of one Firestore collection, fed by an `on_snapshot` listener."""
+
+    def __init__(self, collection_ref, id_field='id', on_change=None, max_age=None):
+        """
+        Initialize a CollectionMirror. Nothing is read until `start` is called.
+
+        Args:
+            collection_ref: The (sync client) collection reference to listen to.
+            id_field (str): The key the document ID is stored under in each mirrored dict.
+            on_change (callable, optional): Called with the list of mirrored documents after
+                every snapshot, from the listener's thread.
+            max_age (float, optional): Seconds after its last snapshot (or its start, before the
+                first) that the listener is trusted; None trusts it for as long as it is active.
+        """
+        self.collection_ref = collection_ref
+        self.id_field = id_field
+        self.on_change = on_change
+        self.max_age = max_age
+        self.read_time = None
+        # time.monotonic() of the last snapshot
+        self.snapshot_at = None
+        self._started_at = None
+        # Bumped whenever the listener is replaced, so a replaced listener's snapshots are dropped
+        self._generation = 0
+        self._docs = {}
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._watch = None
+
+    @property
+    def ready(self):
+        """Whether the mirror holds a snapshot of the collection from a listener that is still live."""
+        return self._ready.is_set() and self._live()
+
+    def _live(self):
+        """Whether the listener is active and has been heard from within `max_age`."""
+        watch = self._watch
+        if watch is None or not watch.is_active:
+            return False
+        heard_at = self.snapshot_at if self.snapshot_at is not None else self._started_at
+        return self.max_age is None or time.monotonic() - heard_at <= self.max_age
+
+    def start(self):
+        """
+        Subscribe to the collection, if not subscribed already, replacing a listener that has
+        failed or gone quiet for `max_age`. Returns immediately; the mirror becomes ready when
+        the first snapshot arrives.
+        """
+        with self._lock:
+            if self._watch is not None and self._live():
+                return
+            watch, self._watch = self._watch, None
+            self._ready.clear()
+            self._generation += 1
+            generation = self._generation
+            self._started_at = time.monotonic()
+            self.snapshot_at = None
+            self._watch = self.collection_ref.on_snapshot(
+                lambda snapshots, changes, read_time: self._on_snapshot(generation, snapshots, changes, read_time))
+
+        if watch is not None:
+            print(f"Restarting the snapshot listener on {self.collection_ref.id}")
+            watch.unsubscribe()
+
+    def stop(self):
+        """
+        Unsubscribe from the collection; the mirror is cold again until restarted.
+        """
+        with self._lock:
+            watch, self._watch = self._watch, None
+            self._generation += 1
+            self._ready.clear()
+        if watch is not None:
+            watch.unsubscribe()
+
+    def _on_snapshot(self, generation, snapshots, changes, read_time):
+        docs = {}
+        for doc in snapshots:
+            doc_data = doc.to_dict()
+            doc_data[self.id_field] = doc.id
+            docs[doc.id] = doc_data
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._docs = docs
+            self.read_time = read_time
+            self.snapshot_at = time.monotonic()
+            self._ready.set()
+
+        if self.on_change is not None:
+            try:
+                self.on_change(list(docs.values()))
+            except Exception as e:
+                print(f"An error occurred while applying a snapshot of {self.collection_ref.id}: {e}")
+
+    def documents(self):
+        """
+        Returns:
+            list: Copies of every mirrored document, or None while the mirror is cold.
+        """
+        with self._lock:
+            if not self.ready:
+                return None
+            return [dict(doc) for doc in self._docs.values()]
+
+    def get(self, doc_id):
+        """
+        Args:
+            doc_id (str): The document ID.
+
+        Returns:
+            dict: A copy of the document, empty if it does not exist, or None while the mirror is cold.
+        """
+        with self._lock:
+            if not self.ready:
+                return None
+            return dict(self._docs.get(doc_id, {}))
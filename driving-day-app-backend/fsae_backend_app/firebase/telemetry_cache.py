@@ -0,0 +1,223 @@
+import base64
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+import numpy as np
+from django.conf import settings
+
+
+def _to_json(value):
+    """JSON form of the float32 arrays of column reads, as base64 of their bytes."""
+    if isinstance(value, np.ndarray):
+        return {'__float32__': base64.b64encode(value.astype('<f4', copy=False).tobytes()).decode('ascii')}
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _from_json(obj):
+    if '__float32__' in obj:
+        return np.frombuffer(base64.b64decode(obj['__float32__']), dtype='<f4')
+    return obj
+
+
+def _estimate_size(value):
+    """Rough size in bytes of a read, without serializing it: arrays count their bytes, and
+    lists are sized from their first item, as the rows of a read all have the same fields."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(len(key) + _estimate_size(item) for key, item in value.items())
+    if isinstance(value, tuple):
+        return sum(_estimate_size(item) for item in value)
+    if isinstance(value, list):
+        return len(value) * _estimate_size(value[0]) if value else 0
+    if isinstance(value, str):
+        return len(value)
+    return 8
+
+
+class TelemetryCache(object):
+    """Read-through cache of run telemetry pulled from Firestore.
+
+    A run's telemetry never changes once ingested, so the rows returned for a
+    (run, version, categories, cursor) key can be served again without touching Firestore.
+    The version is taken from the run document (see `version`) and changes when the run is
+    re-ingested, so entries of an older upload are never served, even by another process.
+
+    Entries live in memory, evicted least-recently-used first past `max_bytes` (as estimated
+    from their rows and arrays, see `_estimate_size`), and, when
+    `cache_dir` is set, in JSON files on disk (`<cache_dir>/<run>/<key>.json`, with the
+    float32 arrays of column reads stored as base64), evicted least-recently-used first
+    past `disk_max_bytes`.
+    """
+
+    def __init__(self, max_bytes, cache_dir=None, disk_max_bytes=0):
+        """
+        Initialize a TelemetryCache.
+
+        Args:
+            max_bytes (int): The maximum total size of the in-memory entries, in bytes.
+            cache_dir (str, optional): The directory of the disk store. No disk store if None.
+            disk_max_bytes (int): The maximum total size of the disk store, in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def version(metadata):
+        """
+        Identify one upload of a run from its run document.
+
+        Args:
+            metadata (dict): The run document.
+
+        Returns:
+            tuple: The LD file's SHA-256 and the bucket length it was stored with.
+        """
+        return metadata.get('ld-hash'), metadata.get('bucket-seconds')
+
+    @staticmethod
+    def key(run_title, version, categories_list, cursor):
+        """
+        Build the cache key of one read of a run.
+
+        Args:
+            run_title (str): The run's document ID in 'ecu-data'.
+            version (tuple): The run's upload version (see `version`).
+            categories_list (list): The selected channels, in any order.
+            cursor (tuple): Whatever selects the rows, e.g. a time range or page cursor.
+
+        Returns:
+            tuple: The key.
+        """
+        return run_title, version, tuple(sorted(categories_list)), cursor
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha256(repr(value).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, self._digest(key[0]), f'{self._digest(key)}.json')
+
+    def get(self, key):
+        """
+        Look up a read, marking it as recently used. The returned rows are shared, so
+        callers must not modify them.
+
+        Args:
+            key (tuple): The key of the read (see `key`).
+
+        Returns:
+            The cached rows, or None if the read is not cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+
+        if not self.cache_dir:
+            return None
+
+        path = self._entry_path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                value = json.load(f, object_hook=_from_json)
+            os.utime(path)  # Bump the entry in LRU order
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Could not read cached telemetry of {key[0]}: {e}")
+            return None
+
+        self._remember(key, value, _estimate_size(value))
+        return value
+
+    def put(self, key, value):
+        """
+        Store a read, then evict entries beyond the size limits.
+
+        Args:
+            key (tuple): The key of the read (see `key`).
+            value: The rows read, as JSON-serialisable lists and dicts, or the (ids, columns)
+                of a column read, with float32 arrays.
+        """
+        self._remember(key, value, _estimate_size(value))
+
+        if not self.cache_dir:
+            return
+
+        path = self._entry_path(key)
+        tmp_path = f'{path}.tmp-{os.getpid()}-{threading.get_ident()}'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, default=_to_json)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Could not cache telemetry of {key[0]}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self.evict_disk()
+
+    def _remember(self, key, value, size):
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def invalidate(self, run_title):
+        """
+        Drop every cached read of a run, e.g. when it is re-ingested.
+
+        Args:
+            run_title (str): The run's document ID in 'ecu-data'.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == run_title]:
+                self._bytes -= self._entries.pop(key)[1]
+
+        if self.cache_dir:
+            shutil.rmtree(os.path.join(self.cache_dir, self._digest(run_title)), ignore_errors=True)
+
+    def evict_disk(self):
+        """
+        Remove least-recently-used files until the disk store fits in `disk_max_bytes`.
+        """
+        entries = []
+        total = 0
+        for run_dir in os.scandir(self.cache_dir):
+            if not run_dir.is_dir():
+                continue
+            for entry in os.scandir(run_dir.path):
+                if '.tmp-' in entry.name:
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+run_data_cache = TelemetryCache(settings.RUN_DATA_CACHE_MAX_BYTES,
+                                settings.RUN_DATA_CACHE_DIR,
+                                settings.RUN_DATA_CACHE_DISK_MAX_BYTES)
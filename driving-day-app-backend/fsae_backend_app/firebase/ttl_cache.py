@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+
+
+class TTLCache(object):
+    """Time-to-live cache of small, rarely written Firestore reads, e.g. the run list.
+
+    Keys are tuples whose first element names the read (e.g. `('all-drivers', filters)`), so
+    that a write path can invalidate every cached variant of it at once. Entries also expire
+    `ttl` seconds after they are stored, which bounds how stale a read can be when the write
+    happened in another process.
+
+    Keys can carry user-supplied values (e.g. filters), so at most `max_entries` entries are
+    kept, evicted least-recently-used first, and hits and misses are counted per read name
+    rather than per key.
+    """
+
+    def __init__(self, ttl, max_entries=256):
+        """
+        Initialize a TTLCache.
+
+        Args:
+            ttl (float): Seconds an entry is served for after it is stored.
+            max_entries (int): The most entries kept at once.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a read, counting a hit or a miss for it. The returned value is shared, so
+        callers must not modify it.
+
+        Args:
+            key (tuple): The key of the read.
+
+        Returns:
+            The cached value, or None if it is not cached or has expired.
+        """
+        with self._lock:
+            counters = self._counters.setdefault(key[0], {"hits": 0, "misses": 0})
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                counters["hits"] += 1
+                return entry[1]
+
+            self._entries.pop(key, None)
+            counters["misses"] += 1
+            return None
+
+    def put(self, key, value):
+        """
+        Store a read for `ttl` seconds, dropping expired entries and, past `max_entries`, the
+        least recently used ones.
+
+        Args:
+            key (tuple): The key of the read.
+            value: The value read.
+        """
+        with self._lock:
+            now = time.monotonic()
+            for expired in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                del self._entries[expired]
+
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, name):
+        """
+        Drop every cached variant of a read, e.g. after a write to its collection.
+
+        Args:
+            name (str): The first element of the keys to drop.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == name]:
+                del self._entries[key]
+
+    def stats(self):
+        """
+        Report the hit and miss counts of every read.
+
+        Returns:
+            list: One dict per read name, with `name`, `hits`, `misses` and `cached`, the
+                number of its variants currently cached.
+        """
+        with self._lock:
+            now = time.monotonic()
+            cached = {}
+            for key, (expires, _) in self._entries.items():
+                if expires > now:
+                    cached[key[0]] = cached.get(key[0], 0) + 1
+            return [{"name": name, **counters, "cached": cached.get(name, 0)}
+                    for name, counters in self._counters.items()]
+
+
+list_cache = TTLCache(settings.LIST_CACHE_TTL_SECONDS, settings.LIST_CACHE_MAX_ENTRIES)
@@ -0,0 +1,187 @@
+"""
+uploads.py
+
+Writes parsed runs to Firestore: the chunked columnar layout of a run (see `chunks.py`) and
+the batched, retried commits it is written with.
+
+Nothing here touches Firebase at import time. The project's client (and with it the Firebase
+credentials) is only loaded when a write is made without an explicit client, so tools such as
+`ld_parser.benchmark` can exercise the upload path against a stand-in client.
+"""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .chunks import build_chunks
+from google.api_core import exceptions as google_exceptions
+
+# Firestore commits at most 500 writes and 10 MiB per batch; stay a little under the byte limit
+MAX_BATCH_WRITES = 500
+MAX_BATCH_BYTES = 9 * 1024 ** 2
+# Batches committed concurrently while uploading
+MAX_IN_FLIGHT_BATCHES = 4
+# Commit attempts per batch, backing off exponentially from RETRY_BASE_SECONDS between them
+MAX_COMMIT_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 0.5
+# Contention and transient errors worth retrying a batch on
+RETRYABLE_ERRORS = (
+    google_exceptions.Aborted,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+)
+
+
+def _default_client():
+    """The project's Firestore client, imported on first use so this module has no Firebase side effects."""
+    from .firestore import db
+    return db
+
+
+def _document_size(data):
+    """Rough size in bytes of a document, enough to keep batches under Firestore's request limit."""
+    return sum(len(key) + (len(value) if isinstance(value, (bytes, str)) else 8) for key, value in data.items())
+
+
+def _commit_with_retry(client, writes, max_attempts=MAX_COMMIT_ATTEMPTS):
+    """
+    Commits `writes` as one batch, retrying with jittered exponential backoff on contention.
+
+    Returns:
+        int: The number of documents written.
+    """
+    for attempt in range(max_attempts):
+        batch = client.batch()
+        for doc_ref, data in writes:
+            batch.set(doc_ref, data)
+        try:
+            batch.commit()
+            return len(writes)
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_attempts - 1:
+                raise
+            delay = RETRY_BASE_SECONDS * 2 ** attempt * (1 + random.random())
+            print(f"Batch commit failed ({e}), retrying in {delay:.1f}s.")
+            time.sleep(delay)
+
+
+def batched_set(writes, client=None, max_in_flight=MAX_IN_FLIGHT_BATCHES, max_attempts=MAX_COMMIT_ATTEMPTS):
+    """
+    Writes documents with as few batch commits as Firestore allows, keeping up to
+    `max_in_flight` batches committing at once. A batch that still fails after every attempt
+    is counted in the report's `failed`; the other batches are committed regardless.
+
+    Args:
+        writes (list): (document reference, data) pairs to set.
+        client (optional): The Firestore client to write with. Defaults to the project's client
+            (see `_default_client`).
+        max_in_flight (int): The number of batches committed concurrently.
+        max_attempts (int): Commit attempts per batch before giving up.
+
+    Returns:
+        dict: `documents` (written), `failed` (documents in batches that failed), `batches`,
+            `seconds` and `docs_per_s` of the upload.
+    """
+    client = client or _default_client()
+
+    batches, current, current_bytes = [], [], 0
+    for doc_ref, data in writes:
+        size = _document_size(data)
+        if current and (len(current) == MAX_BATCH_WRITES or current_bytes + size > MAX_BATCH_BYTES):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append((doc_ref, data))
+        current_bytes += size
+    if current:
+        batches.append(current)
+
+    def commit(batch):
+        try:
+            return _commit_with_retry(client, batch, max_attempts)
+        except Exception as e:
+            print(f"A batch of {len(batch)} documents could not be committed: {e}")
+            return 0
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, len(batches)))) as executor:
+        documents = sum(executor.map(commit, batches))
+    seconds = time.perf_counter() - start
+
+    return {
+        "documents": documents,
+        "failed": len(writes) - documents,
+        "batches": len(batches),
+        "seconds": seconds,
+        "docs_per_s": documents / seconds if seconds > 0 else float('inf'),
+    }
+
+
+def upload_dataframe_to_firestore(df, run_name, driver_id, metadata=None, client=None):
+    """
+    Uploads the channels of a run to Firestore in the chunked columnar layout (see `chunks.py`):
+    the columns are stored as float32 blocks under `ecu-data/<run_name>/chunks`, and the run
+    document gets a `manifest` listing them. Runs of any length are stored in full. The chunks
+    are written with `batched_set`.
+
+    Args:
+        df (DataFrame): One row per bucket, one column per channel and aggregate, as returned
+            by `ld_parser.decimation.decimate_frames`.
+        run_name (str): The run's name, `YYYY-MM-DD-<title>`.
+        driver_id (str): The ID of the driver of the run.
+        metadata (dict, optional): Extra fields stored on the run document, e.g. `ld-hash`
+            (the SHA-256 keying the parsed run in the ld_parser run cache) and `stats`
+            (per-channel statistics, see `ld_parser.stats`).
+        client (optional): The Firestore client to write to. Defaults to the project's client
+            (see `_default_client`).
+
+    Returns:
+        dict: The write report of `batched_set`, counting the run document too. If any chunk
+            failed (`failed` > 0), the run document is not written, so the partly written run
+            is never listed or read.
+        None: If an error occurs.
+
+    Example:
+        upload_dataframe_to_firestore(df, '2024-10-05-endurance', driver_id)
+    """
+    # Document referencing to correctly insert into Firebase hierarchy
+    # ecu-data/`run_name`/`chunks`/(column blocks)
+    main_collection = 'ecu-data'
+    subcollection = 'chunks'
+
+    main_document = run_name
+
+    client = client or _default_client()
+    main_doc_ref = client.collection(main_collection).document(main_document)
+    subcollection_ref = main_doc_ref.collection(subcollection)
+
+    try:
+        # When every channel stops giving values
+        rows = df
+        empty = rows.isna().all(axis=1).to_numpy()
+        if empty.any():
+            print(f"Stopping processing at row {int(empty.argmax())}.")
+            rows = rows.iloc[:int(empty.argmax())]
+
+        manifest, chunks = build_chunks(rows)
+        report = batched_set([(subcollection_ref.document(doc_id), chunk) for doc_id, chunk in chunks.items()], client)
+        if report["failed"]:
+            print(f"{report['failed']} of {len(chunks)} chunks of '{main_document}' could not be uploaded; "
+                  f"the run document was not written.")
+            return report
+
+        # The run document goes last, so its manifest never lists chunks that are not written yet
+        main_doc_ref.set({
+            "run-date": run_name[0:10],
+            "driver-id": driver_id,
+            **(metadata or {}),
+            "manifest": manifest,
+        })
+        report["documents"] += 1
+
+        print(f"All data has been successfully uploaded to Firestore under document '{main_document}' "
+              f"({report['documents']} documents in {report['batches']} batches, {report['docs_per_s']:.0f} documents/s).")
+        return report
+
+    except Exception as e:
+        print(f"An error occurred while uploading data to Firestore: {e}")
+        return None
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+
+def build_time_index(durations, rate):
+    """
+    Builds the common timebase for a run.
+
+    Args:
+        durations (list): The duration in seconds of every channel in the run.
+        rate (float): The sample rate of the timebase in Hz.
+
+    Returns:
+        np.array: Sample times in seconds, from 0 up to the end of the longest channel.
+    """
+    n_samples = int(np.ceil(max(durations, default=0) * rate))
+    return np.arange(n_samples) / rate
+
+
+def resample(values, freq, times, method='zoh'):
+    """
+    Resamples one channel onto a timebase.
+
+    Args:
+        values (np.array): The channel's samples, recorded at `freq` from time 0.
+        freq (float): The recording frequency of the channel in Hz.
+        times (np.array): The sample times in seconds to resample onto.
+        method (str): 'zoh' holds each sample until the next one (zero-order hold);
+            'linear' interpolates linearly between samples.
+
+    Raises:
+        ValueError: If the method is unknown.
+
+    Returns:
+        np.array: The channel's values at `times`, NaN past the end of the channel.
+    """
+    if method == 'zoh':
+        # Index of the latest sample at or before each time; the epsilon absorbs float error on exact sample times
+        idxs = np.floor(times * freq + 1e-9).astype(np.intp)
+        resampled = np.full(len(times), np.nan, dtype=values.dtype if values.dtype.kind == 'f' else np.float64)
+        in_range = idxs < len(values)
+        resampled[in_range] = values[idxs[in_range]]
+        return resampled
+
+    if method == 'linear':
+        sample_times = np.arange(len(values)) / freq
+        valid = np.isfinite(values)
+        if not valid.any():
+            return np.full(len(times), np.nan)
+        return np.interp(times, sample_times[valid], values[valid], right=np.nan)
+
+    raise ValueError(f'Unknown resampling method: {method}')
+
+
+def align_frames(df_dict, rate=None, method='zoh', channels=None):
+    """
+    Aligns channels recorded at different rates onto one common timebase.
+
+    Args:
+        df_dict (dict): Maps each recording frequency (Hz) to a DataFrame of the channels
+            recorded at that frequency, as returned by `ldData.to_dataframe`.
+        rate (float, optional): The sample rate of the aligned frame in Hz. Defaults to the
+            highest recording frequency, so no channel loses resolution.
+        method (str): How channels are resampled (see `resample`).
+        channels (list, optional): Names of the channels to align. Defaults to every channel.
+
+    Returns:
+        DataFrame: One column per channel, indexed by time in seconds (`time`).
+    """
+    sources = {}
+    for freq, df in df_dict.items():
+        if freq <= 0:
+            continue
+        for name in df.columns:
+            if channels is None or name in channels:
+                sources[name] = (freq, df[name].to_numpy())
+
+    if channels is not None:
+        sources = {name: sources[name] for name in channels if name in sources}
+
+    if rate is None:
+        rate = max((freq for freq, _ in sources.values()), default=1)
+
+    times = build_time_index([len(values) / freq for freq, values in sources.values()], rate)
+    aligned = {name: resample(values, freq, times, method) for name, (freq, values) in sources.items()}
+
+    return pd.DataFrame(aligned, index=pd.Index(times, name='time'), copy=False)
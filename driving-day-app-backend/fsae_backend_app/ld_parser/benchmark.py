@@ -0,0 +1,186 @@
+"""
+benchmark.py
+
+Times every stage of LD ingest (parse, to_dataframe, decimation, channel statistics and the
+Firestore upload) on a synthetic or real LD file, reporting wall time, throughput and peak
+memory per stage, so that parser regressions show up before they reach the car.
+
+Usage (from driving-day-app-backend/):
+    python -m fsae_backend_app.ld_parser.benchmark --channels 200 --duration 1200
+    python -m fsae_backend_app.ld_parser.benchmark --file path/to/log.ld --json
+
+The upload stage writes to an in-memory stand-in for Firestore, so it makes no network calls
+and needs no Firebase credentials.
+"""
+import argparse
+import io
+import json
+import os
+import time
+import tracemalloc
+import numpy as np
+from .data_containers import ldData
+from .decimation import decimate_frames
+from .file_utils import as_buffer
+from .stats import channel_stats
+from .synthetic import make_channels, write_ldfile
+from ..firebase.uploads import upload_dataframe_to_firestore
+
+DTYPES = {'int16': np.int16, 'int32': np.int32, 'float16': np.float16, 'float32': np.float32}
+
+
+class InMemoryFirestore(object):
+    """Stand-in for a Firestore client that keeps every written document in a dict."""
+
+    def __init__(self):
+        self.documents = {}
+
+    def collection(self, name):
+        return InMemoryFirestore._Collection(self, name)
+
+    def batch(self):
+        return InMemoryFirestore._Batch()
+
+    class _Batch(object):
+        def __init__(self):
+            self.writes = []
+
+        def set(self, doc_ref, data, merge=False):
+            self.writes.append((doc_ref, data, merge))
+
+        def commit(self):
+            for doc_ref, data, merge in self.writes:
+                doc_ref.set(data, merge=merge)
+
+    class _Collection(object):
+        def __init__(self, store, path):
+            self.store, self.path = store, path
+
+        def document(self, doc_id):
+            return InMemoryFirestore._Document(self.store, f'{self.path}/{doc_id}')
+
+    class _Document(object):
+        def __init__(self, store, path):
+            self.store, self.path = store, path
+
+        @property
+        def id(self):
+            return self.path.rsplit('/', 1)[-1]
+
+        def set(self, data, merge=False):
+            if merge:
+                data = {**self.store.documents.get(self.path, {}), **data}
+            self.store.documents[self.path] = dict(data)
+
+        def collection(self, name):
+            return InMemoryFirestore._Collection(self.store, f'{self.path}/{name}')
+
+
+def run_stage(name, func, results, n_bytes=None, n_samples=None):
+    """
+    Runs one benchmark stage, recording its wall time, peak traced memory and throughput.
+
+    Args:
+        name (str): The name of the stage.
+        func (callable): The stage, called without arguments.
+        results (list): The list the stage's result dict is appended to.
+        n_bytes (int, optional): Raw LD bytes processed, for MB/s.
+        n_samples (int, optional): Channel samples processed, for samples/s.
+
+    Returns:
+        The return value of `func`.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {'stage': name, 'seconds': seconds, 'peak_mb': peak / 1e6}
+    if n_bytes is not None:
+        result['mb_per_s'] = n_bytes / 1e6 / seconds
+    if n_samples is not None:
+        result['samples_per_s'] = n_samples / seconds
+    results.append(result)
+    return value
+
+
+def run_benchmark(source, workers=1, bucket_seconds=1, upload=True):
+    """
+    Benchmarks the ingest pipeline on one LD file.
+
+    Args:
+        source: The LD file as a path or bytes.
+        workers (int): The number of threads used to decode channels.
+        bucket_seconds (float): The decimation bucket length in seconds.
+        upload (bool): Whether to run the upload stage.
+
+    Returns:
+        list: One dict per stage with `stage`, `seconds`, `peak_mb` and, where meaningful,
+            `mb_per_s` and `samples_per_s`.
+    """
+    results = []
+    buffer = as_buffer(source)
+    n_bytes = len(buffer)
+
+    ld = run_stage('parse', lambda: ldData.fromfile(buffer), results, n_bytes=n_bytes)
+    n_samples = int(ld.channs.data_len[ld.channs.dtype_code != 0].sum())
+
+    df_dict = run_stage('to_dataframe', lambda: ld.to_dataframe(workers=workers), results,
+                        n_bytes=n_bytes, n_samples=n_samples)
+    decimated_df = run_stage('decimate', lambda: decimate_frames(df_dict, bucket_seconds), results,
+                             n_samples=n_samples)
+    run_stage('stats', lambda: channel_stats(df_dict), results, n_samples=n_samples)
+
+    if upload:
+        client = InMemoryFirestore()
+        report = run_stage('upload', lambda: upload_dataframe_to_firestore(
+            decimated_df, '2024-01-01-benchmark', 'benchmark', client=client), results,
+            n_samples=decimated_df.size)
+        results[-1]['documents'] = len(client.documents)
+        if report:
+            results[-1]['docs_per_s'] = report['docs_per_s']
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark LD parsing and ingest.')
+    parser.add_argument('--file', help='benchmark an existing LD file instead of a synthetic one')
+    parser.add_argument('--channels', type=int, default=200, help='number of synthetic channels')
+    parser.add_argument('--duration', type=float, default=1200, help='synthetic log length in seconds')
+    parser.add_argument('--freqs', default='10,50,100', help='comma-separated synthetic channel frequencies')
+    parser.add_argument('--dtypes', default='int16,int32,float16,float32', help='comma-separated synthetic data types')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='decode threads')
+    parser.add_argument('--bucket-seconds', type=float, default=1, help='decimation bucket length')
+    parser.add_argument('--no-upload', action='store_true', help='skip the upload stage')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    if args.file:
+        source = args.file
+    else:
+        channels = make_channels(args.channels,
+                                 freqs=tuple(int(f) for f in args.freqs.split(',')),
+                                 dtypes=tuple(DTYPES[d] for d in args.dtypes.split(',')))
+        out = io.BytesIO()
+        write_ldfile(out, channels, duration=args.duration)
+        source = out.getvalue()
+
+    results = run_benchmark(source, workers=args.workers, bucket_seconds=args.bucket_seconds,
+                            upload=not args.no_upload)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'stage':<14}{'seconds':>10}{'peak MB':>10}{'MB/s':>10}{'samples/s':>14}")
+    for r in results:
+        mb_per_s = f"{r['mb_per_s']:.1f}" if 'mb_per_s' in r else '-'
+        samples_per_s = f"{r['samples_per_s']:.3g}" if 'samples_per_s' in r else '-'
+        print(f"{r['stage']:<14}{r['seconds']:>10.3f}{r['peak_mb']:>10.1f}{mb_per_s:>10}{samples_per_s:>14}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import pandas as pd
+
+
+class RunCache(object):
+    """Content-addressed cache of parsed ld files.
+
+    Each entry is keyed by the SHA-256 of the raw ld bytes and holds the decoded
+    per-frequency DataFrames as Parquet files (`<cache_dir>/<key>/<freq>-hz.parquet`).
+    Entries are evicted least-recently-used first once the cache exceeds its size limit.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        """
+        Initialize a RunCache.
+
+        Args:
+            cache_dir (str): The directory holding the cache entries.
+            max_bytes (int): The maximum total size of all entries, in bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(data):
+        """
+        Compute the cache key of an ld file.
+
+        Args:
+            data: The raw ld file as bytes, a memoryview or an mmap.
+
+        Returns:
+            str: The hex SHA-256 digest of the file.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key):
+        """
+        Load the parsed frames of an ld file from the cache, marking the entry as recently used.
+
+        Args:
+            key (str): The cache key of the ld file (see `key`).
+
+        Returns:
+            dict: Maps each recorded frequency (Hz) to its DataFrame, as returned by
+                `ldData.to_dataframe`.
+            None: If the ld file is not cached or the entry cannot be read.
+        """
+        entry_dir = self._entry_dir(key)
+        if not os.path.isdir(entry_dir):
+            return None
+
+        try:
+            df_dict = {}
+            for filename in os.listdir(entry_dir):
+                if filename.endswith('-hz.parquet'):
+                    freq = int(filename[:-len('-hz.parquet')])
+                    df_dict[freq] = pd.read_parquet(os.path.join(entry_dir, filename))
+            os.utime(entry_dir)  # Bump the entry in LRU order
+            return df_dict
+        except Exception as e:
+            print(f"Could not read cached run {key}: {e}")
+            return None
+
+    def put(self, key, df_dict):
+        """
+        Store the parsed frames of an ld file, then evict entries beyond the size limit.
+
+        The entry is written to a temporary directory of its own and renamed into place, so
+        readers never see a partially written entry and concurrent ingests of the same file
+        (from other processes or threads) never share one.
+
+        Args:
+            key (str): The cache key of the ld file (see `key`).
+            df_dict (dict): Maps each recorded frequency (Hz) to its DataFrame.
+        """
+        entry_dir = self._entry_dir(key)
+        tmp_dir = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_dir = tempfile.mkdtemp(prefix=f'{key}.tmp-', dir=self.cache_dir)
+            for freq, df in df_dict.items():
+                df.to_parquet(os.path.join(tmp_dir, f'{freq}-hz.parquet'), index=False)
+
+            try:
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                if not os.path.isdir(entry_dir):
+                    raise
+                shutil.rmtree(tmp_dir)  # Already cached by a concurrent ingest
+        except Exception as e:
+            print(f"Could not cache run {key}: {e}")
+            if tmp_dir is not None:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """
+        Remove least-recently-used entries until the cache fits in `max_bytes`.
+        """
+        entries = []
+        total = 0
+        for key in os.listdir(self.cache_dir):
+            entry_dir = self._entry_dir(key)
+            if '.tmp-' in key or not os.path.isdir(entry_dir):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+            entries.append((os.stat(entry_dir).st_mtime, size, entry_dir))
+            total += size
+
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
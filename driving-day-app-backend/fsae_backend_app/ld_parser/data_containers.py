@@ -1,8 +1,10 @@
 import datetime
-import struct
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
-from .file_utils import decode_string, read_channels, read_ldfile
+from .alignment import align_frames
+from .file_utils import decode_string, is_buffer, read_ldfile, unpack_struct
 
 
 class ldData(object):
@@ -14,7 +16,7 @@ class ldData(object):
 
         Args:
             head: The header data for the ld file.
-            channs: A list of channel data for the ld file.
+            channs (ldChanTable): The channel table for the ld file.
         """
         self.head = head
         self.channs = channs
@@ -33,10 +35,10 @@ class ldData(object):
             Channel data corresponding to the provided index or name.
         """
         if not isinstance(item, int):
-            col = [n for n, x in enumerate(self.channs) if x.name == item]
-            if len(col) != 1:
-                raise Exception("Could get column", item, col)
-            item = col[0]
+            try:
+                item = self.channs.index(item)
+            except KeyError:
+                raise Exception("Could get column", item)
         return self.channs[item]
 
     def __iter__(self):
@@ -46,47 +48,201 @@ class ldData(object):
         Returns:
             Iterator: An iterator over the names of the channels.
         """
-        return iter([x.name for x in self.channs])
+        return iter(self.channs.names)
 
-    def to_dataframe(self):
+    def _map_channels(self, func, items, workers):
         """
-        Convert ldData to a pandas DataFrame.
+        Apply a channel-decoding function to every item, fanning out across a thread pool
+        when requested.
+
+        NumPy releases the GIL while reading and scaling channel data, so the channels
+        decode concurrently. File-object sources share one file position and are always
+        processed serially.
+
+        Args:
+            func (callable): The function to apply to each item.
+            items (list): The channels (or channel columns) to process.
+            workers (int): The number of threads to use; 1 processes serially.
 
         Returns:
-            DataFrame: A pandas DataFrame containing the channel data.
+            list: The results of `func`, in the order of `items`.
         """
-        data_dict = {}
-        lengths = {}
-        
-        for chann in self.channs:
-            try:
-                chann_data = chann.data
-                if chann_data is not None:
-                    data_dict[chann.name] = chann_data.tolist() if isinstance(chann_data, np.ndarray) else chann_data
-                    lengths[chann.name] = len(data_dict[chann.name])
-            except Exception as e:
-                print(f"Error parsing {chann.name}: {e}")
-        
-        # Group data by unique lengths
-        grouped_data = {}
-        for key, value in data_dict.items():
-            grouped_data.setdefault(len(value), {})[key] = value
-        
-        # Create DataFrames for each unique length
-        return {length: pd.DataFrame(group) for length, group in grouped_data.items()}
+        thread_safe = is_buffer(self.channs._f) or isinstance(self.channs._f, (str, os.PathLike))
+        if workers <= 1 or len(items) <= 1 or not thread_safe:
+            return [func(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
+
+    def decode(self, channels=None, dtype=np.float64, workers=1):
+        """
+        Decode channels in full.
+
+        Args:
+            channels (list, optional): Names of the channels to decode. Defaults to every
+                channel with a known data type.
+            dtype: The data type of the decoded samples.
+            workers (int): The number of threads to decode with; 1 decodes serially.
+                Parallel decoding returns the same arrays as serial decoding.
+
+        Raises:
+            Exception: If a requested channel is not found by the provided name.
+
+        Returns:
+            dict: Maps each channel name to its processed data points.
+        """
+        channs = list(self.select(channels).channs)
+        arrays = self._map_channels(lambda chann: chann.decode(dtype=dtype), channs, workers)
+        return {chann.name: array for chann, array in zip(channs, arrays)}
+
+    def to_dataframe(self, dtype=np.float64, workers=1):
+        """
+        Convert ldData to pandas DataFrames, one per recorded channel frequency.
+
+        Each channel is decoded straight into its column of a preallocated block, so
+        no intermediate Python lists or per-channel temporaries are created.
+
+        Args:
+            dtype: The data type of the DataFrame columns; np.float32 halves memory use.
+            workers (int): The number of threads to decode channels with; 1 decodes serially.
+
+        Returns:
+            dict: Maps each recorded frequency (Hz) to a DataFrame of the channels recorded
+                at that frequency. Channels shorter than the longest channel in their
+                frequency are padded with NaN.
+        """
+        grouped_channs = {}
+        # Channels with an unknown data type cannot be decoded, so skip them up front
+        for idx in np.flatnonzero(self.channs.dtype_code):
+            chann = self.channs[idx]
+            grouped_channs.setdefault(chann.freq, []).append(chann)
+
+        df_dict = {}
+        for freq, channs in grouped_channs.items():
+            # Column-major, so each channel's column is contiguous and pandas can adopt the block without copying
+            block = np.full((max(c.data_len for c in channs), len(channs)), np.nan, dtype=dtype, order='F')
+
+            def decode_column(col):
+                chann = channs[col]
+                try:
+                    chann.decode(out=block[:chann.data_len, col])
+                    return True
+                except Exception as e:
+                    print(f"Error parsing {chann.name}: {e}")
+                    return False
+
+            decoded = self._map_channels(decode_column, list(range(len(channs))), workers)
+            columns = [col for col, ok in enumerate(decoded) if ok]
+
+            if not columns:
+                continue
+            if len(columns) != len(channs):
+                block = block[:, columns]
+
+            df_dict[freq] = pd.DataFrame(block, columns=[channs[col].name for col in columns], copy=False)
+
+        return df_dict
+
+    def align(self, channels=None, rate=None, method='zoh', dtype=np.float64, workers=1):
+        """
+        Decode channels recorded at different rates and resample them onto one timebase.
+
+        Args:
+            channels (list, optional): Names of the channels to align. Defaults to every
+                channel with a known data type.
+            rate (float, optional): The sample rate of the result in Hz. Defaults to the
+                highest recording frequency among the channels.
+            method (str): 'zoh' (zero-order hold) or 'linear' interpolation.
+            dtype: The data type of the decoded samples.
+            workers (int): The number of threads to decode channels with.
+
+        Returns:
+            DataFrame: One column per channel, indexed by time in seconds.
+        """
+        return align_frames(self.select(channels).to_dataframe(dtype=dtype, workers=workers),
+                            rate=rate, method=method)
+
+    def iter_windows(self, seconds=10, channels=None, dtype=np.float64):
+        """
+        Decode the channel data in aligned time windows, so that memory use is bounded by
+        the window size rather than by the length of the log.
+
+        Every channel is decoded into one preallocated buffer that is reused for every
+        window; copy any arrays that must outlive the next iteration.
+
+        Args:
+            seconds (float): The length of each window in seconds.
+            channels (list, optional): Names of the channels to decode. Defaults to every
+                channel with a known data type and a recorded frequency.
+            dtype: The data type of the decoded samples.
+
+        Yields:
+            tuple: The window's start time in seconds, and a dict mapping each channel name
+                to its samples in [start, start + seconds). The last window may hold fewer
+                samples.
+        """
+        channs = [c for c in self.select(channels).channs if c.freq > 0]
+        if not channs:
+            return
+
+        buffers = [np.empty(int(np.ceil(seconds * c.freq)), dtype=dtype) for c in channs]
+        n_windows = int(np.ceil(max(c.data_len / c.freq for c in channs) / seconds))
+
+        for window in range(n_windows):
+            window_data = {}
+            for chann, buffer in zip(channs, buffers):
+                # Window bounds are rounded from absolute times, so windows never drift apart
+                start = min(int(round(window * seconds * chann.freq)), chann.data_len)
+                stop = min(int(round((window + 1) * seconds * chann.freq)), chann.data_len)
+                window_data[chann.name] = chann.decode(out=buffer[:stop - start], start=start, count=stop - start)
+            yield window * seconds, window_data
+
+    def select(self, channels=None):
+        """
+        Restrict ldData to a subset of its channels, without decoding any channel data.
+
+        Channels with an unknown data type are dropped, so that only the requested
+        channels' data blocks are ever read or decoded.
+
+        Args:
+            channels (list, optional): Names of the channels to keep. Defaults to every channel.
+
+        Raises:
+            Exception: If a requested channel is not found by the provided name.
+
+        Returns:
+            ldData: An ldData object sharing this object's header and source, holding the
+                requested channels in the requested order.
+        """
+        if channels is None:
+            idxs = np.arange(len(self.channs))
+        else:
+            idxs = np.array([self.channs.index(name) if name in self.channs else -1 for name in channels], dtype=np.intp)
+            if (idxs < 0).any():
+                raise Exception("Could get column", [n for n, i in zip(channels, idxs) if i < 0])
+
+        return ldData(self.head, self.channs.take(idxs[self.channs.dtype_code[idxs] != 0]))
 
     @classmethod
-    def fromfile(cls, f):
+    def fromfile(cls, f, use_mmap=False, channels=None):
         """
         Create an ldData object from a file.
 
         Args:
-            f: A file object representing the ld file.
+            f: The path of the ld file, its contents as bytes or a memoryview, or any
+                seekable file object (e.g. an uploaded file). Sources other than paths are
+                parsed from a single in-memory buffer without touching disk.
+            use_mmap (bool): If True, a path is memory-mapped once and every channel's
+                data is a zero-copy view into that mapping, instead of each channel
+                re-opening the file for its metadata and data.
+            channels (list, optional): Names of the channels to load (see `select`). The header
+                and channel directory are always read; only these channels' data is decoded.
 
         Returns:
             ldData: An ldData object initialized with data from the file.
         """
-        return cls(*read_ldfile(f))
+        l = cls(*read_ldfile(f, use_mmap=use_mmap))
+        return l if channels is None else l.select(channels)
 
 
 class ldEvent(object):
@@ -109,24 +265,23 @@ class ldEvent(object):
             name, session, comment, venue_ptr, venue
 
     @classmethod
-    def fromfile(cls, f):
+    def fromfile(cls, f, offset=None):
         """
         Parse and create an ldEvent object from a file.
 
         Args:
-            f: A file object representing the ld file.
+            f: A file object representing the ld file, or a buffer holding it.
+            offset (int, optional): Pointer to the event. Defaults to the file's current position.
 
         Returns:
             ldEvent: An ldEvent object with the parsed event data.
         """
-        name, session, comment, venue_ptr = struct.unpack(
-            ldEvent.fmt, f.read(struct.calcsize(ldEvent.fmt)))
+        name, session, comment, venue_ptr = unpack_struct(f, ldEvent.fmt, offset)
         name, session, comment = map(decode_string, [name, session, comment])
 
         venue = None
         if venue_ptr > 0:
-            f.seek(venue_ptr)
-            venue = ldVenue.fromfile(f)
+            venue = ldVenue.fromfile(f, venue_ptr)
 
         return cls(name, session, comment, venue_ptr, venue)
 
@@ -148,26 +303,59 @@ class ldVenue(object):
         self.name, self.vehicle_ptr, self.vehicle = name, vehicle_ptr, vehicle
 
     @classmethod
-    def fromfile(cls, f):
+    def fromfile(cls, f, offset=None):
         """
         Parse and create an ldVenue object from a file.
 
         Args:
-            f: A file object representing the ld file.
+            f: A file object representing the ld file, or a buffer holding it.
+            offset (int, optional): Pointer to the venue. Defaults to the file's current position.
 
         Returns:
             ldVenue: An ldVenue object with the parsed venue data.
         """
-        name, vehicle_ptr = struct.unpack(
-            ldVenue.fmt, f.read(struct.calcsize(ldVenue.fmt)))
+        name, vehicle_ptr = unpack_struct(f, ldVenue.fmt, offset)
 
         vehicle = None
         if vehicle_ptr > 0:
-            f.seek(vehicle_ptr)
-            vehicle = ldVehicle.fromfile(f)
+            vehicle = ldVehicle.fromfile(f, vehicle_ptr)
         return cls(decode_string(name), vehicle_ptr, vehicle)
 
 
+class ldVehicle(object):
+    """Class to represent a vehicle within an ld file."""
+
+    fmt = '<64s128xI32s32s'
+
+    def __init__(self, id, weight, type, comment):
+        """
+        Initialize ldVehicle object.
+
+        Args:
+            id (str): The vehicle ID.
+            weight (int): The vehicle weight.
+            type (str): The vehicle type.
+            comment (str): Comment associated with the vehicle.
+        """
+        self.id, self.weight, self.type, self.comment = id, weight, type, comment
+
+    @classmethod
+    def fromfile(cls, f, offset=None):
+        """
+        Parse and create an ldVehicle object from a file.
+
+        Args:
+            f: A file object representing the ld file, or a buffer holding it.
+            offset (int, optional): Pointer to the vehicle. Defaults to the file's current position.
+
+        Returns:
+            ldVehicle: An ldVehicle object with the parsed vehicle data.
+        """
+        id, weight, type, comment = unpack_struct(f, ldVehicle.fmt, offset)
+        id, type, comment = map(decode_string, [id, type, comment])
+        return cls(id, weight, type, comment)
+
+
 class ldHead(object):
     """Class to represent the header of an ld file."""
     
@@ -220,12 +408,14 @@ class ldHead(object):
             driver, vehicleid, venue, datetime, short_comment
 
     @classmethod
-    def fromfile(cls, f):
+    def fromfile(cls, f, offset=None):
         """
         Parse and create an ldHead object from a file.
 
         Args:
-            f: A file object representing the ld file.
+            f: A file object representing the ld file, or a buffer (bytes, memoryview, mmap) holding it.
+            offset (int, optional): Pointer to the header. Defaults to the start of a buffer,
+                or to the file's current position.
 
         Returns:
             ldHead: An ldHead object with the parsed header data.
@@ -235,7 +425,7 @@ class ldHead(object):
             _, _, _, _, n,
             date, time,
             driver, vehicleid, venue,
-            _, short_comment) = struct.unpack(ldHead.fmt, f.read(struct.calcsize(ldHead.fmt)))
+            _, short_comment) = unpack_struct(f, ldHead.fmt, offset)
         date, time, driver, vehicleid, venue, short_comment = \
             map(decode_string, [date, time, driver,
                 vehicleid, venue, short_comment])
@@ -250,18 +440,27 @@ class ldHead(object):
 
         event = None
         if event_ptr > 0:
-            f.seek(event_ptr)
-            event = ldEvent.fromfile(f)
+            event = ldEvent.fromfile(f, event_ptr)
         return cls(meta_ptr, data_ptr, event_ptr, event, driver, vehicleid, venue, _datetime, short_comment)
 
+def _column(name):
+    """Property reading a channel's metadata field from its row of the owning `ldChanTable`."""
+    return property(lambda self: int(getattr(self._table, name)[self._idx]))
+
+
 class ldChan(object):
     """Class to represent a channel within an ld file, storing meta and data information.
 
     This class handles the parsing and retrieval of channel-specific metadata
     and actual data values from a binary ld file. Channel data is accessed on-demand
     via the data property.
+
+    Instances are lightweight views onto one row of an `ldChanTable`, which holds the
+    metadata of every channel in the file as columns.
     """
 
+    __slots__ = ('_table', '_idx', '_data')
+
     fmt = '<' + (
         "IIII"    # prev_addr, next_addr, data_ptr, n_data
         "H"       # some counter?
@@ -273,77 +472,105 @@ class ldChan(object):
         "40x"     # reserved bytes (40 for ACC, 32 for acti)
     )
 
-    def __init__(self, _f, meta_ptr, prev_meta_ptr, next_meta_ptr, data_ptr, data_len,
-                 dtype, freq, shift, mul, scale, dec, name, short_name, unit):
+    meta_ptr = _column('meta_ptr')
+    prev_meta_ptr = _column('prev_meta_ptr')
+    next_meta_ptr = _column('next_meta_ptr')
+    data_ptr = _column('data_ptr')
+    data_len = _column('data_len')
+    freq = _column('freq')
+    shift = _column('shift')
+    mul = _column('mul')
+    scale = _column('scale')
+    dec = _column('dec')
+
+    def __init__(self, table, idx):
         """
-        Initialize an ldChan object with the given metadata.
+        Initialize an ldChan view onto a row of a channel table.
 
         Args:
-            _f (str): The filename of the ld file to read from.
-            meta_ptr (int): Pointer to the channel's metadata within the ld file.
-            prev_meta_ptr (int): Pointer to the previous channel's metadata (if any).
-            next_meta_ptr (int): Pointer to the next channel's metadata (if any).
-            data_ptr (int): Pointer to the actual channel data within the ld file.
-            data_len (int): Number of data points in the channel.
-            dtype (type): The data type of the channel values (e.g., np.float32).
-            freq (int): The recording frequency of the channel.
-            shift (float): Shift value applied to the data.
-            mul (float): Multiplication factor applied to the data.
-            scale (float): Scaling factor applied to the data.
-            dec (int): Number of decimal places in the data.
-            name (str): The full name of the channel.
-            short_name (str): A short version of the channel's name.
-            unit (str): The unit of measurement for the channel data.
+            table (ldChanTable): The table holding the channel's metadata.
+            idx (int): The channel's row in the table.
         """
-        self._f = _f
-        self.meta_ptr = meta_ptr
+        self._table = table
+        self._idx = idx
         self._data = None
 
-        (self.prev_meta_ptr, self.next_meta_ptr, self.data_ptr, self.data_len,
-         self.dtype, self.freq, self.shift, self.mul, self.scale, self.dec,
-         self.name, self.short_name, self.unit) = (
-            prev_meta_ptr, next_meta_ptr, data_ptr, data_len,
-            dtype, freq, shift, mul, scale, dec,
-            name, short_name, unit
-        )
-
     @classmethod
     def fromfile(cls, _f, meta_ptr):
         """
         Parse and create an ldChan object from the ld file.
 
         Args:
-            _f (str): The filename of the ld file to read from.
+            _f: The filename of the ld file to read from, a buffer (bytes, memoryview, mmap)
+                holding it, or a seekable file object.
             meta_ptr (int): Pointer to the channel's metadata in the ld file.
 
         Returns:
             ldChan: An initialized ldChan object with the parsed metadata.
         """
-        with open(_f, 'rb') as f:
-            f.seek(meta_ptr)
-            (prev_meta_ptr, next_meta_ptr, data_ptr, data_len, _,
-             dtype_a, dtype, freq, shift, mul, scale, dec,
-             name, short_name, unit) = struct.unpack(
-                ldChan.fmt, f.read(struct.calcsize(ldChan.fmt))
-            )
+        return ldChanTable.fromfile(_f, meta_ptr, count=1)[0]
 
-        name, short_name, unit = map(decode_string, [name, short_name, unit])
+    @property
+    def _f(self):
+        return self._table._f
 
-        def safe_get(lst, idx):
-            """Safely get an element from a list, or return None if out of bounds."""
-            if idx < 0 or idx >= len(lst):
-                return None
-            return lst[idx]
+    @property
+    def dtype(self):
+        """The data type of the channel values (e.g., np.float32), or None if unknown."""
+        return ldChanTable.DTYPES[self._table.dtype_code[self._idx]]
 
-        if dtype_a in [0x07]:
-            dtype = safe_get([None, np.float16, None, np.float32], dtype - 1)
-        elif dtype_a in [0, 0x03, 0x05]:
-            dtype = safe_get([None, np.int16, None, np.int32], dtype - 1)
-        else:
-            dtype = None
+    @property
+    def name(self):
+        return self._table.names[self._idx]
+
+    @property
+    def short_name(self):
+        return self._table.short_names[self._idx]
+
+    @property
+    def unit(self):
+        return self._table.units[self._idx]
+
+    @property
+    def raw(self):
+        """
+        Retrieve the channel's undecoded samples as stored in the ld file.
+
+        When the file is memory-mapped or held in memory this is a zero-copy, read-only
+        view into that buffer at `data_ptr`; otherwise the samples are read from the file.
+
+        Returns:
+            np.array: The raw data points of the channel, in the channel's data type.
+        """
+        return self.read_raw()
+
+    def read_raw(self, start=0, count=None):
+        """
+        Read a range of the channel's undecoded samples (see `raw`).
+
+        Args:
+            start (int): Index of the first sample to read.
+            count (int, optional): Number of samples to read. Defaults to the rest of the channel.
 
-        return cls(_f, meta_ptr, prev_meta_ptr, next_meta_ptr, data_ptr, data_len,
-                   dtype, freq, shift, mul, scale, dec, name, short_name, unit)
+        Returns:
+            np.array: The raw data points in the range, in the channel's data type.
+        """
+        if count is None:
+            count = self.data_len - start
+        offset = self.data_ptr + start * np.dtype(self.dtype).itemsize
+
+        if is_buffer(self._f):
+            return np.frombuffer(self._f, dtype=self.dtype,
+                                 count=count, offset=offset)
+
+        if not isinstance(self._f, (str, os.PathLike)):
+            self._f.seek(offset)
+            size = count * np.dtype(self.dtype).itemsize
+            return np.frombuffer(self._f.read(size), dtype=self.dtype)
+
+        with open(self._f, 'rb') as f:
+            f.seek(offset)
+            return np.fromfile(f, count=count, dtype=self.dtype)
 
     @property
     def data(self):
@@ -364,24 +591,208 @@ class ldChan(object):
             raise ValueError(f'Channel {self.name} has unknown data type')
 
         if self._data is None:
-            # Jump to the data section and read the channel's data
-            with open(self._f, 'rb') as f:
-                f.seek(self.data_ptr)
-                try:
-                    self._data = np.fromfile(
-                        f, count=self.data_len, dtype=self.dtype
-                    )
+            try:
+                self._data = self.decode()
+            except ValueError as v:
+                print(v, self.name, self.freq,
+                      hex(self.data_ptr), hex(self.data_len))
+
+        return self._data
+
+    def decode(self, out=None, dtype=np.float64, start=0, count=None):
+        """
+        Read the channel's samples and apply scaling, shifting, and multiplication.
+
+        The factors are applied in place, so apart from `out` no full-size temporaries
+        are created.
+
+        Args:
+            out (np.array, optional): A preallocated array of `count` elements to decode into.
+            dtype: The data type of the decoded samples when `out` is not given.
+            start (int): Index of the first sample to decode.
+            count (int, optional): Number of samples to decode. Defaults to the rest of the channel.
+
+        Raises:
+            ValueError: If the channel's data type is unknown or if not all data points
+                        are successfully read.
+
+        Returns:
+            np.array: The processed data points of the channel (`out`, when given).
+        """
+        if self.dtype is None:
+            raise ValueError(f'Channel {self.name} has unknown data type')
+
+        if count is None:
+            count = self.data_len - start
+
+        # Jump to the data section and read the channel's data
+        raw = self.read_raw(start, count)
+        if len(raw) != count:
+            raise ValueError("Not all data read!")
+
+        if out is None:
+            out = np.empty(count, dtype=dtype)
+
+        np.divide(raw, self.scale, out=out)
+        out *= pow(10., -self.dec)
+        out += self.shift
+        out *= self.mul
+        return out
+
+
+class ldChanTable(object):
+    """Class to represent the channel metadata chain of an ld file as a columnar table.
+
+    Pointers, lengths, frequency, shift/mul/scale/dec and data type codes are each held
+    in one numpy column, names are resolved through a hash map, and indexing the table
+    returns `ldChan` views onto its rows.
+    """
+
+    # Data types indexed by `dtype_code`; code 0 marks a channel with an unknown data type
+    DTYPES = (None, np.float16, np.float32, np.int16, np.int32)
+
+    def __init__(self, _f, rows):
+        """
+        Initialize an ldChanTable from parsed channel metadata.
+
+        Args:
+            _f: The ld source the channels' data is read from (see `ldChan.raw`).
+            rows (list): One tuple per channel, in file order, of
+                (meta_ptr, prev_meta_ptr, next_meta_ptr, data_ptr, data_len, dtype_code,
+                freq, shift, mul, scale, dec, name, short_name, unit).
+        """
+        self._f = _f
+        columns = list(zip(*rows)) if rows else [()] * 14
+
+        self.meta_ptr, self.prev_meta_ptr, self.next_meta_ptr, self.data_ptr, self.data_len = \
+            (np.array(c, dtype=np.uint32) for c in columns[0:5])
+        self.dtype_code = np.array(columns[5], dtype=np.uint8)
+        self.freq = np.array(columns[6], dtype=np.uint16)
+        self.shift, self.mul, self.scale, self.dec = \
+            (np.array(c, dtype=np.int16) for c in columns[7:11])
+        self.names, self.short_names, self.units = (list(c) for c in columns[11:14])
+
+        self._index = {}
+        self._duplicates = set()
+        for idx, name in enumerate(self.names):
+            if name in self._index:
+                self._duplicates.add(name)
+            self._index.setdefault(name, idx)
 
-                    # Apply scaling, shifting, and multiplication
-                    self._data = (self._data / self.scale *
-                                  pow(10., -self.dec) + self.shift) * self.mul
+        self._views = [None] * len(self.names)
 
-                    if len(self._data) != self.data_len:
-                        raise ValueError("Not all data read!")
+    def __len__(self):
+        return len(self.names)
 
-                except ValueError as v:
-                    print(v, self.name, self.freq,
-                          hex(self.data_ptr), hex(self.data_len),
-                          hex(len(self._data)), hex(f.tell()))
+    def __getitem__(self, idx):
+        """
+        Retrieve the `ldChan` view onto a row of the table.
+
+        Args:
+            idx (int): The row of the channel (negative values count from the end).
+
+        Raises:
+            IndexError: If the row is out of range.
+
+        Returns:
+            ldChan: The view onto the row, created once and reused afterwards.
+        """
+        idx = range(len(self.names))[idx]
+        if self._views[idx] is None:
+            self._views[idx] = ldChan(self, idx)
+        return self._views[idx]
+
+    def __iter__(self):
+        return (self[idx] for idx in range(len(self.names)))
+
+    def __contains__(self, name):
+        return name in self._index and name not in self._duplicates
+
+    def index(self, name):
+        """
+        Look up the row of a channel by name in constant time.
+
+        Args:
+            name (str): The full name of the channel.
+
+        Raises:
+            KeyError: If no channel, or more than one channel, has that name.
+
+        Returns:
+            int: The row of the channel in the table.
+        """
+        if name in self._duplicates:
+            raise KeyError(name)
+        return self._index[name]
+
+    def take(self, idxs):
+        """
+        Build a table from a subset of this table's rows.
+
+        Args:
+            idxs (list): The rows to keep, in the order they should appear.
+
+        Returns:
+            ldChanTable: A new table reading from the same source.
+        """
+        rows = zip(self.meta_ptr[idxs], self.prev_meta_ptr[idxs], self.next_meta_ptr[idxs],
+                   self.data_ptr[idxs], self.data_len[idxs], self.dtype_code[idxs],
+                   self.freq[idxs], self.shift[idxs], self.mul[idxs], self.scale[idxs], self.dec[idxs],
+                   [self.names[idx] for idx in idxs], [self.short_names[idx] for idx in idxs],
+                   [self.units[idx] for idx in idxs])
+        return ldChanTable(self._f, list(rows))
+
+    @staticmethod
+    def _encode_dtype(dtype_a, dtype):
+        """
+        Map the two data type fields of a channel's metadata to an index into `DTYPES`.
+
+        Args:
+            dtype_a (int): The data type family (0x07 for floats; 0, 0x03 or 0x05 for integers).
+            dtype (int): The size of one sample in bytes.
+
+        Returns:
+            int: The data type code, or 0 if the data type is unknown.
+        """
+        if dtype_a in [0x07]:
+            return {2: 1, 4: 2}.get(dtype, 0)
+        elif dtype_a in [0, 0x03, 0x05]:
+            return {2: 3, 4: 4}.get(dtype, 0)
+        return 0
+
+    @classmethod
+    def fromfile(cls, _f, meta_ptr, count=None):
+        """
+        Parse the channel metadata chain of an ld file into an ldChanTable.
+
+        Args:
+            _f: The filename of the ld file to read from, a buffer (bytes, memoryview, mmap)
+                holding it, or a seekable file object.
+            meta_ptr (int): Pointer to the first channel's metadata in the ld file.
+            count (int, optional): Stop after this many channels. Defaults to the whole chain.
+
+        Returns:
+            ldChanTable: A table with one row per channel, in file order.
+        """
+        rows = []
+
+        def read_chain(f):
+            ptr = meta_ptr
+            while ptr and (count is None or len(rows) < count):
+                (prev_meta_ptr, next_meta_ptr, data_ptr, data_len, _,
+                 dtype_a, dtype, freq, shift, mul, scale, dec,
+                 name, short_name, unit) = unpack_struct(f, ldChan.fmt, ptr)
+                name, short_name, unit = map(decode_string, [name, short_name, unit])
+
+                rows.append((ptr, prev_meta_ptr, next_meta_ptr, data_ptr, data_len,
+                             cls._encode_dtype(dtype_a, dtype), freq, shift, mul, scale, dec,
+                             name, short_name, unit))
+                ptr = next_meta_ptr  # Move to the next channel's metadata
+
+        if isinstance(_f, (str, os.PathLike)):
+            with open(_f, 'rb') as f:
+                read_chain(f)
+        else:
+            read_chain(_f)
 
-        return self._data
\ No newline at end of file
+        return cls(_f, rows)
@@ -0,0 +1,154 @@
+import warnings
+import numpy as np
+import pandas as pd
+from .alignment import align_frames
+
+# Per-bucket reductions kept for every channel
+AGGREGATES = ('mean', 'min', 'max', 'last')
+# Channels reduced together, and the most values (samples x channels) reduced in one block
+COLUMN_SLICE = 32
+MAX_BLOCK_VALUES = 1 << 20
+
+
+def aggregate_field(channel, aggregate):
+    """
+    Names the column (and Firestore field) holding one aggregate of a channel.
+
+    The mean keeps the plain channel name, so the stored series reads like one sample
+    per bucket; the other aggregates are suffixed, e.g. `Coolant Temperature (max)`.
+
+    Args:
+        channel (str): The name of the channel.
+        aggregate (str): One of `AGGREGATES`.
+
+    Returns:
+        str: The column name.
+    """
+    return channel if aggregate == 'mean' else f'{channel} ({aggregate})'
+
+
+def aggregate_channel(field):
+    """
+    The channel a column named by `aggregate_field` belongs to, e.g. `RPM` for `RPM (max)`.
+
+    Args:
+        field (str): The column name.
+
+    Returns:
+        str: The name of the channel.
+    """
+    for aggregate in AGGREGATES:
+        suffix = f' ({aggregate})'
+        if aggregate != 'mean' and field.endswith(suffix):
+            return field[:-len(suffix)]
+    return field
+
+
+def _reduce(blocks):
+    """
+    Reduces the middle axis of `blocks` (buckets x samples x channels) to every aggregate,
+    ignoring NaN samples.
+
+    Returns:
+        dict: Maps each aggregate to an array of buckets x channels.
+    """
+    with warnings.catch_warnings():
+        # Buckets where a channel has no samples reduce to NaN, which is what we want
+        warnings.simplefilter('ignore', RuntimeWarning)
+        reduced = {
+            'mean': np.nanmean(blocks, axis=1),
+            'min': np.nanmin(blocks, axis=1),
+            'max': np.nanmax(blocks, axis=1),
+        }
+
+    # Last non-NaN sample of every bucket
+    valid = ~np.isnan(blocks)
+    last_idx = blocks.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+    last = np.take_along_axis(blocks, last_idx[:, None], axis=1)[:, 0].astype(reduced['mean'].dtype)
+    last[~valid.any(axis=1)] = np.nan
+    reduced['last'] = last
+
+    return reduced
+
+
+def decimate(df, rate, bucket_seconds=1, aggregates=AGGREGATES):
+    """
+    Reduces every bucket of a frame to per-channel aggregates, so that a short spike inside
+    a bucket still reaches storage as that bucket's min or max.
+
+    The frame is reduced in blocks of at most COLUMN_SLICE channels and MAX_BLOCK_VALUES
+    samples, each reshaped in place to buckets x samples x channels, so peak memory does not
+    grow with the length of the run.
+
+    Args:
+        df (DataFrame): Channels sampled at one rate from time 0, one column per channel.
+        rate (float): The sample rate of `df` in Hz.
+        bucket_seconds (float): The length of each bucket in seconds.
+        aggregates (tuple): The aggregates to keep, out of `AGGREGATES`.
+
+    Returns:
+        DataFrame: One row per bucket, indexed by the bucket's start time in seconds (`time`),
+            with one column per channel and aggregate (see `aggregate_field`).
+    """
+    bucket = max(int(round(rate * bucket_seconds)), 1)
+    n_samples, n_channels = df.shape
+    n_buckets = -(-n_samples // bucket)
+    dtype = np.result_type(np.float32, *df.dtypes)
+
+    # Channels x buckets, so that every channel's aggregate is one contiguous row
+    reduced = {aggregate: np.empty((n_channels, n_buckets), dtype=dtype) for aggregate in AGGREGATES}
+    buckets_per_block = max(MAX_BLOCK_VALUES // (bucket * COLUMN_SLICE), 1)
+
+    for lo in range(0, n_channels, COLUMN_SLICE):
+        hi = min(lo + COLUMN_SLICE, n_channels)
+        for first in range(0, n_buckets, buckets_per_block):
+            last = min(first + buckets_per_block, n_buckets)
+            # A view of the frame's own block for the usual single-dtype frame
+            values = df.iloc[first * bucket:last * bucket, lo:hi].to_numpy()
+            n_full = len(values) // bucket
+
+            block = _reduce(values[:n_full * bucket].reshape(n_full, bucket, hi - lo))
+            if len(values) > n_full * bucket:
+                tail = _reduce(values[None, n_full * bucket:])
+                block = {k: np.concatenate([block[k], tail[k]]) for k in block}
+
+            for aggregate in AGGREGATES:
+                reduced[aggregate][lo:hi, first:last] = block[aggregate].T
+
+    columns = {}
+    for idx, channel in enumerate(df.columns):
+        for aggregate in aggregates:
+            columns[aggregate_field(channel, aggregate)] = reduced[aggregate][idx]
+
+    return pd.DataFrame(columns, index=pd.Index(np.arange(n_buckets) * bucket_seconds, name='time'))
+
+
+def decimate_frames(df_dict, bucket_seconds=1, aggregates=AGGREGATES):
+    """
+    Decimates every frequency group of a run at its own recording rate and joins the groups
+    on the bucket index, so slow channels are never upsampled to the rate of the fastest one.
+
+    Args:
+        df_dict (dict): Maps each recording frequency (Hz) to a DataFrame of the channels
+            recorded at that frequency, as returned by `ldData.to_dataframe`.
+        bucket_seconds (float): The length of each bucket in seconds.
+        aggregates (tuple): The aggregates to keep, out of `AGGREGATES`.
+
+    Returns:
+        DataFrame: One row per bucket of the longest group, as returned by `decimate`, NaN
+            in the buckets past the end of shorter groups.
+    """
+    frames = []
+    for freq, df in df_dict.items():
+        if freq <= 0 or df.empty:
+            continue
+        samples = freq * bucket_seconds
+        if samples < 1 or not np.isclose(samples, round(samples)):
+            # A bucket must hold whole samples; resample just this group onto the nearest rate where it does
+            rate = max(np.ceil(samples), 1) / bucket_seconds
+            df, freq = align_frames({freq: df}, rate=rate), rate
+        frames.append(decimate(df, freq, bucket_seconds, aggregates))
+
+    if not frames:
+        return pd.DataFrame(index=pd.Index([], name='time'))
+    return pd.concat(frames, axis=1)
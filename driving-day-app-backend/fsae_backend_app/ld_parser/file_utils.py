@@ -1,3 +1,8 @@
+import mmap
+import os
+import struct
+
+
 def decode_string(bytes):
     """
     Decodes a byte string to a clean ASCII string.
@@ -19,46 +24,131 @@ def decode_string(bytes):
         return ""
 
 
+def map_ldfile(f_):
+    """
+    Memory-maps an ld file read-only, so that the header, every channel's metadata and
+    every channel's data block are all served from a single mapping.
+
+    Args:
+        f_ (str): The file path of the ld file to map.
+
+    Returns:
+        mmap.mmap: A read-only mapping of the whole file.
+
+    Raises:
+        FileNotFoundError: If the specified file path is invalid.
+    """
+    with open(f_, 'rb') as f:
+        # The mapping stays valid after the descriptor is closed
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def is_buffer(f_):
+    """
+    Checks whether an ld source is an in-memory buffer rather than a path or file object.
+
+    Args:
+        f_: The ld source (a path, a buffer or a file object).
+
+    Returns:
+        bool: True for bytes, bytearray, memoryview and mmap sources.
+    """
+    return isinstance(f_, (bytes, bytearray, memoryview, mmap.mmap))
+
+
+def as_buffer(f_):
+    """
+    Returns a buffer over the whole ld file for any supported ld source.
+
+    Paths and real files are memory-mapped, `BytesIO`-like objects expose their internal
+    buffer without copying, and any other seekable file object is read into memory.
+    Nothing is ever written to disk.
+
+    Args:
+        f_: A file path, bytes, bytearray, memoryview, mmap or seekable file object.
+
+    Returns:
+        A buffer (bytes, memoryview or mmap.mmap) holding the ld file.
+    """
+    if is_buffer(f_):
+        return f_
+    if isinstance(f_, (str, os.PathLike)):
+        return map_ldfile(f_)
+    if hasattr(f_, 'getbuffer'):
+        return f_.getbuffer()
+    try:
+        return mmap.mmap(f_.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        # io.UnsupportedOperation (in-memory uploads, sockets, ...) is both an OSError and a ValueError
+        f_.seek(0)
+        return f_.read()
+
+
+def unpack_struct(f_, fmt, offset=None):
+    """
+    Unpacks a struct from an ld source.
+
+    Args:
+        f_: A buffer (see `is_buffer`) or a seekable file object.
+        fmt (str): The struct format to unpack.
+        offset (int, optional): Where the struct starts. Defaults to the start of a buffer,
+            or to the current position of a file object.
+
+    Returns:
+        tuple: The unpacked values.
+    """
+    if is_buffer(f_):
+        return struct.unpack_from(fmt, f_, offset or 0)
+    if offset is not None:
+        f_.seek(offset)
+    return struct.unpack(fmt, f_.read(struct.calcsize(fmt)))
+
+
 def read_channels(f_, meta_ptr):
     """
     Reads and parses all channel data from the file starting from a given metadata pointer.
 
     Args:
-        f_ (str): The file path of the ld file to read from.
+        f_: The file path of the ld file to read from, a buffer holding it, or a file object.
         meta_ptr (int): The pointer to the start of the channel metadata block.
 
     Returns:
-        list: A list of `ldChan` objects representing the channels in the file.
+        ldChanTable: A columnar table of the channels in the file, indexable by row and
+            searchable by name.
 
     Raises:
-        ImportError: If the `ldChan` class cannot be imported from the `data_containers` module.
+        ImportError: If the `ldChanTable` class cannot be imported from the `data_containers` module.
     """    
-    chans = []
-    while meta_ptr:
-        from .data_containers import ldChan  # Import inside function to avoid circular import issues
-        chan_ = ldChan.fromfile(f_, meta_ptr)  # Parse a single channel
-        chans.append(chan_)
-        meta_ptr = chan_.next_meta_ptr  # Move to the next channel's metadata
-    return chans
+    from .data_containers import ldChanTable  # Import inside function to avoid circular import issues
+    return ldChanTable.fromfile(f_, meta_ptr)  # Walk the metadata chain into one table
 
 
-def read_ldfile(f_):
+def read_ldfile(f_, use_mmap=False):
     """
     Reads the contents of an ld file and extracts its header and channel data.
 
     Args:
-        f_ (str): The file path of the ld file to read.
+        f_: The file path of the ld file to read, or the file's contents as bytes, a
+            memoryview or any seekable file object (e.g. an uploaded file).
+        use_mmap (bool): If True, a file path is mapped once with `map_ldfile` and every
+            channel reads from that mapping instead of re-opening the file. Sources that
+            are not paths are always parsed from a single buffer (see `as_buffer`).
 
     Returns:
         tuple: A tuple containing:
             - `ldHead`: The header object containing metadata.
-            - `list`: A list of `ldChan` objects representing the channels.
+            - `ldChanTable`: A table of the channels, whose rows are `ldChan` views.
 
     Raises:
         ImportError: If the `ldHead` class cannot be imported from the `data_containers` module.
         FileNotFoundError: If the specified file path is invalid.
     """    
     from .data_containers import ldHead  # Import inside function to avoid circular import issues
-    head_ = ldHead.fromfile(open(f_, 'rb'))  # Parse the header
+    if use_mmap or not isinstance(f_, (str, os.PathLike)):
+        f_ = as_buffer(f_)
+        head_ = ldHead.fromfile(f_)
+    else:
+        with open(f_, 'rb') as f:
+            head_ = ldHead.fromfile(f)  # Parse the header
     chans = read_channels(f_, head_.meta_ptr)  # Read the channels using the header metadata pointer
     return head_, chans
\ No newline at end of file
@@ -0,0 +1,174 @@
+import xml.etree.ElementTree as ET
+import numpy as np
+
+# Candidate channel names, in order of preference, for each source of lap information
+LAP_NUMBER_CHANNELS = ('Lap Number', 'Lap')
+BEACON_CHANNELS = ('Beacon', 'Lap Beacon')
+LAP_DISTANCE_CHANNELS = ('Lap Distance', 'Distance')
+GPS_CHANNELS = (('GPS Latitude', 'GPS Longitude'), ('Latitude', 'Longitude'))
+BRAKE_CHANNELS = ('Brake Pressure Front', 'Brake Pres Front', 'Brake Pressure')
+THROTTLE_CHANNELS = ('Throttle Position', 'Throttle Pos', 'Throttle')
+
+# Laps shorter than this are treated as a repeated trigger of the same beacon
+MIN_LAP_SECONDS = 20
+# Radius around the start/finish point within which a GPS fix counts as a crossing
+GPS_GATE_METERS = 15
+# Brake pressure above this fraction of the run's maximum marks a braking zone
+BRAKE_THRESHOLD = 0.2
+# Throttle above this fraction of the run's maximum marks a straight
+THROTTLE_THRESHOLD = 0.95
+# Braking zones and straights shorter than this are ignored
+MIN_ZONE_SECONDS = 0.5
+
+
+def _find_channel(df_dict, candidates):
+    """Returns (freq, values) of the first candidate channel present in `df_dict`, or None."""
+    for name in candidates:
+        for freq, df in df_dict.items():
+            if freq > 0 and name in df.columns:
+                return freq, df[name].to_numpy()
+    return None
+
+
+def _debounce(times):
+    """Drops beacon times closer than MIN_LAP_SECONDS to the previously kept one."""
+    kept = []
+    for t in times:
+        if not kept or t - kept[-1] >= MIN_LAP_SECONDS:
+            kept.append(float(t))
+    return kept
+
+
+def parse_ldx(data):
+    """
+    Reads the beacon times from a MoTeC .ldx companion file.
+
+    Args:
+        data (bytes or str): The contents of the .ldx file.
+
+    Returns:
+        list: Beacon times in seconds, in order. Empty if the file holds no beacons.
+    """
+    root = ET.fromstring(data)
+    times = []
+    for group in root.iter('MarkerGroup'):
+        if group.get('Name') != 'Beacons':
+            continue
+        for marker in group.iter('Marker'):
+            # Marker times are stored in microseconds
+            times.append(float(marker.get('Time', 0)) / 1e6)
+    return sorted(times)
+
+
+def beacon_times(df_dict):
+    """
+    Detects the times the car crossed the start/finish line from the logged channels.
+
+    The lap number, beacon, lap distance and GPS channels are tried in that order, and
+    the first one present in the log is used.
+
+    Args:
+        df_dict (dict): Maps each recording frequency (Hz) to a DataFrame of the channels
+            recorded at that frequency, as returned by `ldData.to_dataframe`.
+
+    Returns:
+        list: Crossing times in seconds, in order. Empty if no lap channel was logged.
+    """
+    channel = _find_channel(df_dict, LAP_NUMBER_CHANNELS)
+    if channel is not None:
+        freq, values = channel
+        return _debounce((np.flatnonzero(np.diff(values) > 0) + 1) / freq)
+
+    channel = _find_channel(df_dict, BEACON_CHANNELS)
+    if channel is not None:
+        freq, values = channel
+        active = np.nan_to_num(values) > 0
+        return _debounce((np.flatnonzero(active[1:] & ~active[:-1]) + 1) / freq)
+
+    channel = _find_channel(df_dict, LAP_DISTANCE_CHANNELS)
+    if channel is not None:
+        freq, values = channel
+        # Lap distance resets to zero at the line; a drop of over half its range is a reset
+        drop = np.nanmax(values) / 2
+        return _debounce((np.flatnonzero(np.diff(values) < -drop) + 1) / freq)
+
+    for lat_name, lon_name in GPS_CHANNELS:
+        lat = _find_channel(df_dict, (lat_name,))
+        lon = _find_channel(df_dict, (lon_name,))
+        if lat is None or lon is None or lat[0] != lon[0]:
+            continue
+        freq, lat = lat
+        lon = lon[1]
+        valid = np.flatnonzero(np.isfinite(lat) & np.isfinite(lon) & (lat != 0))
+        if len(valid) == 0:
+            return []
+        # The first fix is taken as the start/finish point; project onto a local plane in meters
+        lat0, lon0 = lat[valid[0]], lon[valid[0]]
+        dy = (lat - lat0) * 111320.0
+        dx = (lon - lon0) * 111320.0 * np.cos(np.radians(lat0))
+        inside = np.hypot(dx, dy) < GPS_GATE_METERS
+        entries = np.flatnonzero(inside[1:] & ~inside[:-1]) + 1
+        return _debounce(entries / freq)
+
+    return []
+
+
+def _zones(df_dict, candidates, threshold, kind):
+    """Contiguous spans where a channel exceeds `threshold` x its maximum, as segment dicts."""
+    channel = _find_channel(df_dict, candidates)
+    if channel is None:
+        return []
+    freq, values = channel
+    peak = np.nanmax(values)
+    if not np.isfinite(peak) or peak <= 0:
+        return []
+
+    active = np.nan_to_num(values) > threshold * peak
+    edges = np.diff(active.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    keep = (ends - starts) / freq >= MIN_ZONE_SECONDS
+    return [{"type": kind, "start": float(s / freq), "end": float(e / freq)}
+            for s, e in zip(starts[keep], ends[keep])]
+
+
+def segment_index(df_dict, ldx=None):
+    """
+    Builds the lap and segment index of a run.
+
+    Laps run between consecutive start/finish crossings, taken from the .ldx companion
+    file when given and detected from the logged channels otherwise. Lap 0 is the out lap
+    before the first crossing, and the last lap may be partial. Braking zones and straights
+    are detected from the brake pressure and throttle channels and tagged with their lap.
+
+    Args:
+        df_dict (dict): Maps each recording frequency (Hz) to a DataFrame of the channels
+            recorded at that frequency, as returned by `ldData.to_dataframe`.
+        ldx (bytes or str, optional): The contents of the run's .ldx companion file.
+
+    Returns:
+        list: Segment dicts with `type` ('lap', 'braking' or 'straight'), `lap`, `start`
+            and `end` (in seconds), ordered by start time.
+    """
+    crossings = []
+    if ldx:
+        try:
+            crossings = _debounce(parse_ldx(ldx))
+        except ET.ParseError as e:
+            print(f"Could not parse the .ldx file: {e}")
+    if not crossings:
+        crossings = beacon_times(df_dict)
+
+    duration = max((len(df) / freq for freq, df in df_dict.items() if freq > 0), default=0)
+    bounds = [0.0] + [t for t in crossings if 0 < t < duration] + [duration]
+
+    segments = [{"type": "lap", "lap": lap, "start": start, "end": end}
+                for lap, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])) if end > start]
+
+    lap_starts = np.array(bounds[:-1])
+    for zone in _zones(df_dict, BRAKE_CHANNELS, BRAKE_THRESHOLD, 'braking') + \
+            _zones(df_dict, THROTTLE_CHANNELS, THROTTLE_THRESHOLD, 'straight'):
+        zone["lap"] = int(np.searchsorted(lap_starts, zone["start"], side='right') - 1)
+        segments.append(zone)
+
+    return sorted(segments, key=lambda segment: (segment["start"], segment["type"] != "lap"))
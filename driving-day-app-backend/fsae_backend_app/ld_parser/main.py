@@ -1,44 +1,48 @@
 import os
-import math
 from django.conf import settings
+from .cache import RunCache
 from .data_containers import ldData
-from ..firebase.firestore import upload_csv_to_firestore
+from .decimation import decimate_frames
+from .file_utils import as_buffer
+from .laps import segment_index
+from .stats import channel_stats
+from ..firebase.uploads import upload_dataframe_to_firestore
+from ..firebase.telemetry_cache import run_data_cache
+from ..firebase.ttl_cache import list_cache
 from ..firebase.firebase import firebase_app
 from firebase_admin import firestore
-from django.core.files.storage import default_storage
 from datetime import datetime
 
 
 db = firestore.client()
+run_cache = RunCache(settings.LD_CACHE_DIR, settings.LD_CACHE_MAX_BYTES) if settings.LD_CACHE_ENABLED else None
 
-def process_and_upload_inputted_ld_file(data_file, run_date, run_title, driver_id):
+def process_and_upload_inputted_ld_file(data_file, run_date, run_title, driver_id, ldx_file=None):
     '''
-        Process LD file that is inputted by the user
-    '''
-    data_path = settings.DATA_DIR
+        Process LD file that is inputted by the user, along with its optional .ldx companion file
 
+        Returns the write report of the upload, or None if the file is not an LD file or was not
+        uploaded in full (see `process_and_upload_ld_data`).
+    '''
     if data_file.name.endswith('.ld'):
-        file_content = data_file.read()
         run_date = datetime.fromisoformat(run_date)
 
         year = str(run_date.year)
         month = str(run_date.month) if run_date.month > 10 else "0" + str(run_date.month)
         day = str(run_date.day) if run_date.day > 10 else "0" + str(run_date.day)
 
+        run_name = f'{year}-{month}-{day}-{run_title}'
 
-        file_path = os.path.join(data_path, f'{year}-{month}-{day}-{run_title}.ld')
-        
-        # Change to account for uploaded metadata
-        with default_storage.open(file_path, "wb+") as destination_file:
-            destination_file.write(file_content)
-        
+        # Parse straight from the upload buffer, without staging the LD file on disk
         # await asyncio.to_thread()
-        process_and_upload_ld_files(driver_id)
+        ldx = ldx_file.read() if ldx_file is not None else None
+        return process_and_upload_ld_data(data_file, run_name, driver_id, ldx)
+    return None
 
 
 def process_and_upload_ld_files(driver_id):
     '''
-        Process LD (Logical Data) files in the data directory, convert them to CSV format, and upload the CSV files to Firestore.
+        Process LD (Logical Data) files in the data directory, convert them to DataFrames, and upload them to Firestore.
 
     This function performs the following steps:
     '''
@@ -51,27 +55,19 @@ def process_and_upload_ld_files(driver_id):
             if not filename.endswith('.ld'):
                 continue
             file_path = os.path.join(data_path, filename)
-            
-            # Parsing LD into CSV
-            l = ldData.fromfile(file_path)
-
-            df_dict = l.to_dataframe()
-            min_length = min(df_dict.keys())
 
-            for length, df in df_dict.items(): 
-                csv_filename = os.path.join(data_path, os.path.splitext(filename)[0] + '-' + str(math.ceil(length/min_length)) + '-hz' + '.csv')
-                df.to_csv(csv_filename, index=False)
-                print(f"Data saved to {csv_filename}")
+            ldx = None
+            ldx_path = os.path.splitext(file_path)[0] + '.ldx'
+            if os.path.exists(ldx_path):
+                with open(ldx_path, 'rb') as ldx_file:
+                    ldx = ldx_file.read()
 
-                # Uploading CSV to Firebase
-                upload_csv_to_firestore(csv_filename, driver_id)
-                print(f"Data from {csv_filename} uploaded to Firestore")
-                
+            process_and_upload_ld_data(file_path, os.path.splitext(filename)[0], driver_id, ldx)
 
         # Deleting all files in the folder after processing
         for filename in os.listdir(data_path):
             file_path = os.path.join(data_path, filename)
-            if filename.endswith('.ld') or filename.endswith('.csv'):
+            if filename.endswith('.ld') or filename.endswith('.ldx') or filename.endswith('.csv'):
                 try:
                     os.remove(file_path)
                     print(f"Deleted {file_path}")
@@ -80,3 +76,64 @@ def process_and_upload_ld_files(driver_id):
     except Exception as e:
         print(e)
 
+
+def load_ld_frames(source):
+    '''
+        Decode an LD file (a path, bytes, or an uploaded file) into per-frequency DataFrames.
+        With LD_CACHE_ENABLED, a file ingested before is loaded from the content-addressed run
+        cache instead of being parsed again; nothing else reads that cache.
+
+        Returns the frames along with the SHA-256 of the raw LD bytes.
+    '''
+    buffer = as_buffer(source)
+    ld_hash = RunCache.key(buffer)
+
+    df_dict = run_cache.get(ld_hash) if run_cache is not None else None
+    if df_dict is None:
+        df_dict = ldData.fromfile(buffer).to_dataframe(workers=settings.LD_DECODE_WORKERS)
+        if run_cache is not None:
+            run_cache.put(ld_hash, df_dict)
+    else:
+        print(f"Loaded {ld_hash} from the run cache")
+
+    return df_dict, ld_hash
+
+
+def process_and_upload_ld_data(source, run_name, driver_id, ldx=None):
+    '''
+        Convert an LD file to per-frequency frames, reduce every bucket of each (one second by default)
+        to per-channel mean/min/max/last at the frame's own rate, and upload the joined buckets straight
+        to Firestore under a document named `<run_name>`, along with its statistics and lap/segment
+        index (using the contents of the .ldx companion file for beacons, when given).
+
+        Returns the write report of the upload (see `upload_dataframe_to_firestore`), or None if
+        anything fails, including a partial upload, in which case the caches are left untouched.
+    '''
+    try:
+        df_dict, ld_hash = load_ld_frames(source)
+
+        # Aggregate rather than keep every Nth row, so spikes between stored samples survive; each
+        # frequency is reduced at its own rate, so slow channels are never upsampled to the fastest one
+        decimated_df = decimate_frames(df_dict, settings.LD_BUCKET_SECONDS)
+
+        # Summary statistics come from the full-resolution frames, before any resampling
+        metadata = {
+            "ld-hash": ld_hash,
+            "stats": channel_stats(df_dict),
+            "segments": segment_index(df_dict, ldx),
+            "bucket-seconds": settings.LD_BUCKET_SECONDS,
+        }
+
+        report = upload_dataframe_to_firestore(decimated_df, run_name, driver_id, metadata)
+        if report is None or report["failed"]:
+            print(f"Data from {run_name} could not be uploaded to Firestore")
+            return None
+
+        # Reads of an earlier upload are keyed on its version and can no longer be hit; free them now
+        run_data_cache.invalidate(run_name)
+        list_cache.invalidate('general-run-data')
+        print(f"Data from {run_name} uploaded to Firestore")
+        return report
+    except Exception as e:
+        print(e)
+        return None
@@ -0,0 +1,93 @@
+import warnings
+import numpy as np
+from .decimation import COLUMN_SLICE, MAX_BLOCK_VALUES
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Key points shown on the run detail page: label -> (channel, statistic)
+KEY_POINTS = {
+    "Highest Coolant Temperature": ("Coolant Temperature", "max"),
+}
+
+
+def _finite(value):
+    """Converts a NumPy scalar to a Python float, or None if it is NaN or infinite."""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _column_stats(values, percentiles):
+    """Statistics of every column of `values` (samples x channels), ignoring NaN samples."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        columns = {
+            'min': np.nanmin(values, axis=0),
+            'max': np.nanmax(values, axis=0),
+            'mean': np.nanmean(values, axis=0, dtype=np.float64),
+            'std': np.nanstd(values, axis=0, dtype=np.float64),
+        }
+        for q, column in zip(percentiles, np.nanpercentile(values, percentiles, axis=0)):
+            columns[f'p{q}'] = column
+    return columns
+
+
+def channel_stats(df_dict, percentiles=PERCENTILES):
+    """
+    Computes summary statistics of every channel at full resolution.
+
+    Each frame is reduced in slices of at most COLUMN_SLICE channels and about
+    MAX_BLOCK_VALUES samples (see `decimation`), read in the frame's own dtype, so the
+    temporaries of the NaN-aware reductions stay bounded however long the run is.
+
+    Args:
+        df_dict (dict): Maps each recording frequency (Hz) to a DataFrame of the channels
+            recorded at that frequency, as returned by `ldData.to_dataframe`.
+        percentiles (tuple): The percentiles to compute.
+
+    Returns:
+        dict: Maps each channel name to a dict with `min`, `max`, `mean`, `std`, one
+            `p<q>` entry per percentile, and `min-time`/`max-time`, the time in seconds
+            at which the extremes first occur. Channels without any samples are left out.
+    """
+    stats = {}
+    for freq, df in df_dict.items():
+        n_rows, n_channels = df.shape
+        width = int(np.clip(MAX_BLOCK_VALUES // max(n_rows, 1), 1, COLUMN_SLICE))
+
+        for lo in range(0, n_channels, width):
+            # A view of the frame's own block for the usual single-dtype frame
+            values = df.iloc[:, lo:lo + width].to_numpy()
+            has_values = ~np.isnan(values).all(axis=0)
+            if not has_values.any():
+                continue
+            if not has_values.all():
+                values = values[:, has_values]
+            names = df.columns[lo:lo + width][has_values]
+
+            columns = _column_stats(values, percentiles)
+            if freq > 0:
+                columns['min-time'] = np.nanargmin(values, axis=0) / freq
+                columns['max-time'] = np.nanargmax(values, axis=0) / freq
+
+            for idx, name in enumerate(names):
+                stats[name] = {stat: _finite(column[idx]) for stat, column in columns.items()}
+
+    return stats
+
+
+def key_points(stats):
+    """
+    Picks the run detail page's key points out of a run's channel statistics.
+
+    Args:
+        stats (dict): Channel statistics, as returned by `channel_stats`.
+
+    Returns:
+        dict: Maps each key point label in `KEY_POINTS` to its formatted value, or "N/A"
+            if the run did not record the channel.
+    """
+    points = {}
+    for label, (channel, stat) in KEY_POINTS.items():
+        value = (stats or {}).get(channel, {}).get(stat)
+        points[label] = "N/A" if value is None else f"{value:.1f}"
+    return points
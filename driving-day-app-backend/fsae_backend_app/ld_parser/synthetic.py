@@ -0,0 +1,133 @@
+import struct
+import numpy as np
+from .data_containers import ldChan, ldEvent, ldHead, ldVehicle, ldVenue
+
+# (dtype family, sample size) written to a channel's metadata for each supported data type
+DTYPE_FIELDS = {
+    np.float16: (0x07, 2),
+    np.float32: (0x07, 4),
+    np.int16: (0x03, 2),
+    np.int32: (0x03, 4),
+}
+
+
+def make_channels(n_channels=20, freqs=(10, 50, 100), dtypes=(np.int16, np.int32, np.float16, np.float32)):
+    """
+    Builds synthetic channel specs, cycling through the given frequencies and data types.
+
+    Integer channels are stored with one decimal place (raw value = 10 x value), so that
+    decoding exercises the `dec` factor.
+
+    Args:
+        n_channels (int): The number of channels.
+        freqs (tuple): The recording frequencies (Hz) to cycle through.
+        dtypes (tuple): The data types to cycle through (keys of `DTYPE_FIELDS`).
+
+    Returns:
+        list: One dict per channel with `name`, `freq`, `dtype`, `shift`, `mul`, `scale`,
+            `dec` and `unit` keys.
+    """
+    channels = []
+    for idx in range(n_channels):
+        dtype = dtypes[idx % len(dtypes)]
+        channels.append({
+            'name': f'Channel {idx:03}',
+            'freq': freqs[idx % len(freqs)],
+            'dtype': dtype,
+            'shift': 0,
+            'mul': 1,
+            'scale': 1,
+            'dec': 1 if np.issubdtype(dtype, np.integer) else 0,
+            'unit': 'u',
+        })
+    return channels
+
+
+def _signal(chann, duration, rng):
+    """Raw samples of a noisy sine with occasional one-sample spikes, within the channel's data type."""
+    n_samples = int(duration * chann['freq'])
+    t = np.arange(n_samples) / chann['freq']
+    period = rng.uniform(5, 60)
+    values = 50 * np.sin(2 * np.pi * t / period) + rng.normal(0, 2, n_samples)
+    spikes = rng.random(n_samples) < 0.001
+    values[spikes] += rng.uniform(100, 200, spikes.sum())
+
+    raw = values * 10 ** chann['dec']
+    if np.issubdtype(chann['dtype'], np.integer):
+        raw = np.round(raw)
+    return raw.astype(chann['dtype'])
+
+
+def write_ldfile(f, channels=None, duration=60, seed=0, driver='Synthetic Driver',
+                 vehicleid='Synthetic Car', venue='Synthetic Venue', event='Synthetic Event'):
+    """
+    Writes a valid synthetic ld file: header, event, venue and vehicle blocks, the linked channel
+    metadata chain and every channel's data block.
+
+    Args:
+        f: A file path or a writable binary file object.
+        channels (list, optional): Channel specs, as returned by `make_channels`. Defaults
+            to `make_channels()`.
+        duration (float): The length of the log in seconds.
+        seed (int): The seed of the random signals, so that runs are reproducible.
+        driver (str): The driver written to the header.
+        vehicleid (str): The vehicle ID written to the header and the vehicle block.
+        venue (str): The venue written to the header and the venue block.
+        event (str): The event name written to the event block.
+
+    Returns:
+        dict: Maps each channel name to its expected decoded values (float64).
+    """
+    if channels is None:
+        channels = make_channels()
+    rng = np.random.default_rng(seed)
+
+    head_size, event_size, venue_size, vehicle_size, chan_size = map(
+        struct.calcsize, [ldHead.fmt, ldEvent.fmt, ldVenue.fmt, ldVehicle.fmt, ldChan.fmt])
+    event_ptr = head_size
+    venue_ptr = event_ptr + event_size
+    vehicle_ptr = venue_ptr + venue_size
+    meta_ptr = vehicle_ptr + vehicle_size
+    data_ptr = meta_ptr + chan_size * len(channels)
+
+    raw_blocks = [_signal(chann, duration, rng) for chann in channels]
+
+    buf = bytearray(data_ptr + sum(block.nbytes for block in raw_blocks))
+    struct.pack_into(ldHead.fmt, buf, 0,
+                     0x40, meta_ptr, data_ptr, event_ptr,
+                     1, 0x4240, 0xf,
+                     1, b'ADL', 420, 0xadb0, len(channels),
+                     b'01/01/2024', b'12:00:00',
+                     driver.encode(), vehicleid.encode(), venue.encode(),
+                     0xc81a4, b'synthetic')
+    struct.pack_into(ldEvent.fmt, buf, event_ptr, event.encode(), b'1', b'', venue_ptr)
+    struct.pack_into(ldVenue.fmt, buf, venue_ptr, venue.encode(), vehicle_ptr)
+    struct.pack_into(ldVehicle.fmt, buf, vehicle_ptr, vehicleid.encode(), 250, b'FSAE', b'')
+
+    expected = {}
+    block_ptr = data_ptr
+    for idx, (chann, block) in enumerate(zip(channels, raw_blocks)):
+        chan_ptr = meta_ptr + chan_size * idx
+        prev_ptr = chan_ptr - chan_size if idx > 0 else 0
+        next_ptr = chan_ptr + chan_size if idx < len(channels) - 1 else 0
+        dtype_a, dtype_size = DTYPE_FIELDS[chann['dtype']]
+
+        struct.pack_into(ldChan.fmt, buf, chan_ptr,
+                         prev_ptr, next_ptr, block_ptr, len(block),
+                         idx, dtype_a, dtype_size, chann['freq'],
+                         chann['shift'], chann['mul'], chann['scale'], chann['dec'],
+                         chann['name'].encode(), chann['name'][:8].encode(), chann['unit'].encode())
+        buf[block_ptr:block_ptr + block.nbytes] = block.tobytes()
+        block_ptr += block.nbytes
+
+        # In float64, as the parser decodes; float16 arithmetic would round the expected values
+        raw = block.astype(np.float64)
+        expected[chann['name']] = (raw / chann['scale'] * pow(10., -chann['dec']) + chann['shift']) * chann['mul']
+
+    if hasattr(f, 'write'):
+        f.write(buf)
+    else:
+        with open(f, 'wb') as out:
+            out.write(buf)
+
+    return expected
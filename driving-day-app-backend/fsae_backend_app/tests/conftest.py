@@ -0,0 +1,22 @@
+import pytest
+
+
+@pytest.fixture(scope='session')
+def django_settings():
+    """
+    Django settings for the modules that read them, configured with test values; tests using
+    this fixture are skipped where Django is not installed.
+    """
+    pytest.importorskip('django')
+    from django.conf import settings
+
+    if not settings.configured:
+        settings.configure(
+            SECRET_KEY='test-secret',
+            RUN_DATA_CACHE_MAX_BYTES=1024 ** 2,
+            RUN_DATA_CACHE_DIR=None,
+            RUN_DATA_CACHE_DISK_MAX_BYTES=0,
+            LIST_CACHE_TTL_SECONDS=60,
+            LIST_CACHE_MAX_ENTRIES=256,
+        )
+    return settings
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fsae_backend_app.ld_parser.alignment import align_frames, build_time_index, resample
+
+
+def test_time_index_covers_the_longest_channel():
+    np.testing.assert_allclose(build_time_index([0.5, 1.2], rate=5), np.arange(6) / 5)
+    assert len(build_time_index([], rate=5)) == 0
+
+
+def test_zero_order_hold():
+    values = np.array([1.0, 2.0, 3.0])
+    times = np.array([0.0, 0.1, 0.5, 1.0, 1.49, 1.5])
+
+    np.testing.assert_array_equal(resample(values, 2, times, 'zoh'), [1, 1, 2, 3, 3, np.nan])
+
+
+def test_zero_order_hold_of_integers_is_float():
+    resampled = resample(np.array([1, 2], dtype=np.int16), 1, np.array([0.0, 2.0]), 'zoh')
+    assert resampled.dtype == np.float64
+    np.testing.assert_array_equal(resampled, [1, np.nan])
+
+
+def test_linear_skips_nan_samples():
+    values = np.array([0.0, np.nan, 4.0])
+    times = np.array([0.0, 0.25, 0.5, 1.0, 1.5])
+
+    np.testing.assert_allclose(resample(values, 2, times, 'linear'), [0, 1, 2, 4, np.nan])
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        resample(np.zeros(2), 1, np.zeros(2), 'cubic')
+
+
+def test_align_frames_onto_the_fastest_rate():
+    df_dict = {
+        1: pd.DataFrame({'slow': [10.0, 20.0]}),
+        4: pd.DataFrame({'fast': np.arange(6, dtype=np.float64)}),
+    }
+    aligned = align_frames(df_dict)
+
+    np.testing.assert_allclose(aligned.index, np.arange(8) / 4)
+    np.testing.assert_array_equal(aligned['slow'], [10] * 4 + [20] * 4)
+    np.testing.assert_array_equal(aligned['fast'], [0, 1, 2, 3, 4, 5, np.nan, np.nan])
+
+
+def test_align_frames_channel_subset_and_rate():
+    df_dict = {
+        1: pd.DataFrame({'a': [1.0, 2.0]}),
+        2: pd.DataFrame({'b': [1.0, 2.0, 3.0, 4.0], 'c': [0.0] * 4}),
+    }
+    aligned = align_frames(df_dict, rate=1, channels=['b', 'a', 'missing'])
+
+    assert list(aligned.columns) == ['b', 'a']
+    np.testing.assert_array_equal(aligned['b'], [1, 3])
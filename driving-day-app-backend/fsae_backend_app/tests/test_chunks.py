@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from fsae_backend_app.firebase.chunks import (assemble, build_chunks, plan_reads, row_ids, to_columns,
+                                              to_rows)
+from fsae_backend_app.ld_parser.decimation import aggregate_field
+
+
+def _frame(n_rows=25, n_channels=5, aggregates=('mean', 'max')):
+    names = [aggregate_field(f'c{idx}', aggregate) for idx in range(n_channels) for aggregate in aggregates]
+    values = np.arange(n_rows * len(names), dtype=np.float64).reshape(n_rows, len(names))
+    values[3, 1] = np.nan
+    return pd.DataFrame(values, columns=names)
+
+
+def test_build_chunks_splits_rows_and_channels():
+    manifest, chunks = build_chunks(_frame(), chunk_rows=10, channels_per_group=2)
+
+    assert manifest['rows'] == 25
+    assert [group['columns'] for group in manifest['groups']] == [
+        ['c0', 'c0 (max)', 'c1', 'c1 (max)'], ['c2', 'c2 (max)', 'c3', 'c3 (max)'], ['c4', 'c4 (max)']]
+    assert len(chunks) == 3 * 3 == len(manifest['chunks'])
+    assert [chunks[chunk_id]['rows'] for chunk_id in manifest['chunks'][:3]] == [10, 10, 5]
+
+
+def test_aggregates_stay_with_their_channel():
+    df = _frame(n_channels=3)
+    df = df[['c0', 'c1', 'c0 (max)', 'c2', 'c1 (max)', 'c2 (max)']]
+    manifest, _ = build_chunks(df, channels_per_group=2)
+
+    assert [group['columns'] for group in manifest['groups']] == [
+        ['c0', 'c0 (max)', 'c1', 'c1 (max)'], ['c2', 'c2 (max)']]
+
+
+def test_assemble_round_trip():
+    df = _frame()
+    manifest, chunks = build_chunks(df, chunk_rows=10, channels_per_group=2)
+
+    columns = assemble(manifest, chunks)
+    assert sorted(columns) == sorted(df.columns)
+    for name, values in columns.items():
+        assert values.dtype == np.float32
+        np.testing.assert_array_equal(values, df[name].to_numpy(dtype=np.float32))
+
+
+def test_plan_reads_and_assemble_a_row_range():
+    df = _frame()
+    manifest, chunks = build_chunks(df, chunk_rows=10, channels_per_group=2)
+
+    planned = plan_reads(manifest, ['c3 (max)'], start_row=12, stop_row=22)
+    assert planned == ['g001_c00001', 'g001_c00002']
+
+    columns = assemble(manifest, {chunk_id: chunks[chunk_id] for chunk_id in planned}, ['c3 (max)'], 12, 22)
+    assert list(columns) == ['c3 (max)']
+    np.testing.assert_array_equal(columns['c3 (max)'], df['c3 (max)'].to_numpy(dtype=np.float32)[12:22])
+
+
+def test_plan_reads_past_the_end():
+    manifest, _ = build_chunks(_frame(), chunk_rows=10)
+    assert plan_reads(manifest, start_row=25) == []
+
+
+def test_rows_and_columns_round_trip():
+    manifest, chunks = build_chunks(_frame(), chunk_rows=10, channels_per_group=2)
+    columns = assemble(manifest, chunks, start_row=2, stop_row=5)
+
+    rows = to_rows(columns, start_row=2)
+    assert [row['id'] for row in rows] == row_ids(columns, 2) == ['data_000002', 'data_000003', 'data_000004']
+    assert 'c0 (max)' not in rows[1]
+
+    ids, round_trip = to_columns(rows)
+    assert ids == row_ids(columns, 2)
+    for name, values in columns.items():
+        np.testing.assert_array_equal(round_trip[name], values)
+
+
+def test_to_columns_reads_blank_values_as_nan():
+    _, columns = to_columns([{'id': 'data_000000', 'speed': ''}, {'id': 'data_000001', 'speed': 4}])
+    np.testing.assert_array_equal(columns['speed'], np.array([np.nan, 4], dtype=np.float32))
@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+import json
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def columnar(django_settings):
+    from fsae_backend_app import columnar
+    return columnar
+
+
+def _data():
+    ids = ['data_000010', 'data_000011', 'data_000012']
+    columns = {'Speed': np.array([1.5, np.nan, 3], dtype=np.float32), 'RPM (max)': np.arange(3, dtype=np.float32)}
+    return ids, columns
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('application/vnd.fsae.columnar', 'application/vnd.fsae.columnar'),
+    ('text/html, application/vnd.apache.arrow.stream;q=0.9', 'application/vnd.apache.arrow.stream'),
+    ('application/json', None),
+    ('', None),
+])
+def test_negotiate(columnar, accept, expected):
+    assert columnar.negotiate(SimpleNamespace(headers={'Accept': accept})) == expected
+
+
+@pytest.mark.parametrize('key_points', [{}, {'keyPoints': {'Highest Coolant Temperature': '98.3'}}, {'pad': 'x' * 7}])
+def test_columnar_round_trip(columnar, key_points):
+    ids, columns = _data()
+    header, decoded = columnar.decode_columnar(columnar.encode_columnar(ids, columns, **key_points))
+
+    assert header['rows'] == 3 and header['ids'] == ids
+    assert all(entry['offset'] % 4 == 0 for entry in header['columns'])
+    assert {key: header[key] for key in key_points} == key_points
+    assert list(decoded) == list(columns)
+    for name, values in columns.items():
+        np.testing.assert_array_equal(decoded[name], values)
+
+
+def test_arrow_round_trip(columnar):
+    pa = pytest.importorskip('pyarrow')
+    ids, columns = _data()
+
+    table = pa.ipc.open_stream(columnar.encode_arrow(ids, columns, rows=3)).read_all()
+    assert table.column_names == ['id', 'Speed', 'RPM (max)']
+    assert table.column('id').to_pylist() == ids
+    np.testing.assert_array_equal(table.column('Speed').to_numpy(), columns['Speed'])
+    assert json.loads(table.schema.metadata[b'fsae']) == {'rows': 3}
+
+
+def test_columnar_response(columnar):
+    response = columnar.columnar_response(columnar.COLUMNAR_CONTENT_TYPE, None, keyPoints={})
+    header, decoded = columnar.decode_columnar(response.content)
+
+    assert response['Content-Type'] == columnar.COLUMNAR_CONTENT_TYPE
+    assert response['Vary'] == 'Accept'
+    assert header['rows'] == 0 and decoded == {}
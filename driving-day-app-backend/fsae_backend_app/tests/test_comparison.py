@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from fsae_backend_app import comparison
+from fsae_backend_app.comparison import align_runs, distance_channel, run_series
+from fsae_backend_app.firebase.chunks import row_id
+
+
+def _series(speed, distance=None, bucket_seconds=1):
+    columns = {'Speed': np.asarray(speed, dtype=np.float32)}
+    if distance is not None:
+        columns['Distance'] = np.asarray(distance, dtype=np.float32)
+    return run_series(([row_id(row) for row in range(len(speed))], columns), bucket_seconds)
+
+
+def test_distance_channel():
+    stats = {'Distance': {}, 'Lap Distance': {}}
+    assert distance_channel(stats) == 'Distance'
+    assert distance_channel(stats, lap=2) == 'Lap Distance'
+    assert distance_channel({'Lap Distance': {}}) is None
+    assert distance_channel(None, lap=1) is None
+
+
+def test_run_series():
+    series = run_series((['data_000010', 'data_000011'], {'Speed': np.array([1, 2], dtype=np.float32)}),
+                        bucket_seconds=0.5, start_second=5)
+    np.testing.assert_array_equal(series['time'], [0, 0.5])
+    assert series['Speed'].dtype == np.float64
+    assert len(run_series(None)['time']) == 0
+
+
+def test_align_along_time():
+    result = align_runs({'a': _series([0, 10, 20]), 'b': _series([5, 15])}, ['Speed', 'RPM'], step=0.5)
+
+    assert result['grid'] == [0, 0.5, 1, 1.5, 2] and result['step'] == 0.5
+    assert result['runs']['a']['Speed'] == [0, 5, 10, 15, 20]
+    assert result['runs']['b']['Speed'] == [5, 10, 15, None, None]
+    assert result['runs']['a']['RPM'] == [None] * 5
+
+
+def test_align_along_distance_never_folds_back():
+    # The distance channel resets part way, as a lap distance does at the line
+    series = {'a': _series([1, 2, 3, 4], distance=[100, 110, 120, 105])}
+    result = align_runs(series, ['Speed'], 'distance', step=5, distance_channels={'a': 'Distance'})
+
+    assert result['grid'] == [0, 5, 10, 15, 20]
+    assert result['runs']['a']['Speed'][:4] == [1, 1.5, 2, 2.5]
+
+
+@pytest.mark.parametrize('distance', [[], [np.nan, np.nan]])
+def test_run_without_distance_values_is_rejected(distance):
+    series = {'a': _series([1.0] * len(distance), distance=distance)}
+    with pytest.raises(ValueError, match='no Distance values'):
+        align_runs(series, ['Speed'], 'distance', distance_channels={'a': 'Distance'})
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'axis': 'lap'},
+    {'step': 0},
+    {'axis': 'distance', 'distance_channels': {}},
+])
+def test_invalid_requests_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        align_runs({'a': _series([1, 2])}, ['Speed'], **kwargs)
+
+
+def test_long_runs_coarsen_the_grid(monkeypatch):
+    monkeypatch.setattr(comparison, 'MAX_GRID_POINTS', 11)
+    result = align_runs({'a': _series(np.arange(101))}, ['Speed'], step=1)
+
+    assert len(result['grid']) == 11 and result['step'] == 10
+    # The whole run is covered, not just its first 11 seconds
+    assert result['grid'][-1] == 100 and result['runs']['a']['Speed'][-1] == 100
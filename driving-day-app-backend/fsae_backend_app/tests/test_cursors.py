@@ -0,0 +1,38 @@
+import pytest
+
+
+@pytest.fixture
+def cursors(django_settings):
+    from fsae_backend_app.firebase import cursors
+    return cursors
+
+
+def test_round_trip(cursors):
+    token = cursors.encode_cursor('issues', [42, 'abc'])
+    assert cursors.decode_cursor('issues', token) == [42, 'abc']
+
+
+def test_rejects_another_scope(cursors):
+    token = cursors.encode_cursor('run:Endurance', [120])
+    with pytest.raises(ValueError):
+        cursors.decode_cursor('run:Autocross', token)
+
+
+def test_rejects_a_tampered_payload(cursors):
+    _, signature = cursors.encode_cursor('issues', [42, 'abc']).split('.')
+    forged, _ = cursors.encode_cursor('issues', [1, 'abc']).split('.')
+    with pytest.raises(ValueError):
+        cursors.decode_cursor('issues', f'{forged}.{signature}')
+
+
+def test_rejects_another_secret_key(cursors, django_settings, monkeypatch):
+    token = cursors.encode_cursor('issues', [42, 'abc'])
+    monkeypatch.setattr(django_settings, 'SECRET_KEY', 'rotated-secret')
+    with pytest.raises(ValueError):
+        cursors.decode_cursor('issues', token)
+
+
+@pytest.mark.parametrize('token', ['', 'not-a-cursor', 'a.b.c'])
+def test_rejects_malformed_tokens(cursors, token):
+    with pytest.raises(ValueError):
+        cursors.decode_cursor('issues', token)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fsae_backend_app.ld_parser import decimation
+from fsae_backend_app.ld_parser.decimation import decimate, decimate_frames
+
+
+def test_bucket_aggregates():
+    df = pd.DataFrame({'speed': np.arange(10, dtype=np.float32)})
+    out = decimate(df, rate=4, bucket_seconds=1)
+
+    # 10 samples at 4 Hz: two full buckets and a partial one
+    assert list(out.index) == [0, 1, 2]
+    np.testing.assert_array_equal(out['speed'], [1.5, 5.5, 8.5])
+    np.testing.assert_array_equal(out['speed (min)'], [0, 4, 8])
+    np.testing.assert_array_equal(out['speed (max)'], [3, 7, 9])
+    np.testing.assert_array_equal(out['speed (last)'], [3, 7, 9])
+
+
+def test_nan_samples_are_ignored():
+    df = pd.DataFrame({'speed': [1.0, np.nan, np.nan, np.nan, 2.0, np.nan]})
+    out = decimate(df, rate=2, bucket_seconds=1)
+
+    np.testing.assert_array_equal(out['speed'], [1.0, np.nan, 2.0])
+    np.testing.assert_array_equal(out['speed (last)'], [1.0, np.nan, 2.0])
+
+
+def test_matches_pandas_across_blocks(monkeypatch):
+    # Small blocks, so the frame is reduced in several column slices and bucket ranges
+    monkeypatch.setattr(decimation, 'COLUMN_SLICE', 3)
+    monkeypatch.setattr(decimation, 'MAX_BLOCK_VALUES', 60)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(203, 7)), columns=[f'c{idx}' for idx in range(7)])
+
+    out = decimate(df, rate=10, bucket_seconds=2)
+    grouped = df.groupby(np.arange(len(df)) // 20)
+    for name in df.columns:
+        np.testing.assert_allclose(out[name], grouped[name].mean())
+        np.testing.assert_allclose(out[f'{name} (min)'], grouped[name].min())
+        np.testing.assert_allclose(out[f'{name} (max)'], grouped[name].max())
+        np.testing.assert_allclose(out[f'{name} (last)'], grouped[name].last())
+
+
+def test_frames_are_decimated_at_their_own_rate():
+    df_dict = {
+        10: pd.DataFrame({'slow': np.arange(30, dtype=np.float32)}),
+        100: pd.DataFrame({'fast': np.arange(250, dtype=np.float32)}),
+    }
+    out = decimate_frames(df_dict, bucket_seconds=1, aggregates=('mean', 'max'))
+
+    assert list(out.columns) == ['slow', 'slow (max)', 'fast', 'fast (max)']
+    np.testing.assert_array_equal(out.index, [0, 1, 2])
+    np.testing.assert_array_equal(out['slow (max)'], [9, 19, 29])
+    np.testing.assert_array_equal(out['fast (max)'], [99, 199, 249])
+
+
+def test_frames_shorter_than_the_run_end_in_nan():
+    df_dict = {
+        1: pd.DataFrame({'slow': [1.0, 2.0]}),
+        2: pd.DataFrame({'fast': np.arange(8, dtype=np.float64)}),
+    }
+    out = decimate_frames(df_dict, aggregates=('mean',))
+
+    np.testing.assert_array_equal(out['slow'], [1.0, 2.0, np.nan, np.nan])
+    np.testing.assert_array_equal(out['fast'], [0.5, 2.5, 4.5, 6.5])
+
+
+def test_rates_without_whole_samples_per_bucket_are_resampled():
+    # 3 Hz in half-second buckets is 1.5 samples per bucket; the group is held onto 4 Hz first
+    df_dict = {3: pd.DataFrame({'odd': np.arange(6, dtype=np.float64)})}
+    out = decimate_frames(df_dict, bucket_seconds=0.5, aggregates=('min', 'max'))
+
+    np.testing.assert_allclose(out.index, [0, 0.5, 1, 1.5])
+    np.testing.assert_array_equal(out['odd (min)'], [0, 1, 3, 4])
+    np.testing.assert_array_equal(out['odd (max)'], [0, 2, 3, 5])
+
+
+@pytest.mark.parametrize('df_dict', [{}, {10: pd.DataFrame()}])
+def test_no_frames(df_dict):
+    assert decimate_frames(df_dict).empty
@@ -0,0 +1,97 @@
+import asyncio
+from fsae_backend_app.firebase.issue_counter import allocate_issues, issue_numbers, seed_count
+
+
+class FakeDocument(object):
+    def __init__(self, store, path):
+        self.store, self.path = store, path
+
+    async def get(self, transaction=None):
+        return FakeSnapshot(self.store.get(self.path))
+
+
+class FakeSnapshot(object):
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def exists(self):
+        return self.data is not None
+
+    def get(self, field):
+        return self.data[field]
+
+
+class FakeTransaction(object):
+    """Buffers writes until `commit`, like a Firestore transaction."""
+
+    def __init__(self, store):
+        self.store, self.writes = store, []
+
+    def set(self, doc_ref, data):
+        self.writes.append((doc_ref.path, data))
+
+    def create(self, doc_ref, data):
+        assert doc_ref.path not in self.store, f'{doc_ref.path} already exists'
+        self.writes.append((doc_ref.path, data))
+
+    def commit(self):
+        for path, data in self.writes:
+            self.store[path] = dict(data)
+
+
+def _allocate(store, count, shard=0, shards=1, issues=(), latest=None):
+    async def latest_issue_number():
+        return latest
+
+    transaction = FakeTransaction(store)
+    counter = FakeDocument(store, f'counters/issues-{shard}')
+    numbers = asyncio.run(allocate_issues(transaction, counter, shard, count, issues,
+                                          latest_issue_number=latest_issue_number, shards=shards))
+    transaction.commit()
+    return numbers
+
+
+def test_shards_never_collide():
+    numbers = [n for shard in range(3) for count in range(0, 10, 2) for n in issue_numbers(count, 2, 3, shard)]
+    assert len(numbers) == len(set(numbers))
+    assert issue_numbers(0, 3, 1, 0) == [1, 2, 3]
+
+
+def test_seed_count_starts_above_latest_issue():
+    assert seed_count(None, 1) == 0
+    assert seed_count(41, 1) == 41
+    for shards in (2, 3, 4):
+        for shard in range(shards):
+            assert issue_numbers(seed_count(41, shards), 1, shards, shard)[0] > 41
+
+
+def test_allocations_continue_the_counter():
+    store = {}
+    assert _allocate(store, 2) == [1, 2]
+    assert _allocate(store, 3) == [3, 4, 5]
+    assert store['counters/issues-0'] == {'count': 5}
+
+
+def test_new_counter_is_seeded_from_latest_issue():
+    store = {}
+    assert _allocate(store, 2, latest=17) == [18, 19]
+    # Once the counter exists, the latest issue is no longer consulted
+    assert _allocate(store, 1, latest=100) == [20]
+
+
+def test_sharded_allocations_are_unique():
+    store = {}
+    numbers = [n for _ in range(4) for shard in range(3) for n in _allocate(store, 2, shard=shard, shards=3)]
+    assert len(numbers) == len(set(numbers)) == 24
+
+
+def test_issues_created_in_the_transaction():
+    store = {}
+    issues = [(FakeDocument(store, f'issues/{name}'), {'synopsis': name}) for name in ('a', 'b')]
+    numbers = _allocate(store, 2, issues=issues, latest=7)
+
+    assert numbers == [8, 9]
+    assert store['issues/a'] == {'synopsis': 'a', 'issue_number': 8}
+    assert store['issues/b'] == {'synopsis': 'b', 'issue_number': 9}
+    assert store['counters/issues-0'] == {'count': 9}
@@ -0,0 +1,61 @@
+import pytest
+from fsae_backend_app.firebase.issue_index import IssueIndex
+
+ISSUES = [
+    {'id': 'a', 'issue_number': 3, 'subsystems': ['Brakes', 'Suspension'], 'priority': 'High', 'status': 'Open',
+     'driver': 'd1'},
+    {'id': 'b', 'issue_number': 2, 'subsystems': ['Brakes'], 'priority': 'Low', 'status': 'Closed', 'driver': 'd2'},
+    {'id': 'c', 'issue_number': 1, 'subsystems': ['Suspension'], 'priority': 'High', 'status': 'Open',
+     'driver': 'd2'},
+    {'id': 'd', 'issue_number': None, 'subsystems': ['Electrical'], 'priority': 'Low', 'status': 'Open',
+     'driver': 'd1'},
+]
+
+
+@pytest.fixture
+def index():
+    index = IssueIndex()
+    index.rebuild([dict(issue) for issue in ISSUES])
+    return index
+
+
+def _ids(issues):
+    return [issue['id'] for issue in issues]
+
+
+@pytest.mark.parametrize('filters, expected', [
+    (None, ['a', 'b', 'c', 'd']),
+    ({'priority': 'High'}, ['a', 'c']),
+    ({'subsystem': ['Brakes', 'Suspension']}, ['a', 'b', 'c']),
+    ({'subsystem': ['Brakes', 'Suspension'], 'subsystem_mode': 'and'}, ['a']),
+    ({'status': 'Open', 'driver': 'd1'}, ['a', 'd']),
+    ({'priority': 'Medium'}, []),
+])
+def test_query_filters(index, filters, expected):
+    assert _ids(index.query(filters)) == expected
+    assert index.count(filters) == len(expected)
+
+
+def test_query_orders_ties_and_unnumbered_issues_by_id(index):
+    index.upsert({'id': 'aa', 'issue_number': 3, 'status': 'Open'})
+    index.upsert({'id': 'c0', 'issue_number': None, 'status': 'Open'})
+
+    assert _ids(index.query()) == ['a', 'aa', 'b', 'c', 'c0', 'd']
+    assert _ids(index.query(descending=False)) == ['c', 'b', 'a', 'aa', 'c0', 'd']
+
+
+def test_facets_ignore_their_own_filter(index):
+    facets = index.facets({'priority': 'High', 'status': 'Open'})
+
+    assert facets['priority'] == {'High': 2, 'Low': 1}
+    assert facets['status'] == {'Open': 2, 'Closed': 0}
+    assert facets['subsystem'] == {'Brakes': 1, 'Suspension': 2, 'Electrical': 0}
+
+
+def test_writes_keep_the_index_current(index):
+    index.update('b', {'status': 'Open'})
+    assert _ids(index.query({'status': 'Open', 'subsystem': ['Brakes']})) == ['a', 'b']
+
+    index.remove('a')
+    assert _ids(index.query({'subsystem': ['Brakes']})) == ['b']
+    assert 'Closed' not in index.facets()['status']
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fsae_backend_app.ld_parser.laps import beacon_times, parse_ldx, segment_index
+
+LDX = b"""<?xml version="1.0"?>
+<LDXFile><Layers><Layer><MarkerBlock><MarkerGroup Name="Beacons" Index="3">
+<Marker Version="100" ClassName="BCN" Name="Manual.1" Flags="77" Time="65000000"/>
+<Marker Version="100" ClassName="BCN" Name="Manual.2" Flags="77" Time="30000000"/>
+<Marker Version="100" ClassName="BCN" Name="Manual.3" Flags="77" Time="35000000"/>
+</MarkerGroup></MarkerBlock></Layer></Layers></LDXFile>"""
+
+
+def _run(seconds=100, freq=10, **channels):
+    n_samples = seconds * freq
+    return {freq: pd.DataFrame({name: make(np.arange(n_samples) / freq) for name, make in channels.items()})}
+
+
+def test_parse_ldx():
+    assert parse_ldx(LDX) == [30.0, 35.0, 65.0]
+
+
+def test_beacons_from_the_lap_number():
+    df_dict = _run(**{'Lap Number': lambda t: np.searchsorted([30, 31, 70], t, side='right')})
+    # The crossing a second after the one at 30 s is a repeated trigger
+    assert beacon_times(df_dict) == [30.0, 70.0]
+
+
+def test_beacons_from_the_lap_distance():
+    df_dict = _run(**{'Lap Distance': lambda t: (t * 20) % 800})
+    assert beacon_times(df_dict) == [40.0, 80.0]
+
+
+def test_beacons_from_gps():
+    # A 40 s loop of about 700 m from the first fix, entering its 15 m gate about 0.8 s before the line
+    angle = lambda t: 2 * np.pi * t / 40
+    df_dict = _run(**{'GPS Latitude': lambda t: 50 + 0.001 * np.sin(angle(t)),
+                      'GPS Longitude': lambda t: 8 + 0.001 * (1 - np.cos(angle(t)))})
+    assert beacon_times(df_dict) == pytest.approx([39.2, 79.2], abs=0.2)
+
+
+def test_no_lap_channel():
+    assert beacon_times(_run(Speed=lambda t: t)) == []
+
+
+def test_segment_index():
+    df_dict = _run(**{'Brake Pressure': lambda t: ((t > 45) & (t < 47)) * 50.0,
+                      'Throttle Position': lambda t: np.where((t > 10) & (t < 12), 100.0, 50.0)})
+    segments = segment_index(df_dict, LDX)
+
+    laps = [(s['lap'], s['start'], s['end']) for s in segments if s['type'] == 'lap']
+    assert laps == [(0, 0.0, 30.0), (1, 30.0, 65.0), (2, 65.0, 100.0)]
+
+    zones = [(s['type'], s['lap']) for s in segments if s['type'] != 'lap']
+    assert zones == [('straight', 0), ('braking', 1)]
+
+
+def test_unreadable_ldx_falls_back_to_the_channels():
+    df_dict = _run(**{'Lap Number': lambda t: (t >= 50).astype(float)})
+    laps = [s for s in segment_index(df_dict, b'<not xml') if s['type'] == 'lap']
+    assert [(s['start'], s['end']) for s in laps] == [(0.0, 50.0), (50.0, 100.0)]
@@ -0,0 +1,106 @@
+import io
+import numpy as np
+import pytest
+from fsae_backend_app.ld_parser.data_containers import ldData
+from fsae_backend_app.ld_parser.synthetic import make_channels, write_ldfile
+
+
+@pytest.fixture
+def ld_file(tmp_path):
+    path = tmp_path / 'synthetic.ld'
+    expected = write_ldfile(str(path), make_channels(n_channels=6, freqs=(10, 50)), duration=5)
+    return path, expected
+
+
+def test_header_round_trip(ld_file):
+    path, _ = ld_file
+    ld = ldData.fromfile(str(path))
+
+    assert ld.head.driver == 'Synthetic Driver'
+    assert ld.head.vehicleid == 'Synthetic Car'
+    assert ld.head.event.name == 'Synthetic Event'
+    assert ld.head.event.venue.name == 'Synthetic Venue'
+    assert ld.head.event.venue.vehicle.weight == 250
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_decode_round_trip(ld_file, use_mmap):
+    path, expected = ld_file
+    ld = ldData.fromfile(str(path), use_mmap=use_mmap)
+
+    decoded = ld.decode()
+    assert list(decoded) == list(expected)
+    for name, values in expected.items():
+        np.testing.assert_allclose(decoded[name], values)
+
+
+def test_decode_from_buffer(ld_file):
+    path, expected = ld_file
+    data = path.read_bytes()
+
+    for source in (data, memoryview(data), io.BytesIO(data)):
+        decoded = ldData.fromfile(source).decode()
+        for name, values in expected.items():
+            np.testing.assert_allclose(decoded[name], values)
+
+
+def test_to_dataframe_groups_by_frequency(ld_file):
+    path, expected = ld_file
+    df_dict = ldData.fromfile(str(path)).to_dataframe()
+
+    assert sorted(df_dict) == [10, 50]
+    assert len(df_dict[10]) == 50 and len(df_dict[50]) == 250
+    for df in df_dict.values():
+        for name in df.columns:
+            np.testing.assert_allclose(df[name].to_numpy(), expected[name])
+
+
+def test_select_channels(ld_file):
+    path, expected = ld_file
+    names = list(expected)[:2]
+    ld = ldData.fromfile(str(path), channels=names)
+
+    assert list(ld) == names
+
+
+@pytest.mark.parametrize('seconds', [1, 1.5, 10])
+def test_iter_windows_covers_every_sample(ld_file, seconds):
+    path, expected = ld_file
+    ld = ldData.fromfile(str(path))
+
+    starts, windows = [], {name: [] for name in expected}
+    for start, window in ld.iter_windows(seconds=seconds):
+        starts.append(start)
+        for name, values in window.items():
+            # The buffers are reused by the next window
+            windows[name].append(values.copy())
+
+    assert starts == [idx * seconds for idx in range(len(starts))]
+    assert starts[-1] < 5 <= starts[-1] + seconds
+    for name, values in expected.items():
+        np.testing.assert_allclose(np.concatenate(windows[name]), values)
+
+
+@pytest.mark.parametrize('use_mmap', [False, True])
+def test_parallel_decode_matches_serial(ld_file, use_mmap):
+    path, _ = ld_file
+    ld = ldData.fromfile(str(path), use_mmap=use_mmap)
+
+    serial, parallel = ld.decode(workers=1), ld.decode(workers=4)
+    assert list(parallel) == list(serial)
+    for name, values in serial.items():
+        np.testing.assert_array_equal(parallel[name], values)
+
+    serial_frames, parallel_frames = ld.to_dataframe(workers=1), ld.to_dataframe(workers=4)
+    assert list(parallel_frames) == list(serial_frames)
+    for freq, df in serial_frames.items():
+        assert parallel_frames[freq].equals(df)
+
+
+def test_synthetic_expected_values_are_exact():
+    buffer = io.BytesIO()
+    expected = write_ldfile(buffer, make_channels(n_channels=4, dtypes=(np.float16, np.float32, np.int16)), duration=2)
+
+    decoded = ldData.fromfile(buffer.getvalue()).decode()
+    for name, values in expected.items():
+        np.testing.assert_array_equal(decoded[name], values)
@@ -0,0 +1,136 @@
+import pytest
+from fsae_backend_app.firebase import mirror
+from fsae_backend_app.firebase.mirror import CollectionMirror
+
+
+class FakeWatch(object):
+    def __init__(self):
+        self.is_active = True
+
+    def unsubscribe(self):
+        self.is_active = False
+
+
+class FakeSnapshot(object):
+    def __init__(self, doc_id, data):
+        self.id, self.data = doc_id, data
+
+    def to_dict(self):
+        return dict(self.data)
+
+
+class FakeCollection(object):
+    """Collection reference that records every listener started on it."""
+    id = 'issues'
+
+    def __init__(self):
+        self.callbacks, self.watches = [], []
+
+    def on_snapshot(self, callback):
+        self.callbacks.append(callback)
+        self.watches.append(FakeWatch())
+        return self.watches[-1]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the mirror's monotonic clock with one the test advances by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(mirror.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def _deliver(collection, listener, *doc_ids, read_time=None):
+    collection.callbacks[listener]([FakeSnapshot(doc_id, {'title': doc_id}) for doc_id in doc_ids], [], read_time)
+
+
+def test_cold_until_first_snapshot(clock):
+    collection = FakeCollection()
+    changed = []
+    docs = CollectionMirror(collection, on_change=changed.append)
+    docs.start()
+
+    assert not docs.ready and docs.documents() is None and docs.get('a') is None
+    _deliver(collection, 0, 'a', 'b', read_time=1)
+
+    assert docs.ready and docs.read_time == 1
+    assert docs.documents() == [{'title': 'a', 'id': 'a'}, {'title': 'b', 'id': 'b'}]
+    assert docs.get('a') == {'title': 'a', 'id': 'a'} and docs.get('missing') == {}
+    assert changed == [docs.documents()]
+
+
+def test_live_listener_is_kept(clock):
+    collection = FakeCollection()
+    docs = CollectionMirror(collection, max_age=60)
+    docs.start()
+    _deliver(collection, 0, 'a')
+    clock[0] += 30
+    docs.start()
+
+    assert len(collection.callbacks) == 1 and docs.ready
+
+
+def test_inactive_listener_is_restarted(clock):
+    collection = FakeCollection()
+    docs = CollectionMirror(collection)
+    docs.start()
+    _deliver(collection, 0, 'a')
+
+    # A listener whose stream failed goes inactive without calling back
+    collection.watches[0].is_active = False
+    assert not docs.ready and docs.documents() is None
+
+    docs.start()
+    assert len(collection.callbacks) == 2 and not docs.ready
+    _deliver(collection, 1, 'b')
+    assert docs.ready and [doc['id'] for doc in docs.documents()] == ['b']
+
+
+def test_quiet_listener_is_restarted_after_max_age(clock):
+    collection = FakeCollection()
+    docs = CollectionMirror(collection, max_age=60)
+    docs.start()
+    _deliver(collection, 0, 'a')
+
+    clock[0] += 61
+    assert not docs.ready
+    docs.start()
+
+    assert len(collection.callbacks) == 2
+    assert not collection.watches[0].is_active and collection.watches[1].is_active
+
+
+def test_replaced_listener_snapshots_are_dropped(clock):
+    collection = FakeCollection()
+    docs = CollectionMirror(collection, max_age=60)
+    docs.start()
+    clock[0] += 61
+    docs.start()
+
+    _deliver(collection, 0, 'old')
+    assert not docs.ready
+    _deliver(collection, 1, 'new')
+    assert [doc['id'] for doc in docs.documents()] == ['new']
+
+
+def test_stop_makes_the_mirror_cold(clock):
+    collection = FakeCollection()
+    docs = CollectionMirror(collection)
+    docs.start()
+    _deliver(collection, 0, 'a')
+    docs.stop()
+    _deliver(collection, 0, 'b')
+
+    assert not docs.ready and not collection.watches[0].is_active
+
+
+def test_on_change_errors_are_contained(clock):
+    def fail(documents):
+        raise RuntimeError('index rebuild failed')
+
+    collection = FakeCollection()
+    docs = CollectionMirror(collection, on_change=fail)
+    docs.start()
+    _deliver(collection, 0, 'a')
+
+    assert docs.ready
@@ -0,0 +1,61 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from fsae_backend_app.ld_parser.cache import RunCache
+
+pytest.importorskip('pyarrow')
+
+
+def _frames(seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        10: pd.DataFrame({'slow': rng.normal(size=20)}),
+        100: pd.DataFrame({'fast': rng.normal(size=200), 'other': rng.normal(size=200)}),
+    }
+
+
+def test_round_trip(tmp_path):
+    cache = RunCache(str(tmp_path), max_bytes=1 << 30)
+    frames = _frames()
+    key = RunCache.key(b'ld bytes')
+
+    assert cache.get(key) is None
+    cache.put(key, frames)
+
+    cached = cache.get(key)
+    assert sorted(cached) == [10, 100]
+    for freq, df in frames.items():
+        pd.testing.assert_frame_equal(cached[freq], df)
+
+
+def test_key_is_the_content_hash():
+    assert RunCache.key(b'abc') == RunCache.key(memoryview(b'abc')) != RunCache.key(b'abd')
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = RunCache(str(tmp_path), max_bytes=1 << 30)
+    for idx, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, _frames())
+        os.utime(tmp_path / key, (idx, idx))
+    cache.get('a')  # Now the most recently used
+
+    entry_size = sum(entry.stat().st_size for entry in os.scandir(tmp_path / 'a'))
+    cache.max_bytes = 2 * entry_size
+    cache.evict()
+
+    assert sorted(os.listdir(tmp_path)) == ['a', 'c']
+
+
+def test_concurrent_puts_of_one_entry(tmp_path):
+    cache = RunCache(str(tmp_path), max_bytes=1 << 30)
+    frames = _frames()
+    threads = [threading.Thread(target=cache.put, args=('a', frames)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert os.listdir(tmp_path) == ['a']
+    pd.testing.assert_frame_equal(cache.get('a')[100], frames[100])
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fsae_backend_app.ld_parser import stats as stats_module
+from fsae_backend_app.ld_parser.stats import channel_stats, key_points
+
+
+def test_channel_stats():
+    df_dict = {2: pd.DataFrame({'speed': [3.0, 1.0, np.nan, 5.0, 1.0], 'empty': [np.nan] * 5})}
+    stats = channel_stats(df_dict, percentiles=(50,))
+
+    assert list(stats) == ['speed']
+    assert stats['speed'] == pytest.approx({
+        'min': 1.0, 'max': 5.0, 'mean': 2.5, 'std': np.std([3, 1, 5, 1]), 'p50': 2.0,
+        'min-time': 0.5, 'max-time': 1.5,
+    })
+
+
+def test_slices_match_one_pass(monkeypatch):
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(500, 7)).astype(np.float32)
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:, 4] = np.nan
+    df_dict = {10: pd.DataFrame(values, columns=[f'c{idx}' for idx in range(7)])}
+
+    whole = channel_stats(df_dict)
+    # Slices of two channels
+    monkeypatch.setattr(stats_module, 'MAX_BLOCK_VALUES', 1000)
+    sliced = channel_stats(df_dict)
+
+    assert list(sliced) == list(whole) == ['c0', 'c1', 'c2', 'c3', 'c5', 'c6']
+    for name in whole:
+        assert sliced[name] == pytest.approx(whole[name])
+        assert whole[name]['mean'] == pytest.approx(np.nanmean(values[:, int(name[1:])].astype(np.float64)))
+
+
+def test_key_points():
+    assert key_points({'Coolant Temperature': {'max': 98.26}}) == {"Highest Coolant Temperature": "98.3"}
+    assert key_points(None) == {"Highest Coolant Temperature": "N/A"}
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def telemetry_cache(django_settings):
+    from fsae_backend_app.firebase import telemetry_cache
+    return telemetry_cache
+
+
+def _rows(n, fields=('Speed', 'RPM')):
+    return [{'id': f'data_{idx:06d}', **{field: float(idx) for field in fields}} for idx in range(n)]
+
+
+def _key(telemetry_cache, run='2024-10-05-endurance', cursor=None):
+    return telemetry_cache.TelemetryCache.key(run, ('abc', 1), ['RPM', 'Speed'], cursor)
+
+
+def test_key_ignores_category_order(telemetry_cache):
+    TelemetryCache = telemetry_cache.TelemetryCache
+    assert TelemetryCache.key('run', 'v', ['b', 'a'], 0) == TelemetryCache.key('run', 'v', ['a', 'b'], 0)
+    assert TelemetryCache.version({'ld-hash': 'abc', 'bucket-seconds': 1}) == ('abc', 1)
+
+
+def test_estimate_size_scales_with_rows_and_arrays(telemetry_cache):
+    estimate = telemetry_cache._estimate_size
+    assert estimate(_rows(200)) == 200 * estimate(_rows(1))
+    assert estimate(_rows(10, fields=('a', 'b', 'c', 'd'))) > estimate(_rows(10))
+    ids, columns = ['data_000000'] * 100, {'Speed': np.zeros(100, dtype=np.float32)}
+    assert estimate((ids, columns)) == 100 * len(ids[0]) + len('Speed') + 400
+    assert estimate([]) == 0
+
+
+def test_put_does_not_serialize_in_memory_entries(telemetry_cache, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('serialized without a disk store')
+
+    monkeypatch.setattr(telemetry_cache.json, 'dumps', fail)
+    monkeypatch.setattr(telemetry_cache.json, 'dump', fail)
+    cache = telemetry_cache.TelemetryCache(max_bytes=1024 ** 2)
+    cache.put(_key(telemetry_cache), _rows(5))
+
+    assert cache.get(_key(telemetry_cache)) == _rows(5)
+
+
+def test_evicts_least_recently_used(telemetry_cache):
+    entry_bytes = telemetry_cache._estimate_size(_rows(10))
+    cache = telemetry_cache.TelemetryCache(max_bytes=2 * entry_bytes)
+    keys = [_key(telemetry_cache, cursor=idx) for idx in range(3)]
+
+    cache.put(keys[0], _rows(10))
+    cache.put(keys[1], _rows(10))
+    cache.get(keys[0])
+    cache.put(keys[2], _rows(10))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+
+
+def test_disk_store_round_trips_columns(telemetry_cache, tmp_path):
+    key = _key(telemetry_cache)
+    ids, columns = ['data_000000', 'data_000001'], {'Speed': np.array([1.5, np.nan], dtype=np.float32)}
+    telemetry_cache.TelemetryCache(1024 ** 2, str(tmp_path), 1024 ** 2).put(key, (ids, columns))
+
+    # A fresh cache (e.g. another process) reads the entry back from disk
+    read_ids, read_columns = telemetry_cache.TelemetryCache(1024 ** 2, str(tmp_path), 1024 ** 2).get(key)
+    assert read_ids == ids
+    np.testing.assert_array_equal(read_columns['Speed'], columns['Speed'])
+
+
+def test_invalidate_drops_memory_and_disk(telemetry_cache, tmp_path):
+    cache = telemetry_cache.TelemetryCache(1024 ** 2, str(tmp_path), 1024 ** 2)
+    run_key, other_key = _key(telemetry_cache), _key(telemetry_cache, run='2024-10-06-skidpad')
+    cache.put(run_key, _rows(3))
+    cache.put(other_key, _rows(3))
+
+    cache.invalidate('2024-10-05-endurance')
+
+    assert cache.get(run_key) is None
+    assert telemetry_cache.TelemetryCache(1024 ** 2, str(tmp_path), 1024 ** 2).get(run_key) is None
+    assert cache.get(other_key) == _rows(3)
+
+
+def test_disk_store_evicted_past_limit(telemetry_cache, tmp_path):
+    cache = telemetry_cache.TelemetryCache(1024 ** 2, str(tmp_path), disk_max_bytes=1)
+    cache.put(_key(telemetry_cache), _rows(3))
+
+    assert not any(path.is_file() for path in tmp_path.rglob('*'))
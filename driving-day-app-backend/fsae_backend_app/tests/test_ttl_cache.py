@@ -0,0 +1,73 @@
+import pytest
+
+
+@pytest.fixture
+def ttl_cache(django_settings):
+    from fsae_backend_app.firebase import ttl_cache
+    return ttl_cache
+
+
+@pytest.fixture
+def clock(ttl_cache, monkeypatch):
+    """Replaces the cache's monotonic clock with one the test advances by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(ttl_cache.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_serves_until_expiry(ttl_cache, clock):
+    cache = ttl_cache.TTLCache(ttl=60)
+    cache.put(('general-run-data',), ['run'])
+
+    clock[0] += 59
+    assert cache.get(('general-run-data',)) == ['run']
+    clock[0] += 1
+    assert cache.get(('general-run-data',)) is None
+
+
+def test_evicts_least_recently_used(ttl_cache, clock):
+    cache = ttl_cache.TTLCache(ttl=60, max_entries=2)
+    cache.put(('all-drivers', 'a'), 1)
+    cache.put(('all-drivers', 'b'), 2)
+    cache.get(('all-drivers', 'a'))
+    cache.put(('all-drivers', 'c'), 3)
+
+    assert cache.get(('all-drivers', 'b')) is None
+    assert cache.get(('all-drivers', 'a')) == 1 and cache.get(('all-drivers', 'c')) == 3
+
+
+def test_put_prunes_expired_entries(ttl_cache, clock):
+    cache = ttl_cache.TTLCache(ttl=60, max_entries=2)
+    cache.put(('all-issues', 'old'), 1)
+    clock[0] += 30
+    cache.put(('all-issues', 'recent'), 2)
+    clock[0] += 31
+    cache.put(('all-issues', 'new'), 3)
+
+    # The expired entry made room, so the live one was kept
+    assert cache.get(('all-issues', 'recent')) == 2 and cache.get(('all-issues', 'new')) == 3
+
+
+def test_invalidate_drops_every_variant(ttl_cache, clock):
+    cache = ttl_cache.TTLCache(ttl=60)
+    cache.put(('all-drivers', 'a'), 1)
+    cache.put(('all-drivers', 'b'), 2)
+    cache.put(('general-run-data',), 3)
+
+    cache.invalidate('all-drivers')
+
+    assert cache.get(('all-drivers', 'a')) is None and cache.get(('all-drivers', 'b')) is None
+    assert cache.get(('general-run-data',)) == 3
+
+
+def test_stats_count_per_read_name(ttl_cache, clock):
+    cache = ttl_cache.TTLCache(ttl=60)
+    cache.get(('all-drivers', 'a'))
+    cache.put(('all-drivers', 'a'), 1)
+    cache.put(('all-drivers', 'b'), 2)
+    cache.get(('all-drivers', 'a'))
+    cache.get(('all-drivers', 'b'))
+
+    assert cache.stats() == [{"name": 'all-drivers', "hits": 2, "misses": 1, "cached": 2}]
+    clock[0] += 60
+    assert cache.stats()[0]["cached"] == 0
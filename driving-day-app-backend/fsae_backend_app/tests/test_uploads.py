@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    pytest.importorskip('google.api_core')
+    from fsae_backend_app.firebase import uploads
+    monkeypatch.setattr(uploads, 'RETRY_BASE_SECONDS', 0)
+    return uploads
+
+
+class FlakyFirestore(object):
+    """In-memory client whose batch commits raise the queued errors, one per commit, before succeeding."""
+
+    def __init__(self, errors=()):
+        from fsae_backend_app.ld_parser.benchmark import InMemoryFirestore
+        self.store = InMemoryFirestore()
+        self.errors = list(errors)
+        self.commits = []
+
+    def collection(self, name):
+        return self.store.collection(name)
+
+    def batch(self):
+        client, batch = self, self.store.batch()
+        commit = batch.commit
+
+        def flaky_commit():
+            client.commits.append(len(batch.writes))
+            if client.errors:
+                raise client.errors.pop(0)
+            commit()
+
+        batch.commit = flaky_commit
+        return batch
+
+
+def _writes(client, n):
+    collection = client.collection('docs')
+    return [(collection.document(f'd{idx}'), {'value': idx}) for idx in range(n)]
+
+
+def test_batched_set_splits_on_write_limit(uploads):
+    client = FlakyFirestore()
+    report = uploads.batched_set(_writes(client, 1201), client, max_in_flight=1)
+
+    assert report['documents'] == 1201 and report['failed'] == 0
+    assert report['batches'] == 3 and client.commits == [500, 500, 201]
+    assert len(client.store.documents) == 1201
+
+
+def test_batched_set_splits_on_byte_limit(uploads, monkeypatch):
+    monkeypatch.setattr(uploads, 'MAX_BATCH_BYTES', 100)
+    client = FlakyFirestore()
+    collection = client.collection('docs')
+    writes = [(collection.document(f'd{idx}'), {'blob': b'x' * 40}) for idx in range(5)]
+
+    assert uploads.batched_set(writes, client, max_in_flight=1)['batches'] == 3
+
+
+def test_batched_set_retries_contention(uploads):
+    from google.api_core import exceptions
+    client = FlakyFirestore([exceptions.Aborted('contention'), exceptions.ServiceUnavailable('busy')])
+    report = uploads.batched_set(_writes(client, 10), client)
+
+    assert report['documents'] == 10 and report['failed'] == 0
+    assert client.commits == [10, 10, 10]
+
+
+def test_batched_set_reports_failed_batches(uploads):
+    from google.api_core import exceptions
+    client = FlakyFirestore([exceptions.Aborted('contention')] * 3)
+    report = uploads.batched_set(_writes(client, 600), client, max_in_flight=1, max_attempts=3)
+
+    assert report['documents'] == 100 and report['failed'] == 500
+    assert len(client.store.documents) == 100
+
+
+def test_batched_set_does_not_retry_other_errors(uploads):
+    client = FlakyFirestore([ValueError('bad document')])
+    report = uploads.batched_set(_writes(client, 10), client)
+
+    assert report['failed'] == 10 and client.commits == [10]
+
+
+def _frame():
+    return pd.DataFrame({'Speed': np.arange(30, dtype=np.float64), 'Speed (max)': np.arange(30, dtype=np.float64)})
+
+
+def test_upload_writes_run_document_last(uploads):
+    client = FlakyFirestore()
+    report = uploads.upload_dataframe_to_firestore(_frame(), '2024-10-05-endurance', 'driver', {'ld-hash': 'abc'},
+                                                   client=client)
+
+    run = client.store.documents['ecu-data/2024-10-05-endurance']
+    assert report['failed'] == 0 and report['documents'] == len(client.store.documents)
+    assert run['driver-id'] == 'driver' and run['ld-hash'] == 'abc' and run['manifest']['rows'] == 30
+
+
+def test_failed_upload_skips_run_document(uploads):
+    client = FlakyFirestore([ValueError('bad document')])
+    report = uploads.upload_dataframe_to_firestore(_frame(), '2024-10-05-endurance', 'driver', client=client)
+
+    assert report['failed'] > 0
+    assert 'ecu-data/2024-10-05-endurance' not in client.store.documents
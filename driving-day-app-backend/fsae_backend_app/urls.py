@@ -8,6 +8,7 @@ urlpatterns = [
     path('upload-files/', upload_files_call, name='upload-files'),
     path('add-driver/', add_driver_call, name='add-driver'),
     path('add-issue/', add_issue_call, name='add-issue'),
+    path('add-issues/', add_issues_call, name='add-issues'),
     
     # PUT Requests
     path('update-issue/<str:issue_id>/', update_issue_call, name='update-issue'),
@@ -21,7 +22,9 @@ urlpatterns = [
     path('general-run-data', get_general_run_data_call, name='general-run-data'),
     path('specific-run-data', get_specific_run_data_call, name='specific-run-data'),
     path('specific-run-data-paginated', get_specific_run_data_paginated_call, name='specific-run-data-paginated'),
+    path('compare-runs', compare_runs_call, name='compare-runs'),
     path('all-issues', get_all_issues_call, name='all-issues'),
     path('issues-paginated', get_issues_paginated_call, name='get-issues-paginated'),
     path('get-csrf-token', get_csrf_token, name='get-csrf-token'),
+    path('cache-stats', get_cache_stats_call, name='cache-stats'),
 ]
\ No newline at end of file
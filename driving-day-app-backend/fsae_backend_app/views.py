@@ -1,7 +1,14 @@
 from django.http import JsonResponse, Http404
 from .ld_parser.main import process_and_upload_inputted_ld_file
+from .ld_parser.stats import key_points as key_points_from_stats
+from .columnar import negotiate, columnar_response
+from .comparison import LAP_DISTANCE_CHANNEL, align_runs, distance_channel, run_series
+from .firebase.chunks import row_of
+from .firebase.cursors import encode_cursor, decode_cursor
+import asyncio
 import json
-from .firebase.firestore import *
+from .firebase.firestore_async import *
+from .firebase.ttl_cache import list_cache
 from asgiref.sync import sync_to_async
 from django.views.decorators.csrf import ensure_csrf_cookie, csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
@@ -43,7 +50,7 @@ async def add_driver_call(request):
     """
     try:
         data = json.loads(request.body.decode('utf-8'))
-        await sync_to_async(add_driver)(data)
+        await add_driver(data)
         return JsonResponse({"message": "User registration successful!"}, status=200)
     except Exception as e:
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
@@ -64,9 +71,7 @@ async def get_all_drivers_call(request):
         if int(weight) != -1:
             filters['weight'] = float(weight)
         
-        get_all_drivers_async = sync_to_async(get_all_drivers)
-
-        drivers = await get_all_drivers_async(filters=filters if filters else None)
+        drivers = await get_all_drivers(filters=filters if filters else None)
 
         return JsonResponse({
             "drivers": drivers,
@@ -94,7 +99,7 @@ async def get_specific_driver_call(request):
     try:
         driverId = request.GET.get('driverId')
 
-        curr_driver = await sync_to_async(get_specific_driver)(driverId)
+        curr_driver = await get_specific_driver(driverId)
 
         return JsonResponse({
             "driver": curr_driver,
@@ -114,9 +119,8 @@ async def upload_files_call(request):
     """
     Handle the POST request to upload and process LD files.
 
-    This view function processes LD files from the specified input directory, converts
-    them into DataFrames, and saves the resulting data as CSV files in the output directory.
-    After saving, each CSV file is uploaded to Firestore for further use.
+    This view function parses the uploaded LD file, converts it into one DataFrame per
+    recording frequency, and uploads each DataFrame to Firestore for further use.
 
     Request Method:
         POST: Triggers the `process_and_upload_inputted_ld_files` function to convert and upload
@@ -126,7 +130,8 @@ async def upload_files_call(request):
         JsonResponse: A JSON response indicating success or failure of the upload process.
         - On Success: Returns a JSON message with HTTP 200 status indicating that the data upload
           was successful.
-        - On Failure: Returns an error message with HTTP 400 status if a non-POST request is made.
+        - On Failure: Returns an error message with HTTP 400 status if a non-POST request is made,
+          or with HTTP 500 status if the run could not be parsed or was not uploaded in full.
 
     Example:
         POST /api/upload-files/ -> Triggers the upload process and returns success status.
@@ -147,9 +152,14 @@ async def upload_files_call(request):
         # Title for Run
         run_title = request.POST.get('runTitle')
 
+        # Optional MoTeC .ldx companion file, holding the run's beacon markers
+        ldx_file = all_files.get('ldxFile')
+
         # Upload to S3
         # Obtain Image URLs:
-        await sync_to_async(process_and_upload_inputted_ld_file)(data_file, run_date, run_title, driver_id)
+        report = await sync_to_async(process_and_upload_inputted_ld_file)(data_file, run_date, run_title, driver_id, ldx_file)
+        if report is None:
+            return JsonResponse({"error": "Failed to upload LD data to database"}, status=500)
         return JsonResponse({"message": "Successfully uploaded LD data to database!"}, status=200)
     except Exception as e:
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
@@ -252,7 +262,7 @@ async def get_general_run_data_call(request):
     """
 
     try:
-        data = await sync_to_async(get_general_run_data)(filter_limit=10)
+        data = await get_general_run_data(filter_limit=10)
         
         return JsonResponse({"recentRuns": data}, status=200)
     except Exception as e:
@@ -264,17 +274,34 @@ async def get_specific_run_data_call(request):
     try:
         run_title = request.GET.get('runTitle')
         categories = request.GET.get('categories')
+        lap = request.GET.get('lap')
 
         categories_list = []
         if len(categories) > 0:
             categories_list = categories.strip().split(",")
 
-        data = await sync_to_async(get_specific_run_data)(run_title, categories_list)
-        key_points = {
-            "Highest Coolant Temperature": "-100"
-        }
+        metadata = await get_run_metadata(run_title)
+        segments = metadata.get('segments', [])
+
+        # Optionally limit the data to one lap of the run's segment index
+        start_second, end_second = None, None
+        if lap:
+            lap_segment = next((s for s in segments if s['type'] == 'lap' and s['lap'] == int(lap)), None)
+            if lap_segment is None:
+                return JsonResponse({"error": f"Lap {lap} not found for run {run_title}"}, status=404)
+            start_second, end_second = lap_segment['start'], lap_segment['end']
 
-        return JsonResponse({"runDataPoints": data, "keyPoints": key_points}, status=200)
+        # Binary columnar response when the client asks for one, JSON otherwise
+        content_type = negotiate(request)
+        data = await get_specific_run_data(run_title, categories_list, start_second, end_second, metadata,
+                                           as_columns=content_type is not None)
+        stats = metadata.get('stats', {})
+        key_points = key_points_from_stats(stats)
+
+        if content_type:
+            return columnar_response(content_type, data, keyPoints=key_points, channelStats=stats, segments=segments)
+
+        return JsonResponse({"runDataPoints": data, "keyPoints": key_points, "channelStats": stats, "segments": segments}, status=200)
     except Exception as e:
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
 
@@ -284,24 +311,153 @@ async def get_specific_run_data_paginated_call(request):
     try:
         run_title = request.GET.get('runTitle')
         page_size = request.GET.get('pageSize')
-        start_after_doc = request.GET.get('startAfterDoc')
-        end_before_doc = request.GET.get('endBeforeDoc')
+        start_after_doc = request.GET.get('startAfterDoc', '')
+        end_before_doc = request.GET.get('endBeforeDoc', '')
+        # Opaque cursors from a previous page's nextCursor / prevCursor
+        after = request.GET.get('after')
+        before = request.GET.get('before')
+        include_count = request.GET.get('includeCount') == 'true'
         categories = request.GET.get('categories')
 
         categories_list = []
         if len(categories) > 0:
             categories_list = categories.strip().split(",")
 
-        data = await sync_to_async(get_specific_run_data_paginated)(run_title, page_size, start_after_doc, end_before_doc, categories_list)
-        key_points = {
-            "Highest Coolant Temperature": "-100"
+        cursor_scope = f'run:{run_title}'
+        start_after_row, end_before_row = None, None
+        try:
+            if after:
+                start_after_row = decode_cursor(cursor_scope, after)[0]
+            elif before:
+                end_before_row = decode_cursor(cursor_scope, before)[0]
+        except ValueError as ve:
+            return JsonResponse({"error": str(ve)}, status=400)
+
+        if start_after_row is None and end_before_row is None:
+            if len(start_after_doc) > 0:
+                start_after_row = row_of(start_after_doc)
+            elif len(end_before_doc) > 0:
+                end_before_row = row_of(end_before_doc)
+
+        # Binary columnar response when the client asks for one, JSON otherwise
+        content_type = negotiate(request)
+        metadata = await get_run_metadata(run_title)
+        data = await get_specific_run_data_paginated(run_title, page_size, start_after_row, end_before_row, categories_list, metadata,
+                                                     as_columns=content_type is not None)
+        key_points = key_points_from_stats(metadata.get('stats', {}))
+
+        ids = (data[0] if content_type else [row['id'] for row in data]) if data else []
+        page = {
+            "keyPoints": key_points,
+            "nextCursor": encode_cursor(cursor_scope, [row_of(ids[-1])]) if ids else None,
+            "prevCursor": encode_cursor(cursor_scope, [row_of(ids[0])]) if ids else None,
+        }
+        if include_count:
+            total_rows = await get_run_row_count(run_title, metadata)
+            page["totalRows"] = total_rows
+            page["pageCount"] = -(-total_rows // int(page_size)) if total_rows is not None else None
+
+        if content_type:
+            return columnar_response(content_type, data, **page)
+
+        return JsonResponse({"runDataPoints": data, **page}, status=200)
+    except Exception as e:
+        return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
+
+
+@require_GET
+async def compare_runs_call(request):
+    """
+    Aligns several runs on a shared time or distance axis for comparison overlays.
+
+    Query parameters:
+    - runTitles: Comma-separated run titles.
+    - categories: Comma-separated channels to compare.
+    - alignBy: 'time' (default) or 'distance'; along distance, runs are aligned on their cumulative
+      'Distance', or on 'Lap Distance' when a lap is given.
+    - step: Optional grid spacing, in seconds or meters.
+    - lap: Optional lap number; each run is cut to that lap and its time starts at the lap start.
+
+    Returns:
+    - JSON response with the grid and, for every run, the aligned values of every channel.
+    """
+    try:
+        run_titles = [title for title in request.GET.get('runTitles', '').split(",") if title]
+        categories_list = [c for c in request.GET.get('categories', '').strip().split(",") if c]
+        align_by = request.GET.get('alignBy', 'time')
+        step = request.GET.get('step')
+        lap = request.GET.get('lap')
+
+        if len(run_titles) == 0 or len(categories_list) == 0:
+            return JsonResponse({"error": "runTitles and categories are required"}, status=400)
+
+        # Every run's metadata, then every run's data, each fetched concurrently
+        metadata_list = await asyncio.gather(*(get_run_metadata(title) for title in run_titles))
+
+        missing = [title for title, metadata in zip(run_titles, metadata_list) if not metadata]
+        if missing:
+            return JsonResponse({"error": f"Runs not found: {', '.join(missing)}"}, status=404)
+
+        distance_channels = {title: distance_channel(metadata.get('stats'), int(lap) if lap else None)
+                             for title, metadata in zip(run_titles, metadata_list)}
+        if align_by == 'distance' and not lap:
+            lap_only = [title for title, metadata in zip(run_titles, metadata_list)
+                        if distance_channels[title] is None and LAP_DISTANCE_CHANNEL in (metadata.get('stats') or {})]
+            if lap_only:
+                return JsonResponse({"error": f"Runs {', '.join(lap_only)} only record lap distance; "
+                                              f"select a lap to align them by distance"}, status=400)
+
+        bounds = {}
+        for title, metadata in zip(run_titles, metadata_list):
+            bounds[title] = (None, None)
+            if lap:
+                lap_segment = next((s for s in metadata.get('segments', [])
+                                    if s['type'] == 'lap' and s['lap'] == int(lap)), None)
+                if lap_segment is None:
+                    return JsonResponse({"error": f"Lap {lap} not found for run {title}"}, status=404)
+                bounds[title] = (lap_segment['start'], lap_segment['end'])
+
+        def fetched_channels(title):
+            if align_by == 'distance' and distance_channels[title]:
+                return categories_list + [distance_channels[title]]
+            return categories_list
+
+        data_list = await asyncio.gather(*(
+            get_specific_run_data(title, fetched_channels(title), bounds[title][0], bounds[title][1], metadata,
+                                  as_columns=True)
+            for title, metadata in zip(run_titles, metadata_list)))
+
+        series_by_run = {
+            title: run_series(data, metadata.get('bucket-seconds', 1), bounds[title][0] or 0.0)
+            for title, metadata, data in zip(run_titles, metadata_list, data_list)
         }
 
-        return JsonResponse({"runDataPoints": data, "keyPoints": key_points}, status=200)
+        try:
+            comparison = align_runs(series_by_run, categories_list, align_by,
+                                    float(step) if step else None, distance_channels)
+        except ValueError as ve:
+            return JsonResponse({"error": str(ve)}, status=400)
+
+        return JsonResponse(comparison, status=200)
     except Exception as e:
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
 
 
+@require_GET
+def get_cache_stats_call(request):
+    """
+    Returns the hit and miss counts of every read (e.g. the run list or the driver directory)
+    of the list cache.
+
+    Methods:
+    - GET: Return the cache counters
+
+    Returns:
+    - JSON response with one entry per read, over all of its cached variants
+    """
+    return JsonResponse({"listCache": list_cache.stats()}, status=200)
+
+
 @require_POST
 @csrf_exempt
 async def add_issue_call(request):
@@ -310,7 +466,7 @@ async def add_issue_call(request):
     """
     try:
         data = json.loads(request.body.decode('utf-8'))
-        result = await sync_to_async(add_issue)(data)
+        result = await add_issue(data)
         
         if result is None:
             return JsonResponse({"error": "Failed to create issue"}, status=400)
@@ -324,6 +480,38 @@ async def add_issue_call(request):
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
     
 
+@require_POST
+@csrf_exempt
+async def add_issues_call(request):
+    """
+    Handles adding many issues at once via a POST request, with a JSON list of issues as the body.
+    """
+    try:
+        data = json.loads(request.body.decode('utf-8'))
+        if not isinstance(data, list):
+            return JsonResponse({"error": "Expected a list of issues"}, status=400)
+
+        result = await add_issues(data)
+
+        if result is None:
+            return JsonResponse({"error": "Failed to create issues"}, status=400)
+
+        if len(result) < len(data):
+            # A write failed part way; the issues before it were created and keep their numbers
+            return JsonResponse({
+                "error": f"Only {len(result)} of {len(data)} issues were created",
+                "issues": result
+            }, status=500)
+
+        return JsonResponse({
+            "message": "Issues created successfully!",
+            "issues": result
+        }, status=201)
+
+    except Exception as e:
+        return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
+
+
 @require_GET
 async def get_all_issues_call(request):
     """
@@ -337,9 +525,11 @@ async def get_all_issues_call(request):
         if driver_filter:
             filters['driver'] = driver_filter
         if subsystem_filter:
-            filters['subsystem'] = subsystem_filter
+            # Comma-separated subsystems match issues in any of them
+            filters['subsystem'] = subsystem_filter.split(",")
         
-        issues = await sync_to_async(get_all_issues)(filters if filters else None)
+        issues = await get_all_issues(filters if filters else None)
+        facets = await get_issue_facets(filters if filters else None)
         
         if issues is None:
             return JsonResponse({"error": "Failed to retrieve issues"}, status=500)
@@ -347,7 +537,8 @@ async def get_all_issues_call(request):
         return JsonResponse({
             "issues": issues,
             "message": "Issues retrieved successfully",
-            "count": len(issues)
+            "count": len(issues),
+            "facets": facets["facets"] if facets else {}
         }, status=200)
         
     except Exception as e:
@@ -363,26 +554,48 @@ async def get_issues_paginated_call(request):
     """
     try:
         page_size = request.GET.get('pageSize')
-        start_at_doc = request.GET.get('startAtDoc')
-        start_after_doc = request.GET.get('startAfterDoc')
+        start_at_doc = request.GET.get('startAtDoc', '')
+        start_after_doc = request.GET.get('startAfterDoc', '')
+        # Opaque cursors from a previous page's nextCursor / prevCursor
+        after = request.GET.get('after')
+        before = request.GET.get('before')
 
         # Pulling optional filterss
-        subsystem = request.GET.get('subsystem')
-        priority = request.GET.get('priority')
-        status = request.GET.get('status')
+        subsystem = request.GET.get('subsystem', '')
+        subsystem_mode = request.GET.get('subsystemMode', 'or')
+        priority = request.GET.get('priority', '')
+        status = request.GET.get('status', '')
 
         filters = {}
         if len(subsystem) > 0:
-            # TODO: Fix to take in multiple subsystem filters
-            filters['subsystem'] = subsystem
+            # Comma-separated subsystems match issues in any of them, or in all of them with subsystemMode=and
+            filters['subsystem'] = subsystem.split(",")
+            filters['subsystem_mode'] = subsystem_mode
         if len(priority) > 0:
             filters['priority'] = priority
         if len(status) > 0:
             filters['status'] = status
 
-        data = await sync_to_async(get_issues_paginated)(page_size, start_at_doc, start_after_doc, filters)
+        # Cursors hold the (issue number, ID) of the page's edge issue; the ID breaks ties and places unnumbered issues
+        try:
+            cursor = decode_cursor('issues', after or before) if after or before else None
+            if cursor is not None and len(cursor) != 2:
+                raise ValueError("Invalid cursor")
+        except ValueError as ve:
+            return JsonResponse({"error": str(ve)}, status=400)
+        after_key = cursor if after else None
+        before_key = cursor if before and not after else None
+
+        data = await get_issues_paginated(page_size, start_at_doc, start_after_doc, filters, after_key, before_key)
+        facets = await get_issue_facets(filters)
 
-        return JsonResponse({"issuesPaginated": data}, status=200)
+        return JsonResponse({
+            "issuesPaginated": data,
+            "nextCursor": encode_cursor('issues', [data[-1].get('issue_number'), data[-1]['id']]) if data else None,
+            "prevCursor": encode_cursor('issues', [data[0].get('issue_number'), data[0]['id']]) if data else None,
+            "count": facets["count"] if facets else None,
+            "facets": facets["facets"] if facets else {}
+        }, status=200)
     except Exception as e:
         return JsonResponse({"error": f"An unexpected error occurred: {str(e)}"}, status=500)
 
@@ -393,7 +606,7 @@ async def update_issue_call(request, issue_id):
     if request.method == 'PUT':
         try:
             data = json.loads(request.body.decode('utf-8'))
-            result = await sync_to_async(update_issue)(issue_id, data)
+            result = await update_issue(issue_id, data)
             
             if result is None:
                 return JsonResponse({"error": "Failed to update issue or issue not found"}, status=400)
@@ -429,7 +642,7 @@ async def delete_issue_call(request, issue_id):
     """
     if request.method == 'DELETE':
         try:
-            result = await sync_to_async(delete_issue)(issue_id)
+            result = await delete_issue(issue_id)
             
             if result is None:
                 return JsonResponse({"error": "Failed to delete issue or issue not found"}, status=404)